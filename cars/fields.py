@@ -0,0 +1,57 @@
+import django_filters
+from django import forms
+from django.core.exceptions import ValidationError
+from rest_framework import serializers
+
+
+class CatalogChoiceField(forms.IntegerField):
+    """
+    Поле формы для выбора бренда или модели по ID из справочника в памяти (`CarCatalogService`),
+    без запроса к БД при проверке значения.
+    """
+    default_error_messages = {
+        'invalid_choice': 'Select a valid choice. That choice is not one of the available choices.',
+    }
+
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup  # Функция поиска объекта по ID (например, `CarCatalogService.get_brand`).
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        value = super().to_python(value)
+        if value is None:
+            return None
+        obj = self.lookup(value)
+        if obj is None:
+            raise ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return obj
+
+
+class CatalogChoiceFilter(django_filters.Filter):
+    """
+    Фильтр по бренду или модели с проверкой ID по справочнику в памяти вместо `ModelChoiceFilter`.
+    """
+    field_class = CatalogChoiceField
+
+
+class CatalogPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    `PrimaryKeyRelatedField`, который проверяет ID бренда или модели по справочнику в памяти.
+    `queryset` нужен только для совместимости с DRF и при проверке не выполняется.
+    """
+
+    def __init__(self, lookup, **kwargs):
+        self.lookup = lookup  # Функция поиска объекта по ID (например, `CarCatalogService.get_model`).
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        obj = self.lookup(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
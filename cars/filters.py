@@ -1,7 +1,9 @@
 import django_filters
 from django_filters import FilterSet
 
-from .models import CarModel, Brand, ModelName
+from core.services.car_catalog_service import CarCatalogService
+from .fields import CatalogChoiceFilter
+from .models import CarModel
 
 
 class CarFilter(FilterSet):
@@ -10,25 +12,22 @@ class CarFilter(FilterSet):
     Наследуется от FilterSet библиотеки django-filter.
     """
 
-    # Фильтр по бренду автомобиля. Использует ModelChoiceFilter для выбора одного из существующих брендов.
+    # Фильтр по бренду автомобиля. Использует CatalogChoiceFilter для выбора одного из существующих брендов.
     # 'field_name' указывает, что фильтр будет применен к полю 'brand' в модели.
-    # queryset указывает на все доступные объекты Brand.
-    # 'to_field_name' устанавливает, что при фильтрации будет использоваться поле 'id'.
-    brand = django_filters.ModelChoiceFilter(
+    # ID бренда проверяется по справочнику в памяти (CarCatalogService), без запроса к БД.
+    brand = CatalogChoiceFilter(
         field_name="brand",
-        queryset=Brand.objects.all(),
-        label='Бренд',
-        to_field_name='id'
+        lookup=CarCatalogService.get_brand,
+        label='Бренд'
     )
 
-    # Фильтр по названию модели автомобиля. Также использует ModelChoiceFilter.
+    # Фильтр по названию модели автомобиля. Также использует CatalogChoiceFilter.
     # 'field_name' указывает, что фильтрация будет применяться к полю 'model_name'.
-    # queryset содержит все доступные модели автомобилей (ModelName).
-    model_name = django_filters.ModelChoiceFilter(
+    # ID модели проверяется по справочнику в памяти (CarCatalogService).
+    model_name = CatalogChoiceFilter(
         field_name="model_name",
-        queryset=ModelName.objects.all(),
-        label='Модель',
-        to_field_name='id'
+        lookup=CarCatalogService.get_model,
+        label='Модель'
     )
 
     # Фильтр по типу кузова автомобиля. Использует ChoiceFilter для выбора одного из доступных вариантов.
@@ -0,0 +1,21 @@
+# Generated by Django 5.1 on 2026-10-18 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['brand', 'model_name', 'body_type'], name='cars_brand_model_body_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='carmodel',
+            index=models.Index(fields=['body_type'], name='cars_body_type_idx'),
+        ),
+    ]
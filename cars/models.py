@@ -76,3 +76,8 @@ class CarModel(BaseModel):
     class Meta:
         # Имя таблицы в базе данных - 'cars'.
         db_table = 'cars'
+        # Индексы для фильтрации объявлений по бренду, модели и типу кузова (через соединение с таблицей машин).
+        indexes = [
+            models.Index(fields=['brand', 'model_name', 'body_type'], name='cars_brand_model_body_idx'),
+            models.Index(fields=['body_type'], name='cars_body_type_idx'),
+        ]
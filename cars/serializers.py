@@ -1,9 +1,9 @@
 from rest_framework import serializers
-from django.core.exceptions import ObjectDoesNotExist
-from django.contrib.auth import get_user_model
 
 from .models import CarModel, Brand, ModelName
 from core.services.managers_notification import ManagerNotificationService
+from core.services.car_catalog_service import CarCatalogService
+from .fields import CatalogPrimaryKeyRelatedField
 
 
 class CarSerializer(serializers.ModelSerializer):
@@ -11,11 +11,12 @@ class CarSerializer(serializers.ModelSerializer):
     Сериализатор для создания и валидации объекта CarModel.
     """
 
-    # Поле для связи с брендом автомобиля. PrimaryKeyRelatedField связывает автомобиль с существующим объектом Brand.
-    brand = serializers.PrimaryKeyRelatedField(queryset=Brand.objects.all())
+    # Поле для связи с брендом автомобиля. Связывает автомобиль с существующим объектом Brand,
+    # ID проверяется по справочнику в памяти (CarCatalogService).
+    brand = CatalogPrimaryKeyRelatedField(lookup=CarCatalogService.get_brand, queryset=Brand.objects.all())
 
-    # Поле для связи с моделью автомобиля. PrimaryKeyRelatedField связывает автомобиль с существующим объектом ModelName.
-    model_name = serializers.PrimaryKeyRelatedField(queryset=ModelName.objects.all())
+    # Поле для связи с моделью автомобиля. Связывает автомобиль с существующим объектом ModelName.
+    model_name = CatalogPrimaryKeyRelatedField(lookup=CarCatalogService.get_model, queryset=ModelName.objects.all())
 
     class Meta:
         # Указывает, что сериализатор работает с моделью CarModel.
@@ -30,14 +31,12 @@ class CarSerializer(serializers.ModelSerializer):
         Если модель не принадлежит бренду, отправляется уведомление менеджеру и выбрасывается ошибка.
         """
         brand = validated_data.get('brand')
-        model_name_id = validated_data.get('model_name').id
+        model_name = validated_data.get('model_name')
 
-        # Проверка, существует ли связь между брендом и моделью.
-        if not ModelName.objects.filter(id=model_name_id, brand=brand).exists():
+        # Проверка, существует ли связь между брендом и моделью (по справочнику в памяти).
+        if not CarCatalogService.model_belongs_to_brand(model_name.id, brand.id):
             # Получаем текущего пользователя из контекста запроса.
             user = self.context['request'].user
-            # Получаем объект ModelName по id.
-            model_name = ModelName.objects.get(id=model_name_id)
             # Отправляем уведомление менеджеру.
             self.send_manager_notification(brand.name, model_name.name, user)
             # Генерируем ошибку валидации, если связь между брендом и моделью не найдена.
@@ -48,20 +47,10 @@ class CarSerializer(serializers.ModelSerializer):
 
     def send_manager_notification(self, brand_name, model_name, user):
         """
-        Отправляет уведомление менеджеру, если бренд и модель не совпадают.
+        Отправляет уведомление одному менеджеру, если бренд и модель не совпадают.
         """
-        UserModel = get_user_model()  # Получаем модель пользователя (вероятно, кастомная).
-        try:
-            # Ищем пользователя с ролью менеджера (role_id=3).
-            manager = UserModel.objects.filter(role_id=3).first()
-            if manager:
-                # Отправляем уведомление с использованием сервиса уведомлений.
-                ManagerNotificationService.send_notification(brand_name, model_name, user.username, manager.id)
-            else:
-                # Если менеджер не найден, выбрасывается ошибка.
-                raise serializers.ValidationError("Manager not found.")
-        except ObjectDoesNotExist:
-            # Обработка исключений, если менеджер не существует в базе данных.
+        if ManagerNotificationService.send_notification(brand_name, model_name, user.username) is None:
+            # Если менеджер не найден, выбрасывается ошибка.
             raise serializers.ValidationError("Manager not found.")
 
 
@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.car_catalog_service import CarCatalogService
+from .models import Brand, ModelName
+
+
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+@receiver(post_save, sender=ModelName)
+@receiver(post_delete, sender=ModelName)
+def bump_cars_generation(sender, **kwargs):
+    """
+    Изменение бренда или модели делает недействительными справочник в памяти процессов
+    и версии ответов справочника брендов и моделей. Поколение увеличивается после фиксации транзакции:
+    иначе другой процесс может загрузить прежние бренды и модели уже под новой версией и хранить их до следующего
+    изменения справочника.
+    """
+    transaction.on_commit(invalidate_car_catalog)
+
+
+def invalidate_car_catalog():
+    CacheGenerationService.bump(CacheGenerationService.CARS)
+    CarCatalogService.invalidate()
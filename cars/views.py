@@ -7,7 +7,10 @@ from rest_framework import status
 
 from .serializers import CarSerializer, BrandSerializer, ModelNameSerializer
 from .models import CarModel, Brand, ModelName
-from core.pagination import PagePagination
+from core.pagination import KeysetPagination
+from core.services.car_catalog_service import CarCatalogService
+from core.conditional import ConditionalGetMixin, make_etag
+from core.services.cache_generation_service import CacheGenerationService
 from .filters import CarFilter
 
 
@@ -28,7 +31,11 @@ class CarListCreateView(ListCreateAPIView):
     permission_classes = [AllowAny]
 
     # Указываем класс пагинации, который будет использован для отображения списка автомобилей.
-    pagination_class = PagePagination
+    # Поддерживает как номера страниц, так и курсор (`?cursor=`) для бесконечной прокрутки.
+    pagination_class = KeysetPagination
+
+    # Поля сортировки, поддерживаемые в режиме курсора (поле `model_name` может быть пустым и не поддерживается).
+    cursor_ordering_fields = ('brand', 'created_at')
 
     # Фильтрация и сортировка данных.
     filter_backends = [DjangoFilterBackend, OrderingFilter]
@@ -37,10 +44,10 @@ class CarListCreateView(ListCreateAPIView):
     filterset_class = CarFilter
 
     # Поля, по которым можно сортировать список автомобилей.
-    ordering_fields = ['year', 'brand', 'model_name']
+    ordering_fields = ['brand', 'model_name', 'created_at']
 
-    # Поле сортировки по умолчанию - год выпуска автомобиля.
-    ordering = ['year']
+    # Сортировка по умолчанию - сначала новые автомобили (поддерживается и в режиме курсора).
+    ordering = ['-created_at']
 
 
 class CarRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
@@ -73,7 +80,7 @@ class CarRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
         return Response({"detail": "Car successfully deleted."}, status=status.HTTP_204_NO_CONTENT)
 
 
-class BrandModelDataView(ListAPIView):
+class BrandModelDataView(ConditionalGetMixin, ListAPIView):
     """
     Вью для получения данных о брендах и связанных с ними моделях автомобилей.
     Наследуется от ListAPIView и поддерживает метод GET.
@@ -87,17 +94,28 @@ class BrandModelDataView(ListAPIView):
     # Доступ к представлению разрешен любому пользователю
     permission_classes = [AllowAny]
 
+    # Справочник меняется редко: ответ можно кешировать в nginx дольше.
+    cache_control = {'public': True, 'max_age': 60}
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        ETag справочника по поколению брендов и моделей, без запроса к БД.
+        """
+        generation = CacheGenerationService.get(CacheGenerationService.CARS)
+        return (make_etag('brand-models', generation) if generation is not None else None), None
+
     def list(self, request, *args, **kwargs):
         """
         Переопределяем метод list для добавления данных о моделях, связанных с брендами.
         """
-        brands = Brand.objects.all()
+        # Бренды и модели берем из справочника в памяти, без запросов к БД.
+        brands = CarCatalogService.get_brands()
         response = BrandSerializer(brands, many=True).data
 
         # Создаем правильную структуру для брендов и моделей
         brands_models = {}
         for brand in brands:
-            models = ModelName.objects.filter(brand=brand)
+            models = CarCatalogService.get_brand_models(brand.id)
             brands_models[brand.id] = ModelNameSerializer(models, many=True).data
 
         # Объединяем данные сериализатора с моделями автомобилей
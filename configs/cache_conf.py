@@ -0,0 +1,18 @@
+from configs.redis_conf import REDIS_URL
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+        'OPTIONS': {
+            # Короткие таймауты: при недоступном Redis сервисы переходят на локальные данные процесса.
+            'socket_connect_timeout': 0.2,
+            'socket_timeout': 0.2,
+        },
+    }
+}
+
+CURRENCY_RATES_CHECK_INTERVAL = 5  # Как часто (в секундах) процесс сверяет версию своего снимка курсов валют.
+FACETS_CACHE_TIMEOUT = 300  # Сколько (в секундах) хранятся фасетные счетчики одного набора фильтров.
+RESPONSE_CACHE_TIMEOUT = 30  # Сколько (в секундах) хранятся закешированные ответы публичных списков.
+CAR_CATALOG_CHECK_INTERVAL = 5  # Как часто (в секундах) процесс сверяет версию справочника брендов и моделей.
@@ -4,6 +4,7 @@ from celery import Celery
 from celery.schedules import crontab
 from django.db import OperationalError
 from django.db import connection
+from django.conf import settings
 
 # Устанавливаем настройки Django для использования в приложении.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'configs.settings')
@@ -28,8 +29,17 @@ app = Celery('configs')
 # Загружаем настройки Celery из конфигурации Django. Все параметры Celery должны начинаться с префикса CELERY_.
 app.config_from_object('django.conf:settings', namespace='CELERY')
 
-# Импортируем задачи из модуля `currency_service` для использования в Celery.
-app.conf.imports = ('core.services.currency_service',)
+# Импортируем задачи из модулей сервисов для использования в Celery.
+app.conf.imports = (
+    'core.services.currency_service',
+    'core.services.view_counter_service',
+    'core.services.segment_stats_service',
+    'core.services.moderation_service',
+    'core.services.manager_routing_service',
+    'core.services.email_dispatcher',
+    'core.services.outbox_service',
+    'core.services.image_derivative_service',
+)
 
 # Автоматически обнаруживаем задачи из указанных модулей (в данном случае 'core.services').
 app.autodiscover_tasks(['core.services'])
@@ -45,6 +55,26 @@ app.conf.beat_schedule = {
     'retry-update-currency-rates-noon': {
         'task': 'core.services.currency_service.update_currency_rates',  # Задача для выполнения.
         'schedule': crontab(hour=12, minute=0),  # Время выполнения.
+    },
+    # Задача для сброса накопленных просмотров объявлений в БД (по умолчанию каждые 30 секунд).
+    'flush-listing-views': {
+        'task': 'core.services.view_counter_service.flush_listing_views',  # Задача для выполнения.
+        'schedule': settings.VIEW_COUNTER_FLUSH_INTERVAL,  # Интервал выполнения в секундах.
+    },
+    # Задача для ротации окон просмотров объявлений в начале суток (каждый день в 00:00).
+    'rollover-listing-views': {
+        'task': 'core.services.view_counter_service.rollover_listing_views',  # Задача для выполнения.
+        'schedule': crontab(hour=0, minute=0),  # Время выполнения.
+    },
+    # Задача для отправки сводок уведомлений менеджерам (в режиме EMAIL_MANAGER_DIGEST).
+    'send-manager-digests': {
+        'task': 'core.services.email_dispatcher.send_manager_digests',  # Задача для выполнения.
+        'schedule': settings.EMAIL_DIGEST_INTERVAL,  # Интервал выполнения в секундах.
+    },
+    # Задача для публикации в брокер задач, записанных в outbox (по умолчанию каждую секунду).
+    'relay-outbox': {
+        'task': 'core.services.outbox_service.relay_outbox',  # Задача для выполнения.
+        'schedule': settings.OUTBOX_RELAY_INTERVAL,  # Интервал выполнения в секундах.
     }
 }
 
@@ -5,3 +5,13 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 
 CELERY_BEAT_SCHEDULER = 'django_celery_beat.schedulers:DatabaseScheduler'
+
+# Обработка изображений выполняется отдельным воркером с пулом процессов (очередь 'images'),
+# чтобы Pillow использовал все ядра и не задерживал остальные задачи.
+CELERY_TASK_ROUTES = {
+    'core.services.image_derivative_service.*': {'queue': 'images'},
+}
+
+OUTBOX_BATCH_SIZE = 200  # Сколько записей outbox публикуется в брокер за одну транзакцию.
+OUTBOX_RELAY_INTERVAL = 1  # Как часто (в секундах) задача-ретранслятор публикует записи outbox.
+OUTBOX_MAX_ATTEMPTS = 10  # После скольких неудачных попыток публикации запись outbox больше не публикуется.
@@ -4,7 +4,16 @@ EMAIL_HOST = os.environ.get('EMAIL_HOST')
 EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD')
 EMAIL_PORT = os.environ.get('EMAIL_PORT')
-EMAIL_USE_TLS = True
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS', 'True') == 'True'  # False - для локального SMTP-сервера без TLS.
+
+EMAIL_QUEUE_KEY = 'emails:queue'  # Ключ списка Redis с письмами, ожидающими отправки.
+EMAIL_BATCH_SIZE = 100  # Сколько писем забирается из очереди за один раз.
+EMAIL_BATCH_DELAY = 2  # Через сколько секунд после первого письма в очереди отправляется пачка.
+EMAIL_MAX_ATTEMPTS = 5  # После скольких неудачных попыток письмо больше не отправляется и переносится в EMAIL_DEAD_KEY.
+EMAIL_DEAD_KEY = 'emails:dead'  # Ключ списка Redis с письмами, которые так и не удалось отправить.
+EMAIL_MANAGER_DIGEST = False  # True - уведомления менеджерам объединяются в одно периодическое письмо.
+EMAIL_DIGEST_KEY = 'emails:digest'  # Префикс ключей Redis с уведомлениями для сводок менеджерам.
+EMAIL_DIGEST_INTERVAL = 15 * 60  # Как часто (в секундах) отправляются сводки менеджерам.
 
 print(f"EMAIL_HOST: {EMAIL_HOST}")
 print(f"EMAIL_HOST_USER: {EMAIL_HOST_USER}")
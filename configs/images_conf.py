@@ -0,0 +1,5 @@
+IMAGE_DERIVATIVE_WIDTHS = (320, 640, 1280)  # Ширины (в пикселях) уменьшенных копий фотографий объявлений и аватаров.
+IMAGE_DERIVATIVE_FORMATS = ('webp', 'jpeg')  # Форматы уменьшенных копий.
+IMAGE_QUALITY = {'webp': 75, 'jpeg': 80}  # Качество сжатия по форматам.
+IMAGE_PLACEHOLDER_WIDTH = 16  # Ширина заглушки, которая встраивается в ответ как data URI.
+IMAGE_DERIVATIVES_DIR = 'derivatives'  # Каталог уменьшенных копий в хранилище файлов.
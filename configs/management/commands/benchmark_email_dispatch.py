@@ -0,0 +1,63 @@
+import os
+import time
+
+from django.core.mail import EmailMultiAlternatives
+from django.core.management.base import BaseCommand, CommandError
+from django.template.loader import get_template
+
+from core.services.email_dispatcher import EmailDispatcher
+
+
+class Command(BaseCommand):
+    """
+    Команда для сравнения отправки писем по одному (новое SMTP-подключение и загрузка шаблона на каждое письмо)
+    и пакетной отправки `EmailDispatcher` (одно подключение, шаблон из кеша процесса).
+    Письма отправляются на настроенный SMTP-сервер, поэтому команду удобно запускать против локального
+    SMTP-сервера-заглушки, например:
+        python -m aiosmtpd -n -l localhost:1025
+        EMAIL_HOST=localhost EMAIL_PORT=1025 EMAIL_USE_TLS=False python manage.py benchmark_email_dispatch
+    """
+
+    help = 'Сравнить отправку писем по одному и пакетную отправку через одно SMTP-подключение'
+
+    def add_arguments(self, parser):
+        """
+        Аргументы команды: получатель и количество писем.
+        """
+        parser.add_argument('--to', type=str, default='manager@example.com', help='Адрес получателя')
+        parser.add_argument('--count', type=int, default=50, help='Количество писем в каждом замере')
+
+    def handle(self, *args, **options):
+        """
+        Основной метод команды: отправка писем обоими способами и вывод времени.
+        """
+        items = [
+            {
+                'to': options['to'],
+                'template_name': 'manager_notification_email.html',
+                'context': {'brand_name': f'Brand {number}', 'model_name': None, 'username': 'benchmark'},
+                'subject': 'Benchmark email',
+            }
+            for number in range(options['count'])
+        ]
+
+        started_at = time.perf_counter()
+        for item in items:
+            html_content = get_template(item['template_name']).render(item['context'])
+            message = EmailMultiAlternatives(
+                item['subject'], body='', from_email=os.environ.get('EMAIL_HOST_USER'), to=[item['to']]
+            )
+            message.attach_alternative(html_content, 'text/html')
+            message.send()
+        single_time = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        failed = EmailDispatcher.send_items(items)
+        batch_time = time.perf_counter() - started_at
+        if failed:
+            raise CommandError(f'{len(failed)} of {len(items)} emails were not sent.')
+
+        self.stdout.write(
+            f"{options['count']} emails   one by one: {single_time * 1000:.1f} ms   "
+            f"batched: {batch_time * 1000:.1f} ms   speedup x{single_time / batch_time:.1f}"
+        )
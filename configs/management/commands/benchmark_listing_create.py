@@ -0,0 +1,86 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from cars.models import ModelName
+from core.enums.country_region_enum import Region
+from currency.models import CurrencyModel
+from listings.views import ListingCreateView
+
+
+class Command(BaseCommand):
+    """
+    Команда для замера создания объявления через `ListingCreateView`: количество запросов к БД и время на одно
+    объявление. Объявления создаются в транзакции, которая откатывается после замеров.
+    С опцией --max-queries команда завершается ошибкой, если создание требует больше запросов.
+    """
+
+    help = 'Замерить количество запросов и время создания объявления'
+
+    def add_arguments(self, parser):
+        """
+        Аргументы команды: продавец, число повторов и допустимое количество запросов.
+        """
+        parser.add_argument('--seller', type=str, required=True, help='Имя пользователя продавца')
+        parser.add_argument('--repeat', type=int, default=20, help='Количество создаваемых объявлений')
+        parser.add_argument('--max-queries', type=int, help='Допустимое количество запросов на одно объявление')
+
+    def handle(self, *args, **options):
+        """
+        Основной метод команды: создание объявлений, замеры и проверка количества запросов.
+        """
+        seller = get_user_model().objects.filter(username=options['seller']).first()
+        if seller is None:
+            raise CommandError(f"Seller '{options['seller']}' not found.")
+        model_name = ModelName.objects.first()
+        currency = CurrencyModel.objects.first()
+        if model_name is None or currency is None:
+            raise CommandError('No car models or currencies found.')
+
+        data = {
+            'brand': model_name.brand_id,
+            'model_name': model_name.id,
+            'body_type': 'sedan',
+            'year': 2015,
+            'engine': '2.0',
+            'title': 'benchmark listing',
+            'description': 'Synthetic listing for creation benchmarks.',
+            'price': '10000',
+            'currency': currency.id,
+            'region': Region.KYIV.value,
+        }
+        factory = APIRequestFactory()
+        view = ListingCreateView.as_view()
+
+        queries, timings = [], []
+        with transaction.atomic():
+            for _ in range(options['repeat']):
+                request = factory.post('/api/listings/create/', data, format='multipart')
+                force_authenticate(request, seller)
+                with CaptureQueriesContext(connection) as captured:
+                    started_at = time.perf_counter()
+                    response = view(request)
+                    timings.append((time.perf_counter() - started_at) * 1000)
+                if response.status_code != 201:
+                    raise CommandError(f'Listing was not created: {response.status_code} {response.data}')
+                # Точки сохранения появляются только из-за внешней транзакции замера и не учитываются.
+                queries.append(sum(
+                    1 for query in captured.captured_queries
+                    if not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+                ))
+            transaction.set_rollback(True)
+
+        # Первое создание может загрузить снимки справочников и создать автомобиль, поэтому берется медиана.
+        median_queries = int(statistics.median(queries))
+        self.stdout.write(
+            f'queries per listing: median {median_queries}, max {max(queries)}   '
+            f'time: median {statistics.median(timings):.2f} ms'
+        )
+
+        if options['max_queries'] is not None and median_queries > options['max_queries']:
+            raise CommandError(f"Listing creation takes {median_queries} queries (limit {options['max_queries']}).")
@@ -0,0 +1,201 @@
+import json
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from cars.models import Brand, ModelName, CarModel
+from core.enums.country_region_enum import Region
+from core.services.currency_rate_service import CurrencyRateService
+from currency.models import CurrencyModel
+from listings.filters import ListingFilter
+from listings.models import ListingModel
+
+BENCHMARK_TITLE = 'benchmark listing'
+"""
+Заголовок синтетических объявлений, которые создает команда (по нему они удаляются опцией --cleanup).
+"""
+
+SCENARIOS = {
+    'all': {},
+    'region': {'region': Region.KYIV.value},
+    'brand': {'brand': '{brand}'},
+    'brand_model': {'brand': '{brand}', 'model_name': '{model_name}'},
+    'body_type': {'body_type': 'suv'},
+    'year_range': {'min_year': '2010', 'max_year': '2015'},
+    'price_range': {'price_currency': 'USD', 'price_min': '10000', 'price_max': '20000'},
+    'price_sort': {'price_currency': 'EUR', 'ordering': 'price'},
+    'search': {'q': 'synthetic listing'},
+    'brand_year_price': {'brand': '{brand}', 'min_year': '2005', 'price_max': '30000'},
+    'active': {'active': 'true'},
+    'region_active': {'region': Region.KYIV.value, 'active': 'true'},
+    'price_sort_active': {'price_currency': 'EUR', 'ordering': 'price', 'active': 'true'},
+}
+"""
+Типичные комбинации фильтров `ListingFilter` в том виде, в каком их выполняет `ListingListView`: публичный список
+не ограничивается активными объявлениями, пока клиент не передаст `active=true` (такие варианты замеряются отдельно).
+По умолчанию выполняется с сортировкой `-created_at`, как в `ListingListView`.
+"""
+
+
+class Command(BaseCommand):
+    """
+    Команда для проверки индексов таблицы объявлений: при необходимости заполняет БД синтетическими данными,
+    выполняет типичные комбинации фильтров `ListingFilter`, сохраняет планы EXPLAIN и время выполнения.
+    С опцией --compare сравнивает результат с предыдущим отчетом и сообщает о регрессиях планов и времени.
+    """
+
+    help = 'Замерить запросы ListingFilter (EXPLAIN и время) и сравнить с предыдущим отчетом'
+
+    def add_arguments(self, parser):
+        """
+        Аргументы команды: размер синтетических данных, число повторов, файлы отчета и сравнения.
+        """
+        parser.add_argument('--seed', type=int, default=0, help='Создать синтетические объявления до указанного количества')
+        parser.add_argument('--repeat', type=int, default=5, help='Количество повторов каждого запроса')
+        parser.add_argument('--page-size', type=int, default=100, help='Размер страницы списка')
+        parser.add_argument('--output', type=str, help='Путь для сохранения отчета в формате JSON')
+        parser.add_argument('--compare', type=str, help='Путь к предыдущему отчету для поиска регрессий')
+        parser.add_argument('--threshold', type=float, default=1.5, help='Во сколько раз запрос может замедлиться')
+        parser.add_argument('--cleanup', action='store_true', help='Удалить синтетические объявления после замеров')
+
+    def handle(self, *args, **options):
+        """
+        Основной метод команды: заполнение данных, замеры, сохранение и сравнение отчета.
+        """
+        if options['seed']:
+            self.seed(options['seed'])
+
+        car = CarModel.objects.exclude(model_name=None).first()
+        if car is None:
+            raise CommandError('No cars found. Run the command with --seed to create test data.')
+
+        report = {}
+        for name, params in SCENARIOS.items():
+            params = {key: value.format(brand=car.brand_id, model_name=car.model_name_id) for key, value in params.items()}
+            report[name] = self.measure(params, options['repeat'], options['page_size'])
+            self.stdout.write(
+                f"{name:<22} list {report[name]['list_ms']:>9.2f} ms   count {report[name]['count_ms']:>9.2f} ms"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as report_file:
+                json.dump(report, report_file, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Report saved to {options['output']}"))
+
+        if options['compare']:
+            self.compare(report, options['compare'], options['threshold'])
+
+        if options['cleanup']:
+            deleted, _ = ListingModel.objects.filter(title=BENCHMARK_TITLE).delete()
+            self.stdout.write(f'Benchmark listings deleted: {deleted}')
+
+    @staticmethod
+    def measure(params, repeat, page_size):
+        """
+        Выполняет запрос страницы и подсчет для набора фильтров и возвращает медианное время и план запроса.
+        """
+        filterset = ListingFilter(params, queryset=ListingModel.objects.select_related('car').order_by('-created_at'))
+        if not filterset.is_valid():
+            raise CommandError(f'Invalid filter params {params}: {filterset.errors}')
+        queryset = filterset.qs
+
+        def timed(func):
+            timings = []
+            for _ in range(repeat):
+                started_at = time.perf_counter()
+                func()
+                timings.append((time.perf_counter() - started_at) * 1000)
+            return round(statistics.median(timings), 3)
+
+        return {
+            'params': params,
+            'list_ms': timed(lambda: list(queryset[:page_size])),
+            'count_ms': timed(queryset.count),
+            'explain': queryset[:page_size].explain(),
+            'sql': str(queryset[:page_size].query),
+        }
+
+    def compare(self, report, path, threshold):
+        """
+        Сравнивает отчет с предыдущим: изменившиеся планы и замедление больше порога считаются регрессией.
+        """
+        with open(path) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        regressions = 0
+        for name, result in report.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue
+            if previous['explain'] != result['explain']:
+                regressions += 1
+                self.stdout.write(self.style.WARNING(f'{name}: query plan changed'))
+            for metric in ('list_ms', 'count_ms'):
+                if previous[metric] and result[metric] > previous[metric] * threshold:
+                    regressions += 1
+                    self.stdout.write(self.style.WARNING(
+                        f'{name}: {metric} {previous[metric]:.2f} -> {result[metric]:.2f} ms'
+                    ))
+
+        if regressions:
+            self.stdout.write(self.style.ERROR(f'Regressions found: {regressions}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('No regressions found.'))
+
+    def seed(self, total):
+        """
+        Создает синтетические объявления (пачками через bulk_create), пока их общее количество не достигнет `total`.
+        """
+        missing = total - ListingModel.objects.count()
+        if missing <= 0:
+            return
+
+        currencies = list(CurrencyModel.objects.all())
+        if not currencies:
+            raise CommandError('No currencies found. Load currency rates first.')
+
+        rng = random.Random(42)
+        seller, _ = get_user_model().objects.get_or_create(
+            username='benchmark_seller', defaults={'email': 'benchmark_seller@example.com', 'role_id': 2}
+        )
+
+        cars = []
+        for brand_index in range(20):
+            brand, _ = Brand.objects.get_or_create(name=f'Brand {brand_index}')
+            for model_index in range(5):
+                model_name, _ = ModelName.objects.get_or_create(brand=brand, name=f'Model {brand_index}-{model_index}')
+                car, _ = CarModel.objects.get_or_create(
+                    brand=brand, model_name=model_name, body_type=rng.choice(CarModel.BODY_TYPES)[0]
+                )
+                cars.append(car)
+
+        regions = [region.value for region in Region]
+        batch = []
+        for _ in range(missing):
+            currency = rng.choice(currencies)
+            price = Decimal(rng.randrange(1000, 100000))
+            converted = CurrencyRateService.convert_price(price, currency.currency_code)
+            batch.append(ListingModel(
+                car=rng.choice(cars),
+                seller=seller,
+                title=BENCHMARK_TITLE,
+                description='Synthetic listing for index benchmarks.',
+                active=rng.random() < 0.8,
+                price=price,
+                currency=currency,
+                price_usd=converted['USD'],
+                price_eur=converted['EUR'],
+                price_uah=converted['UAH'],
+                region=rng.choice(regions),
+                year=rng.randrange(1995, 2025),
+                engine='2.0',
+            ))
+            if len(batch) == 5000:
+                ListingModel.objects.bulk_create(batch)
+                batch = []
+        ListingModel.objects.bulk_create(batch)
+        self.stdout.write(f'Benchmark listings created: {missing}')
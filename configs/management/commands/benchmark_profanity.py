@@ -0,0 +1,111 @@
+import random
+import re
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.enums.profanity_enum import ProfanityFilter
+
+WORDS = (
+    'машина', 'авто', 'продам', 'пробег', 'двигатель', 'состояние', 'отличное', 'торг', 'car', 'engine',
+    'new', 'tires', 'bmw', 'audi', 'седан', 'кузов', 'сразу', 'сосед', 'банк', 'избавлюсь', 'хорошая',
+)
+"""
+Обычные слова синтетических текстов (в том числе похожие на начала запрещенных слов).
+"""
+
+PROFANE_WORDS = ('хуйня', 'пиздато', 'блять', 'ебаный', 'сраная')
+"""
+Запрещенные слова, которые изредка подмешиваются в синтетические тексты.
+"""
+
+TEXT_SIZES = (100, 1000, 10000, 100000)
+"""
+Длины синтетических текстов в символах.
+"""
+
+
+def legacy_is_profane(text):
+    """
+    Прежняя проверка: замена небуквенных символов, приведение к нижнему регистру и отдельный `re.search`
+    по строке каждого шаблона.
+    """
+    text = re.sub(r'\W+', ' ', text.lower())
+    for item in ProfanityFilter:
+        if re.search(rf'\b{item.value[1]}\b', text):
+            return True
+    return False
+
+
+class Command(BaseCommand):
+    """
+    Команда для сравнения скомпилированного поиска запрещенных слов (`ProfanityFilter.is_profane`)
+    с прежней реализацией на синтетических текстах разной длины и для пакетной проверки `scan_many`.
+    Перед замерами проверяет, что обе реализации дают одинаковый результат.
+    """
+
+    help = 'Сравнить скорость проверки на запрещенные слова с прежней реализацией'
+
+    def add_arguments(self, parser):
+        """
+        Аргументы команды: число повторов и количество текстов для пакетной проверки.
+        """
+        parser.add_argument('--repeat', type=int, default=20, help='Количество повторов каждого замера')
+        parser.add_argument('--texts', type=int, default=1000, help='Количество описаний для пакетной проверки')
+
+    def handle(self, *args, **options):
+        """
+        Основной метод команды: проверка совпадения результатов и замеры.
+        """
+        rng = random.Random(42)
+
+        corpus = [self.make_text(rng, rng.randrange(50, 2000), profane_share=0.002) for _ in range(options['texts'])]
+        mismatches = sum(
+            1 for text in corpus if legacy_is_profane(text) != ProfanityFilter.is_profane(text)
+        )
+        if mismatches:
+            raise CommandError(f'Implementations disagree on {mismatches} texts.')
+
+        for size in TEXT_SIZES:
+            # Текст без запрещенных слов - худший случай: проверяется весь текст.
+            text = self.make_text(rng, size, profane_share=0)
+            legacy_ms = self.timed(lambda: legacy_is_profane(text), options['repeat'])
+            matcher_ms = self.timed(lambda: ProfanityFilter.is_profane(text), options['repeat'])
+            self.stdout.write(
+                f'{size:>7} chars   legacy {legacy_ms:>9.3f} ms   matcher {matcher_ms:>9.3f} ms   '
+                f'x{legacy_ms / matcher_ms:.1f}'
+            )
+
+        legacy_ms = self.timed(lambda: [legacy_is_profane(text) for text in corpus], options['repeat'])
+        matcher_ms = self.timed(lambda: ProfanityFilter.scan_many(corpus), options['repeat'])
+        self.stdout.write(
+            f"{len(corpus):>7} texts   legacy {legacy_ms:>9.3f} ms   scan_many {matcher_ms:>9.3f} ms   "
+            f'x{legacy_ms / matcher_ms:.1f}'
+        )
+
+    @staticmethod
+    def make_text(rng, size, profane_share):
+        """
+        Синтетический текст примерно из `size` символов с долей запрещенных слов `profane_share`.
+        """
+        words, length = [], 0
+        while length < size:
+            word = rng.choice(PROFANE_WORDS) if rng.random() < profane_share else rng.choice(WORDS)
+            if rng.random() < 0.1:
+                word = word.capitalize() + rng.choice(',.!')
+            words.append(word)
+            length += len(word) + 1
+        return ' '.join(words)
+
+    @staticmethod
+    def timed(func, repeat):
+        """
+        Медианное время выполнения функции в миллисекундах.
+        """
+        timings = []
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started_at) * 1000)
+        return statistics.median(timings)
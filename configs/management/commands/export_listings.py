@@ -0,0 +1,50 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+from rest_framework.exceptions import ValidationError
+
+from core.services.listing_export_service import ListingExportService
+
+
+class Command(BaseCommand):
+    """
+    Команда для потоковой выгрузки объявлений в CSV или JSONL (см. `ListingExportService`).
+    Фильтры задаются как параметры `ListingFilter`: --filter region=KYIV --filter active=true.
+    """
+
+    help = 'Выгрузить объявления в файл CSV или JSONL'
+
+    def add_arguments(self, parser):
+        """
+        Аргументы команды: формат, файл выгрузки и фильтры.
+        """
+        parser.add_argument('--format', type=str, choices=ListingExportService.FORMATS, default='csv', help='Формат выгрузки')
+        parser.add_argument('--output', type=str, help='Путь к файлу выгрузки (по умолчанию - стандартный вывод)')
+        parser.add_argument('--filter', action='append', default=[], help='Фильтр ListingFilter в виде name=value')
+
+    def handle(self, *args, **options):
+        """
+        Основной метод команды: фильтрация и запись выгрузки по частям.
+        """
+        params = QueryDict(mutable=True)
+        for item in options['filter']:
+            name, separator, value = item.partition('=')
+            if not separator:
+                raise CommandError(f"Invalid filter '{item}'. Use name=value.")
+            params.appendlist(name, value)
+
+        try:
+            queryset = ListingExportService.get_queryset(params)
+        except ValidationError as e:
+            raise CommandError(f'Invalid filters: {e.detail}')
+
+        output = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        try:
+            for line in ListingExportService.stream(queryset, options['format']):
+                output.write(line)
+        finally:
+            if options['output']:
+                output.close()
+        if options['output']:
+            self.stdout.write(self.style.SUCCESS(f"Export saved to {options['output']}"))
@@ -0,0 +1,48 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.listing_import_service import ListingImportService
+
+
+class Command(BaseCommand):
+    """
+    Команда для массового импорта объявлений продавца из файла CSV или JSONL (см. `ListingImportService`).
+    Файл читается построчно; отчет об ошибках выводится или сохраняется в JSON.
+    """
+
+    help = 'Импортировать объявления продавца из файла CSV или JSONL'
+
+    def add_arguments(self, parser):
+        """
+        Аргументы команды: путь к файлу, продавец, формат и файл отчета.
+        """
+        parser.add_argument('path', type=str, help='Путь к файлу CSV или JSONL')
+        parser.add_argument('--seller', type=str, required=True, help='Имя пользователя продавца')
+        parser.add_argument('--format', type=str, choices=ListingImportService.FORMATS, help='Формат файла')
+        parser.add_argument('--report', type=str, help='Путь для сохранения отчета об ошибках в формате JSON')
+
+    def handle(self, *args, **options):
+        """
+        Основной метод команды: импорт и вывод отчета.
+        """
+        seller = get_user_model().objects.filter(username=options['seller']).first()
+        if seller is None:
+            raise CommandError(f"Seller '{options['seller']}' not found.")
+
+        file_format = ListingImportService.get_format(options['path'], options['format'])
+        if file_format is None:
+            raise CommandError('Unsupported file format. Use --format csv or --format jsonl.')
+
+        with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+            report = ListingImportService(seller).import_stream(stream, file_format)
+
+        self.stdout.write(f"Listings created: {report['created']}, failed rows: {report['failed']}")
+        if options['report']:
+            with open(options['report'], 'w') as report_file:
+                json.dump(report, report_file, indent=2, ensure_ascii=False)
+            self.stdout.write(self.style.SUCCESS(f"Report saved to {options['report']}"))
+        else:
+            for error in report['errors'][:20]:
+                self.stdout.write(self.style.WARNING(f"row {error['row']}: {error['errors']}"))
@@ -0,0 +1,34 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.services.outbox_service import OutboxService
+
+
+class Command(BaseCommand):
+    """
+    Команда для непрерывной публикации записей outbox в брокер (отдельный процесс-ретранслятор
+    с меньшей задержкой, чем задача `relay_outbox` по расписанию). Несколько ретрансляторов могут работать
+    одновременно: записи блокируются с SKIP LOCKED.
+    """
+
+    help = 'Публиковать задачи из outbox в брокер Celery'
+
+    def add_arguments(self, parser):
+        """
+        Аргументы команды: интервал опроса и однократный запуск.
+        """
+        parser.add_argument('--interval', type=float, default=0.5, help='Пауза (в секундах), если outbox пуст')
+        parser.add_argument('--once', action='store_true', help='Опубликовать текущие записи и завершиться')
+
+    def handle(self, *args, **options):
+        """
+        Основной метод команды: публикация пачек записей до остановки процесса.
+        """
+        while True:
+            relayed = OutboxService.relay_all()
+            if options['once']:
+                self.stdout.write(f'relayed: {relayed}')
+                return
+            if not relayed:
+                time.sleep(options['interval'])
@@ -0,0 +1,4 @@
+MANAGER_ROUTING_STRATEGY = 'least_open'  # Выбор менеджера для события: 'round_robin' или 'least_open'.
+MANAGER_ROSTER_TIMEOUT = 300  # Сколько (в секундах) хранится закешированный список менеджеров.
+MANAGER_ESCALATION_TIMEOUT = 4 * 60 * 60  # Через сколько секунд незакрытое событие переназначается другому менеджеру.
+MANAGER_MAX_ESCALATIONS = 2  # Сколько раз событие может быть переназначено.
@@ -0,0 +1,3 @@
+MODERATION_MAX_EDIT_ATTEMPTS = 3  # Количество отклоненных описаний, после которого объявление передается менеджерам.
+MODERATION_ALERTS_KEY = 'moderation:alerts'  # Список Redis, в котором копятся уведомления менеджерам до отправки.
+MODERATION_ALERTS_DELAY = 60  # Через сколько секунд после первого уведомления отправляется сводка менеджерам.
@@ -0,0 +1,7 @@
+import os
+
+REDIS_URL = os.environ.get('REDIS_URL', 'redis://redis:6379/1')  # База Redis для счетчиков и кешей (0-я занята брокером Celery).
+
+VIEW_COUNTER_KEY = 'listings:views'  # Хеш Redis, в котором копятся просмотры объявлений до сброса в БД.
+VIEW_COUNTER_FLUSH_INTERVAL = 30  # Интервал (в секундах) сброса накопленных просмотров в БД.
+VIEW_COUNTER_LOCAL_FLUSH_SIZE = 500  # Размер локального буфера, при котором он сбрасывается в БД без ожидания интервала.
@@ -4,9 +4,20 @@ from datetime import timedelta
 from dotenv import load_dotenv
 
 
-from configs.email_conf import EMAIL_HOST, EMAIL_HOST_USER, EMAIL_HOST_PASSWORD, EMAIL_PORT, EMAIL_USE_TLS
-from configs.celery_conf import CELERY_BROKER_URL, CELERY_BEAT_SCHEDULER, CELERY_RESULTS_BACKEND, CELERY_ACCEPT_CONTENT, CELERY_RESULT_SERIALIZER, CELERY_TASK_SERIALIZER
+from configs.email_conf import EMAIL_HOST, EMAIL_HOST_USER, EMAIL_HOST_PASSWORD, EMAIL_PORT, EMAIL_USE_TLS, \
+    EMAIL_QUEUE_KEY, EMAIL_BATCH_SIZE, EMAIL_BATCH_DELAY, EMAIL_MAX_ATTEMPTS, EMAIL_DEAD_KEY, EMAIL_MANAGER_DIGEST, \
+    EMAIL_DIGEST_KEY, EMAIL_DIGEST_INTERVAL
+from configs.celery_conf import CELERY_BROKER_URL, CELERY_BEAT_SCHEDULER, CELERY_RESULTS_BACKEND, CELERY_ACCEPT_CONTENT, CELERY_RESULT_SERIALIZER, CELERY_TASK_SERIALIZER, \
+    OUTBOX_BATCH_SIZE, OUTBOX_RELAY_INTERVAL, OUTBOX_MAX_ATTEMPTS, CELERY_TASK_ROUTES
 from configs.channels_conf import CHANNEL_LAYERS
+from configs.redis_conf import REDIS_URL, VIEW_COUNTER_KEY, VIEW_COUNTER_FLUSH_INTERVAL, VIEW_COUNTER_LOCAL_FLUSH_SIZE
+from configs.cache_conf import CACHES, CURRENCY_RATES_CHECK_INTERVAL, FACETS_CACHE_TIMEOUT, RESPONSE_CACHE_TIMEOUT, \
+    CAR_CATALOG_CHECK_INTERVAL
+from configs.moderation_conf import MODERATION_MAX_EDIT_ATTEMPTS, MODERATION_ALERTS_KEY, MODERATION_ALERTS_DELAY
+from configs.managers_conf import MANAGER_ROUTING_STRATEGY, MANAGER_ROSTER_TIMEOUT, MANAGER_ESCALATION_TIMEOUT, \
+    MANAGER_MAX_ESCALATIONS
+from configs.images_conf import IMAGE_DERIVATIVE_WIDTHS, IMAGE_DERIVATIVE_FORMATS, IMAGE_QUALITY, \
+    IMAGE_PLACEHOLDER_WIDTH, IMAGE_DERIVATIVES_DIR
 
 
 BASE_DIR = Path(__file__).resolve().parent.parent
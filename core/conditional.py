@@ -0,0 +1,66 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+
+def make_etag(*parts):
+    """
+    Строит ETag из частей версии ответа (поколения данных, времени изменения, параметров запроса).
+    """
+    return quote_etag(hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest())
+
+
+class ConditionalResponse(Exception):
+    """
+    Прерывает обработку запроса готовым ответом (304 Not Modified или 412 Precondition Failed).
+    """
+
+    def __init__(self, response):
+        super().__init__(response.status_code)
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    Примесь для DRF-представлений: условный GET по ETag / Last-Modified и заголовки Cache-Control.
+    Валидаторы вычисляются методом `get_validators` дешево (по `updated_at` или поколению данных), до построения
+    тела ответа; если версия клиента актуальна, возвращается 304 Not Modified без вызова обработчика запроса.
+    Проверка выполняется после аутентификации и проверки прав (`initial`).
+    """
+    cache_control = {'public': True, 'max_age': 5}  # Заголовок Cache-Control (микрокеширование в nginx).
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Возвращает валидаторы ответа.
+        :return: Кортеж (ETag или None, время изменения datetime или None)
+        """
+        return None, None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag, self.last_modified = None, None
+        if request.method not in ('GET', 'HEAD'):
+            return
+
+        self.etag, last_modified = self.get_validators(request, *args, **kwargs)
+        self.last_modified = int(last_modified.timestamp()) if last_modified else None
+        if self.etag or self.last_modified:
+            response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+            if response is not None:
+                raise ConditionalResponse(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ConditionalResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method in ('GET', 'HEAD') and (200 <= response.status_code < 300 or response.status_code == 304):
+            if getattr(self, 'etag', None):
+                response['ETag'] = self.etag
+            if getattr(self, 'last_modified', None):
+                response['Last-Modified'] = http_date(self.last_modified)
+            patch_cache_control(response, **self.cache_control)
+        return response
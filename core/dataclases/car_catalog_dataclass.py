@@ -0,0 +1,17 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping, Sequence
+
+
+@dataclass(frozen=True)
+class CarCatalogSnapshot:
+    """
+    Класс CarCatalogSnapshot хранит неизменяемый снимок справочника брендов и моделей, загруженный из БД.
+    Снимок разделяется всеми потоками процесса и заменяется целиком при смене версии справочника.
+    Объекты брендов и моделей в снимке используются только для чтения.
+    """
+
+    version: int  # Версия справочника, под которой снимок был загружен.
+    brands: Mapping[int, Any] = field(default_factory=lambda: MappingProxyType({}))  # Бренд по ID.
+    models: Mapping[int, Any] = field(default_factory=lambda: MappingProxyType({}))  # Модель по ID.
+    brand_models: Mapping[int, Sequence[Any]] = field(default_factory=lambda: MappingProxyType({}))  # Модели бренда.
@@ -0,0 +1,15 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Mapping
+
+
+@dataclass(frozen=True)
+class CurrencyRateSnapshot:
+    """
+    Класс CurrencyRateSnapshot хранит неизменяемый снимок курсов валют, загруженный из БД одним запросом.
+    Снимок разделяется всеми потоками процесса и заменяется целиком при смене версии курсов.
+    """
+
+    version: int  # Версия курсов, под которой снимок был загружен.
+    rates: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))  # Курс по коду валюты.
+    currency_codes: Mapping[int, str] = field(default_factory=lambda: MappingProxyType({}))  # Код валюты по ее ID.
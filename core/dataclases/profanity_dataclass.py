@@ -0,0 +1,14 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ProfanityMatch:
+    """
+    Класс ProfanityMatch описывает одно найденное запрещенное слово: его позицию в исходном тексте,
+    само слово и имя шаблона `ProfanityFilter`, которым оно найдено.
+    """
+
+    start: int  # Позиция начала слова в тексте.
+    end: int  # Позиция конца слова в тексте (не включительно).
+    word: str  # Найденное слово.
+    pattern: str  # Имя шаблона (например, HUY).
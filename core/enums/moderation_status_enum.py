@@ -0,0 +1,19 @@
+from enum import Enum
+
+
+class ModerationStatus(Enum):
+    """
+    Перечисление статусов модерации объявления.
+    Новое или измененное объявление ожидает проверки (PENDING) и неактивно до ее завершения.
+    """
+
+    PENDING = 'pending'
+    APPROVED = 'approved'
+    REJECTED = 'rejected'
+
+    @classmethod
+    def choices(cls):
+        """
+        Варианты статусов для поля модели.
+        """
+        return [(status.value, status.name.capitalize()) for status in cls]
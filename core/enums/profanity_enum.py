@@ -1,44 +1,42 @@
-import re
 from enum import Enum
 
-
-BAD_WORDS = {
-    "хуй", "пизда", "блядь",
-    "нахуй", "срань", "говно", "гавно", "гімно",
-    "сраний", "їбаний", "йобаний", "ебаный"
-}
-
-def is_profane(text):
-    """
-    Проверяет, содержит ли текст запрещенные слова. Слова из текста приводятся к нижнему регистру
-    и сравниваются с набором запрещенных слов.
-    """
-    words = set(word.lower() for word in text.split())
-    return any(word in BAD_WORDS for word in words)
-
-# Пример использования функции для проверки текста на наличие запрещенных слов.
-text = "This is a bad example."
-if is_profane(text):
-    print("The text contains prohibited words.")
+from core.services.profanity_matcher import ProfanityMatcher
 
 
 class ProfanityFilter(Enum):
     """
-    Перечисление для проверки текста на наличие запрещенных слов с использованием регулярных выражений.
+    Перечисление шаблонов запрещенных слов. Значение - пара (слово, регулярное выражение слова);
+    границы слова добавляет `ProfanityMatcher`, который компилирует все шаблоны в одно выражение.
     """
-    HUY = (r"хуй", r"\bху[йиюе]\w*\b")
-    PIZDA = (r"пизда", r"\bп[ие]зд[ауы]\w*\b")
-    BLYAD = (r"блядь", r"\bбля[дть]\w*\b")
-    EBANYY = (r"ебаный", r"\b[еи]ба[нт][аыуоий]*\b")
-    SRANYY = (r"сраний", r"\bсра[нт][аыуоий]*\b")
+    HUY = (r"хуй", r"ху[йиюе]\w*")
+    PIZDA = (r"пизда", r"п[ие]зд[ауы]\w*")
+    BLYAD = (r"блядь", r"бля[дть]\w*")
+    EBANYY = (r"ебаный", r"[еи]ба[нт][аыуоий]*")
+    SRANYY = (r"сраний", r"сра[нт][аыуоий]*")
 
     @classmethod
     def is_profane(cls, text):
         """
-        Проверяет текст на наличие запрещенных слов, используя регулярные выражения.
+        Проверяет текст на наличие запрещенных слов за один проход.
+        """
+        return PROFANITY_MATCHER.is_profane(text)
+
+    @classmethod
+    def scan(cls, text):
         """
-        text = re.sub(r'\W+', ' ', text.lower())  # Убираем все специальные символы и приводим к нижнему регистру.
-        for item in cls:
-            if re.search(item.value[1], text):
-                return True
-        return False
+        Находит все запрещенные слова в тексте с их позициями.
+        """
+        return PROFANITY_MATCHER.scan(text)
+
+    @classmethod
+    def scan_many(cls, texts):
+        """
+        Находит запрещенные слова с их позициями в каждом тексте из набора.
+        """
+        return PROFANITY_MATCHER.scan_many(texts)
+
+
+PROFANITY_MATCHER = ProfanityMatcher((item.name, item.value[1]) for item in ProfanityFilter)
+"""
+Скомпилированный поиск по всем шаблонам `ProfanityFilter` (создается один раз при импорте модуля).
+"""
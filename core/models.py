@@ -11,3 +11,20 @@ class BaseModel(models.Model):
 
     class Meta:
         abstract = True  # Указывает, что эта модель является абстрактной и не будет создавать отдельную таблицу в базе данных.
+
+
+class OutboxModel(BaseModel):
+    """
+    Задача Celery, записанная в той же транзакции, что и изменение данных (transactional outbox).
+    Запись публикуется в брокер ретранслятором (`OutboxService.relay`) только после фиксации транзакции
+    и удаляется после публикации; при откате транзакции задача не появляется вовсе.
+    """
+    task = models.CharField(max_length=255)  # Имя зарегистрированной задачи Celery.
+    args = models.JSONField(default=list)  # Позиционные аргументы задачи.
+    kwargs = models.JSONField(default=dict)  # Именованные аргументы задачи.
+    eta = models.DateTimeField(null=True, blank=True)  # Не раньше какого времени выполнить задачу.
+    attempts = models.IntegerField(default=0)  # Количество неудачных попыток публикации.
+    last_error = models.TextField(blank=True, default='')  # Ошибка последней неудачной попытки публикации.
+
+    class Meta:
+        db_table = 'outbox'  # Имя таблицы в базе данных.
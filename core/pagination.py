@@ -1,16 +1,156 @@
 import math
 
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from core.services.query_key import make_query_key
+
+
+class ExactCount:
+    """
+    Точное количество записей: COUNT(*) по отфильтрованному запросу на каждый запрос (поведение по умолчанию).
+    """
+
+    def count(self, queryset, request):
+        """
+        :return: Кортеж (количество, точное ли оно)
+        """
+        return queryset.count(), True
+
+
+class CappedCount:
+    """
+    Ограниченный подсчет "не меньше N": COUNT(*) по подзапросу с LIMIT `cap + 1`.
+    Если записей больше `cap`, возвращается `cap` с признаком неточного значения.
+    """
+
+    def __init__(self, cap=1000):
+        self.cap = cap
+
+    def count(self, queryset, request):
+        count = queryset[:self.cap + 1].count()
+        if count > self.cap:
+            return self.cap, False
+        return count, True
+
+
+class CachedCount:
+    """
+    Количество записей, закешированное на короткое время для нормализованного набора фильтров запроса.
+    Параметры страницы и сортировки в ключ не входят, поэтому все страницы одной выборки используют одно значение.
+    Ключ начинается с префикса (по умолчанию - путь запроса), чтобы разные вью одной модели не делили счетчик.
+    Для выборок, зависящих от пользователя (например, объявления продавца), нужен `per_user=True`.
+    """
+    excluded_params = ('page', 'size', 'cursor', 'ordering')
+
+    def __init__(self, timeout=60, counter=None, key_prefix=None, per_user=False):
+        self.timeout = timeout
+        self.counter = counter or ExactCount()
+        self.key_prefix = key_prefix
+        self.per_user = per_user
+
+    def get_cache_key(self, queryset, request):
+        """
+        Ключ кеша: префикс вью, пользователь (для `per_user`), модель и нормализованные фильтры запроса.
+        """
+        parts = ['count', self.key_prefix or request.path]
+        if self.per_user:
+            parts.append(str(request.user.pk) if request.user.is_authenticated else 'anonymous')
+        parts.append(queryset.model._meta.label_lower)
+        parts.append(make_query_key(request.query_params, exclude=self.excluded_params))
+        return ':'.join(parts)
+
+    def count(self, queryset, request):
+        key = self.get_cache_key(queryset, request)
+        try:
+            cached = cache.get(key)
+        except Exception:
+            # Кеш недоступен - считаем напрямую.
+            return self.counter.count(queryset, request)
+        if cached is not None:
+            return tuple(cached)
+
+        result = self.counter.count(queryset, request)
+        try:
+            cache.set(key, result, self.timeout)
+        except Exception:
+            pass
+        return result
+
+
+class EstimatedCount:
+    """
+    Приблизительное количество записей по статистике таблицы MySQL (information_schema.TABLES.TABLE_ROWS)
+    без сканирования таблицы. Статистика есть только для запроса без фильтров, поэтому для отфильтрованных
+    запросов и других СУБД используется запасная стратегия.
+    """
+
+    def __init__(self, fallback=None):
+        self.fallback = fallback or CappedCount()
+
+    def count(self, queryset, request):
+        connection = connections[queryset.db]
+        if connection.vendor != 'mysql' or queryset.query.where:
+            return self.fallback.count(queryset, request)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        if not row or row[0] is None:
+            return self.fallback.count(queryset, request)
+        return int(row[0]), False
+
+
+class CountStrategyPaginator(Paginator):
+    """
+    Django Paginator, который получает общее количество записей от стратегии подсчета вместо COUNT(*).
+    """
+
+    def __init__(self, object_list, per_page, count_strategy, request, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_strategy = count_strategy
+        self.request = request
+        self.count_is_exact = True
+
+    @cached_property
+    def count(self):
+        count, self.count_is_exact = self.count_strategy.count(self.object_list, self.request)
+        return count
+
 
 class PagePagination(PageNumberPagination):
     """
     Кастомная пагинация для API. Управляет размером страниц и количеством элементов на странице.
+    Способ подсчета общего количества задается стратегией: атрибутом `count_strategy` вью или пагинации.
     """
     page_size = 100  # Размер страницы по умолчанию.
     max_page_size = 100  # Максимальный размер страницы.
     page_size_query_param = 'size'  # Параметр запроса для управления размером страницы.
+    count_strategy = ExactCount()  # Стратегия подсчета общего количества элементов.
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Выбирает стратегию подсчета: стратегия вью имеет приоритет над стратегией пагинации.
+        """
+        self.count_strategy = getattr(view, 'count_strategy', None) or self.count_strategy
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset, page_size):
+        """
+        Создает Django Paginator с выбранной стратегией подсчета.
+        """
+        return CountStrategyPaginator(queryset, page_size, count_strategy=self.count_strategy, request=self.request)
 
     def get_paginated_response(self, data):
         """
@@ -22,8 +162,163 @@ class PagePagination(PageNumberPagination):
         total_pages = math.ceil(count / self.get_page_size(self.request))  # Общее количество страниц.
         return Response({
             'total_items': count,
+            'total_items_exact': self.page.paginator.count_is_exact,  # Точное ли общее количество.
             'total_pages': total_pages,
             'prev': bool(self.get_previous_link()),  # Есть ли предыдущая страница.
             'next': bool(self.get_next_link()),  # Есть ли следующая страница.
             'data': data  # Данные для текущей страницы.
         })
+
+
+class KeysetPagination(PagePagination):
+    """
+    Пагинация по ключу (keyset/cursor) для бесконечной прокрутки. Включается параметром `cursor`
+    (пустое значение - первая страница); без него работает как обычная `PagePagination`.
+    Страница выбирается условием `(поле сортировки, id) > (значения последней записи)` вместо OFFSET
+    и без COUNT(*), поэтому время ответа не зависит от глубины страницы.
+    Курсор непрозрачен (подписан), привязан к сортировке и к набору фильтров запроса.
+    """
+    cursor_query_param = 'cursor'  # Параметр запроса с курсором.
+    cursor_ordering_fields = ('created_at',)  # Поля, по которым разрешена сортировка в режиме курсора.
+    cursor_salt = 'core.pagination.cursor'  # Соль для подписи курсора.
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Возвращает записи страницы. В режиме курсора выполняет один запрос с LIMIT `size + 1`.
+        """
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        allowed_fields = getattr(view, 'cursor_ordering_fields', self.cursor_ordering_fields)
+        ordering = self.get_cursor_ordering(queryset, allowed_fields)
+        self.ordering_key = [name if not descending else f'-{name}' for name, descending in ordering]
+        self.filter_key = make_query_key(
+            request.query_params, exclude=(self.cursor_query_param, self.page_query_param, self.page_size_query_param)
+        )
+
+        self.cursor_fields = self.get_cursor_fields(queryset, ordering)
+        cursor = self.decode_cursor(request.query_params[self.cursor_query_param])
+        reverse = cursor is not None and cursor['direction'] == 'prev'
+
+        if cursor is not None:
+            queryset = queryset.filter(self.get_position_filter(ordering, cursor['values'], reverse))
+        queryset = queryset.order_by(*[
+            f'-{name}' if descending != reverse else name for name, descending in ordering
+        ])
+
+        results = list(queryset[:page_size + 1])
+        has_more = len(results) > page_size
+        results = results[:page_size]
+        if reverse:
+            results.reverse()
+
+        # При движении назад следующая страница есть всегда (мы пришли с нее), предыдущая - если нашлись еще записи.
+        self.has_next = True if reverse else has_more
+        self.has_previous = has_more if reverse else cursor is not None
+        self.next_cursor = self.encode_cursor(results[-1], 'next') if results and self.has_next else None
+        self.prev_cursor = self.encode_cursor(results[0], 'prev') if results and self.has_previous else None
+        return results
+
+    def get_paginated_response(self, data):
+        """
+        В режиме курсора возвращает прежние флаги `prev`/`next` и курсоры соседних страниц, без общего количества.
+        """
+        if not self.cursor_mode:
+            return super().get_paginated_response(data)
+        return Response({
+            'prev': self.has_previous,  # Есть ли предыдущая страница.
+            'next': self.has_next,  # Есть ли следующая страница.
+            'prev_cursor': self.prev_cursor,  # Курсор предыдущей страницы.
+            'next_cursor': self.next_cursor,  # Курсор следующей страницы.
+            'data': data  # Данные для текущей страницы.
+        })
+
+    def get_cursor_ordering(self, queryset, allowed_fields):
+        """
+        Определяет сортировку запроса в виде списка (поле, по убыванию) и добавляет `id` для однозначного порядка.
+        """
+        opts = queryset.model._meta
+        ordering = []
+        for item in queryset.query.order_by or opts.ordering or ('-pk',):
+            if not isinstance(item, str):
+                raise ValidationError({'ordering': 'This ordering is not supported with cursor pagination.'})
+            descending = item.startswith('-')
+            name = item.lstrip('-')
+            name = opts.pk.name if name == 'pk' else name
+            if name != opts.pk.name and name not in allowed_fields:
+                raise ValidationError({'ordering': f"Ordering by '{name}' is not supported with cursor pagination."})
+            ordering.append((name, descending))
+            if name == opts.pk.name:
+                break
+        else:
+            # Последним ключом всегда идет `id`, в том же направлении, что и последнее поле сортировки.
+            ordering.append((opts.pk.name, ordering[-1][1]))
+        return ordering
+
+    @staticmethod
+    def get_cursor_fields(queryset, ordering):
+        """
+        Поля ключа сортировки в виде пар (атрибут записи, поле): поля модели или аннотации запроса
+        (например, релевантность поиска).
+        """
+        annotations = queryset.query.annotations
+        fields = []
+        for name, _ in ordering:
+            if name in annotations:
+                fields.append((name, annotations[name].output_field))
+            else:
+                field = queryset.model._meta.get_field(name)
+                fields.append((field.attname, field))
+        return fields
+
+    @staticmethod
+    def get_position_filter(ordering, values, reverse=False):
+        """
+        Условие "строго после позиции курсора" для составного ключа сортировки:
+        (f1 > v1) OR (f1 = v1 AND f2 > v2) OR ... с учетом направления каждого поля.
+        """
+        position_filter = Q()
+        equal_prefix = Q()
+        for (name, descending), value in zip(ordering, values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            position_filter |= equal_prefix & Q(**{f'{name}__{lookup}': value})
+            equal_prefix &= Q(**{name: value})
+        return position_filter
+
+    def encode_cursor(self, obj, direction):
+        """
+        Кодирует позицию записи в непрозрачный подписанный курсор.
+        """
+        values = []
+        for attname, _ in self.cursor_fields:
+            # Запись может быть моделью или строкой `values()` (см. `core.projection`).
+            value = obj[attname] if isinstance(obj, dict) else getattr(obj, attname)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return signing.dumps({
+            'v': values,
+            'd': direction,
+            'o': self.ordering_key,
+            'f': self.filter_key,
+        }, salt=self.cursor_salt, compress=True)
+
+    def decode_cursor(self, encoded):
+        """
+        Разбирает курсор. Курсор, выданный для другой сортировки или другого набора фильтров, отклоняется.
+        :return: None для первой страницы или словарь с направлением и значениями позиции
+        """
+        if not encoded:
+            return None
+        try:
+            payload = signing.loads(encoded, salt=self.cursor_salt)
+            if payload['o'] != self.ordering_key or payload['f'] != self.filter_key or payload['d'] not in ('next', 'prev'):
+                raise ValueError(self.invalid_cursor_message)
+            values = [
+                field.to_python(value) for (_, field), value in zip(self.cursor_fields, payload['v'])
+            ]
+        except (signing.BadSignature, KeyError, TypeError, ValueError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return {'direction': payload['d'], 'values': values}
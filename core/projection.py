@@ -0,0 +1,115 @@
+from rest_framework.response import Response
+
+from core.services.image_derivative_service import ImageDerivativeService
+
+
+class Projection:
+    """
+    Проекция только для чтения: описывает ответ списка как соответствие "ключ ответа -> поле `values()`".
+    Все данные страницы (включая поля связанных моделей) выбираются одним запросом `values()`,
+    а ответ собирается из словарей без создания моделей и без полей сериализатора DRF.
+
+    Описание полей:
+        'title': 'title'                                  - поле или путь через связи (`car__brand_id`);
+        'listing_photo': ('listing_photo', converter)     - поле с преобразованием `converter(value, request)`;
+        'car': {'id': 'car_id', ...}                      - вложенный объект.
+    """
+
+    def __init__(self, fields):
+        self.fields = fields
+        self.lookups = []
+        self.template = self.compile(fields)
+
+    def compile(self, fields):
+        """
+        Разворачивает описание полей в список (ключ, поле, преобразование или вложенный шаблон).
+        """
+        template = []
+        for key, source in fields.items():
+            if isinstance(source, dict):
+                template.append((key, None, self.compile(source)))
+                continue
+            lookup, converter = source if isinstance(source, tuple) else (source, None)
+            if lookup not in self.lookups:
+                self.lookups.append(lookup)
+            template.append((key, lookup, converter))
+        return template
+
+    def values(self, queryset):
+        """
+        Запрос `values()` с полями проекции и полями сортировки (они нужны для курсора пагинации).
+        """
+        lookups = list(self.lookups)
+        for item in queryset.query.order_by:
+            if isinstance(item, str) and item.lstrip('-') not in lookups:
+                lookups.append(item.lstrip('-'))
+        return queryset.values(*lookups)
+
+    def render(self, rows, request=None):
+        """
+        Собирает ответ из строк `values()`.
+        """
+        return [self.render_row(self.template, row, request) for row in rows]
+
+    def iter_render(self, rows, request=None):
+        """
+        Собирает ответ из строк `values()` по одной (для потоковой выдачи без списка в памяти).
+        """
+        for row in rows:
+            yield self.render_row(self.template, row, request)
+
+    def render_row(self, template, row, request):
+        data = {}
+        for key, lookup, converter in template:
+            if lookup is None:
+                data[key] = self.render_row(converter, row, request)
+            elif converter is None:
+                data[key] = row[lookup]
+            else:
+                data[key] = converter(row[lookup], request)
+        return data
+
+
+class ProjectionListMixin:
+    """
+    Примесь для `ListAPIView`: список строится через `projection` (один запрос `values()` на страницу)
+    вместо `serializer_class`. Фильтрация и пагинация работают как обычно.
+    """
+    projection = None
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = self.projection.values(queryset)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(self.projection.render(page, request))
+        return Response(self.projection.render(rows, request))
+
+
+def file_url(field):
+    """
+    Преобразование для файловых полей: абсолютный URL файла, как у `ImageField`/`FileField` в DRF.
+    """
+    storage = field.storage
+
+    def convert(name, request):
+        if not name:
+            return None
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+
+    return convert
+
+
+def image_variants(field):
+    """
+    Преобразование для JSON-поля уменьшенных копий изображения (`<поле>_variants`): URL копий и заглушка.
+    :param field: Файловое поле изображения (его хранилище строит URL копий)
+    """
+    storage = field.storage
+
+    def convert(variants, request):
+        return ImageDerivativeService.get_urls(variants, storage, request)
+
+    return convert
@@ -0,0 +1,93 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.query_key import make_query_key
+
+
+class ResponseCacheService:
+    """
+    Кеш данных ответов в общем кеше (Redis) с защитой от одновременного пересчета (single-flight):
+    при промахе ответ считает только процесс, получивший блокировку, остальные ждут его результата.
+    """
+
+    LOCK_TIMEOUT = 10  # Время жизни блокировки пересчета (в секундах), если процесс не успел ее снять.
+    WAIT_TIMEOUT = 2.0  # Сколько (в секундах) ждать результата чужого пересчета, прежде чем считать самому.
+    WAIT_STEP = 0.05  # Интервал проверки результата во время ожидания.
+
+    @classmethod
+    def get_or_set(cls, key, compute, timeout):
+        """
+        Возвращает значение из кеша или вычисляет и сохраняет его.
+        :param key: Ключ кеша
+        :param compute: Функция без аргументов, вычисляющая значение
+        :param timeout: Время жизни значения (в секундах)
+        :return: Кортеж (значение, взято ли оно из кеша)
+        """
+        try:
+            value = cache.get(key)
+        except Exception:
+            # Кеш недоступен: отвечаем без него.
+            return compute(), False
+        if value is not None:
+            return value, True
+
+        lock_key = f'{key}:lock'
+        try:
+            locked = cache.add(lock_key, 1, timeout=cls.LOCK_TIMEOUT)
+        except Exception:
+            return compute(), False
+
+        if locked:
+            try:
+                value = compute()
+                cache.set(key, value, timeout=timeout)
+            finally:
+                cache.delete(lock_key)
+            return value, False
+
+        # Значение уже считает другой процесс: ждем его результат.
+        deadline = time.monotonic() + cls.WAIT_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(cls.WAIT_STEP)
+            value = cache.get(key)
+            if value is not None:
+                return value, True
+        return compute(), False
+
+
+class ResponseCacheMixin:
+    """
+    Примесь для `ListAPIView`: кеширует данные ответа списка по нормализованным параметрам запроса
+    (фильтры, курсор или номер страницы, сортировка) и поколению данных `cache_generation`.
+    Изменение данных увеличивает поколение, поэтому старые ответы не используются без перебора ключей.
+    Ответ не зависит от пользователя, поэтому примесь подходит только для публичных списков.
+    """
+    cache_generation = CacheGenerationService.LISTINGS  # Поколение данных, от которых зависит ответ.
+    cache_timeout = None  # Время жизни ответа (в секундах), по умолчанию `RESPONSE_CACHE_TIMEOUT`.
+
+    def get_response_cache_key(self, request, generation):
+        """
+        Ключ ответа: адрес (абсолютные URL файлов зависят от хоста) и нормализованные параметры запроса.
+        """
+        query_key = make_query_key(request.query_params)
+        location = hashlib.md5(request.build_absolute_uri(request.path).encode()).hexdigest()
+        return f'response:{self.__class__.__name__}:{generation}:{location}:{query_key}'
+
+    def list(self, request, *args, **kwargs):
+        generation = CacheGenerationService.get(self.cache_generation)
+        if generation is None:
+            return super().list(request, *args, **kwargs)
+
+        data, hit = ResponseCacheService.get_or_set(
+            self.get_response_cache_key(request, generation),
+            lambda: super(ResponseCacheMixin, self).list(request, *args, **kwargs).data,
+            self.cache_timeout or settings.RESPONSE_CACHE_TIMEOUT,
+        )
+        response = Response(data)
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        return response
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+
+
+class CacheGenerationService:
+    """
+    Счетчики поколений данных в общем кеше (Redis). Номер поколения входит в ключи закешированных ответов:
+    после изменения данных поколение увеличивается, и старые записи кеша перестают использоваться
+    (удаляются сами по истечении таймаута), без перебора и удаления ключей.
+    """
+
+    LISTINGS = 'listings'  # Поколение данных объявлений (фасеты, списки, статистика).
+    CARS = 'cars'  # Поколение справочника брендов и моделей автомобилей.
+    CURRENCIES = 'currencies'  # Поколение курсов валют.
+    MANAGERS = 'managers'  # Поколение списка менеджеров.
+
+    @staticmethod
+    def get_key(name):
+        return f'generation:{name}'
+
+    @classmethod
+    def get(cls, name):
+        """
+        Возвращает текущее поколение данных.
+        :return: Номер поколения или None, если кеш недоступен (тогда результат не кешируется)
+        """
+        try:
+            return cache.get_or_set(cls.get_key(name), 1, timeout=None)
+        except Exception:
+            return None
+
+    @classmethod
+    def bump(cls, name):
+        """
+        Увеличивает поколение данных, делая недействительными все закешированные по нему результаты.
+        """
+        try:
+            cache.add(cls.get_key(name), 1, timeout=None)
+            cache.incr(cls.get_key(name))
+        except Exception as e:
+            print(f"Cache generation '{name}' was not bumped: {e}")
@@ -0,0 +1,109 @@
+import threading
+import time
+from collections import defaultdict
+from types import MappingProxyType
+
+from django.conf import settings
+
+from cars.models import Brand, ModelName
+from core.dataclases.car_catalog_dataclass import CarCatalogSnapshot
+from core.services.cache_generation_service import CacheGenerationService
+
+
+class CarCatalogService:
+    """
+    Справочник брендов и моделей автомобилей в памяти процесса.
+    Загружается двумя запросами (бренды и модели) и хранится как словари ID -> объект и бренд -> модели.
+    Версия справочника - поколение `CARS` в общем кеше, которое увеличивается при изменении брендов и моделей;
+    процесс сверяет ее не чаще, чем раз в `CAR_CATALOG_CHECK_INTERVAL` секунд.
+    """
+
+    _snapshot = None
+    _checked_at = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_snapshot(cls):
+        """
+        Возвращает актуальный снимок справочника. Между сверками версии снимок отдается без обращения к кешу и БД.
+        :return: Объект `CarCatalogSnapshot`
+        """
+        snapshot = cls._snapshot
+        if snapshot is not None and time.monotonic() - cls._checked_at < settings.CAR_CATALOG_CHECK_INTERVAL:
+            return snapshot
+
+        with cls._lock:
+            snapshot = cls._snapshot
+            version = CacheGenerationService.get(CacheGenerationService.CARS)
+            # Если общий кеш недоступен (version is None), снимок перезагружается по интервалу сверки.
+            if snapshot is None or version is None or version != snapshot.version:
+                snapshot = cls._load_snapshot(version or 0)
+                cls._snapshot = snapshot
+            cls._checked_at = time.monotonic()
+        return snapshot
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Заставляет текущий процесс перезагрузить справочник при следующем обращении.
+        Другие процессы узнают об изменении по поколению `CARS`.
+        """
+        cls._checked_at = 0
+        cls._snapshot = None
+
+    @classmethod
+    def get_brand(cls, brand_id):
+        """
+        Возвращает бренд по ID или None, если бренда нет.
+        """
+        return cls.get_snapshot().brands.get(brand_id)
+
+    @classmethod
+    def get_model(cls, model_id):
+        """
+        Возвращает модель по ID или None, если модели нет. Бренд модели доступен без запроса (`model.brand`).
+        """
+        return cls.get_snapshot().models.get(model_id)
+
+    @classmethod
+    def get_brands(cls):
+        """
+        Возвращает все бренды в порядке ID.
+        """
+        return list(cls.get_snapshot().brands.values())
+
+    @classmethod
+    def get_brand_models(cls, brand_id):
+        """
+        Возвращает модели бренда в порядке ID.
+        """
+        return cls.get_snapshot().brand_models.get(brand_id, ())
+
+    @classmethod
+    def model_belongs_to_brand(cls, model_id, brand_id):
+        """
+        Проверяет, что модель существует и принадлежит бренду.
+        """
+        model = cls.get_model(model_id)
+        return model is not None and model.brand_id == brand_id
+
+    @staticmethod
+    def _load_snapshot(version):
+        """
+        Загружает бренды и модели и связывает модели с брендами без дополнительных запросов.
+        """
+        brands = {brand.id: brand for brand in Brand.objects.order_by('id')}
+        models = {}
+        brand_models = defaultdict(list)
+        for model in ModelName.objects.order_by('id'):
+            brand = brands.get(model.brand_id)
+            if brand is not None:
+                ModelName.brand.field.set_cached_value(model, brand)
+            models[model.id] = model
+            brand_models[model.brand_id].append(model)
+        return CarCatalogSnapshot(
+            version=version,
+            brands=MappingProxyType(brands),
+            models=MappingProxyType(models),
+            brand_models=MappingProxyType({brand_id: tuple(items) for brand_id, items in brand_models.items()}),
+        )
@@ -0,0 +1,130 @@
+import threading
+import time
+from decimal import Decimal
+from types import MappingProxyType
+
+from django.conf import settings
+
+from core.dataclases.currency_dataclass import CurrencyRateSnapshot
+from core.services.cache_generation_service import CacheGenerationService
+from currency.models import CurrencyModel
+
+
+class CurrencyRateService:
+    """
+    Сервис чтения курсов валют из общего для процесса снимка вместо запроса к БД на каждое обращение.
+    Версия курсов - поколение `CURRENCIES` в общем кеше (Redis): после обновления курсов оно увеличивается,
+    и каждый процесс перезагружает свой снимок при следующей сверке (не чаще, чем раз в
+    `CURRENCY_RATES_CHECK_INTERVAL` секунд).
+    """
+
+    CONVERTED_CURRENCIES = ('USD', 'EUR', 'UAH')  # Валюты, в которые пересчитываются цены объявлений.
+
+    _snapshot = None
+    _checked_at = 0
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_snapshot(cls):
+        """
+        Возвращает актуальный снимок курсов. Между сверками версии снимок отдается без обращения к кешу и БД.
+        :return: Объект `CurrencyRateSnapshot`
+        """
+        snapshot = cls._snapshot
+        if snapshot is not None and time.monotonic() - cls._checked_at < settings.CURRENCY_RATES_CHECK_INTERVAL:
+            return snapshot
+
+        with cls._lock:
+            snapshot = cls._snapshot
+            version = cls._get_shared_version()
+            # Если общий кеш недоступен (version is None), снимок перезагружается по интервалу сверки.
+            if snapshot is None or version is None or version != snapshot.version:
+                snapshot = cls._load_snapshot(version or 0)
+                cls._snapshot = snapshot
+            cls._checked_at = time.monotonic()
+        return snapshot
+
+    @classmethod
+    def invalidate(cls):
+        """
+        Увеличивает общую версию курсов, чтобы все процессы перезагрузили свои снимки.
+        Вызывается после фиксации транзакции с новыми курсами.
+        """
+        CacheGenerationService.bump(CacheGenerationService.CURRENCIES)
+        # Текущий процесс перезагружает снимок сразу, не дожидаясь интервала сверки.
+        cls._checked_at = 0
+        cls._snapshot = None
+
+    @classmethod
+    def refresh(cls):
+        """
+        Заставляет текущий процесс сверить версию курсов при следующем обращении, не дожидаясь интервала сверки.
+        """
+        cls._checked_at = 0
+
+    @classmethod
+    def get_rate(cls, currency_code):
+        """
+        Возвращает текущий курс валюты по ее коду.
+        :param currency_code: Код валюты (например, USD)
+        :return: Курс валюты или None, если валюта неизвестна
+        """
+        return cls.get_snapshot().rates.get(currency_code)
+
+    @classmethod
+    def get_currency_code(cls, currency_id):
+        """
+        Возвращает код валюты по ее ID без запроса к таблице валют.
+        """
+        return cls.get_snapshot().currency_codes.get(currency_id)
+
+    @classmethod
+    def convert_price(cls, price, currency_code):
+        """
+        Пересчитывает цену в валюты `CONVERTED_CURRENCIES` по текущему снимку курсов.
+        :param price: Цена объявления
+        :param currency_code: Код валюты, в которой указана цена
+        :return: Словарь вида {'USD': Decimal, 'EUR': Decimal, 'UAH': Decimal}
+        """
+        rates = cls.get_snapshot().rates
+        # Базовый курс валюты для расчета.
+        base_rate = Decimal(rates.get(currency_code, 1))
+        if base_rate == Decimal('0'):
+            # Если курс валюты нулевой, цена в других валютах тоже нулевая.
+            return {code: Decimal('0') for code in cls.CONVERTED_CURRENCIES}
+        return {code: (price / base_rate) * Decimal(rates.get(code, 1)) for code in cls.CONVERTED_CURRENCIES}
+
+    @classmethod
+    def get_conversion_factors(cls, currency_code):
+        """
+        Коэффициенты пересчета цены из валюты `currency_code` в валюты `CONVERTED_CURRENCIES`.
+        Используются для массового пересчета цен в БД (цена * коэффициент), совпадают с `convert_price`.
+        :return: Словарь вида {'USD': Decimal, 'EUR': Decimal, 'UAH': Decimal}
+        """
+        return {
+            code: factor.quantize(Decimal('1e-15'))
+            for code, factor in cls.convert_price(Decimal('1'), currency_code).items()
+        }
+
+    @staticmethod
+    def _get_shared_version():
+        """
+        Читает общую версию курсов (поколение `CURRENCIES`) из кеша. Возвращает None, если кеш недоступен.
+        """
+        return CacheGenerationService.get(CacheGenerationService.CURRENCIES)
+
+    @staticmethod
+    def _load_snapshot(version):
+        """
+        Загружает все курсы валют одним запросом. При нескольких записях одной валюты берется самая свежая.
+        """
+        rates = {}
+        currency_codes = {}
+        for currency in CurrencyModel.objects.order_by('updated_at').values('id', 'currency_code', 'rate'):
+            rates[currency['currency_code']] = currency['rate']
+            currency_codes[currency['id']] = currency['currency_code']
+        return CurrencyRateSnapshot(
+            version=version,
+            rates=MappingProxyType(rates),
+            currency_codes=MappingProxyType(currency_codes),
+        )
@@ -1,8 +1,15 @@
 from celery import shared_task
 import requests
+import time
 from datetime import datetime
+from decimal import Decimal
+from django.apps import apps
 from django.db import transaction
+from django.db.models import F, Max, Min, Value, DecimalField, ExpressionWrapper
 from currency.models import CurrencyModel
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.currency_rate_service import CurrencyRateService
+from core.services.segment_stats_service import SegmentStatsService
 
 PRIVATBANK_API_URL = "https://api.privatbank.ua/p24api/pubinfo?json&exchange&coursid=5"
 """
@@ -10,6 +17,11 @@ URL для получения актуальных курсов валют от
 Запрос возвращает данные в формате JSON для использования в обновлении валютных курсов.
 """
 
+REPRICE_CHUNK_SIZE = 5000
+"""
+Размер диапазона ID объявлений, который пересчитывается одним UPDATE при пересчете цен.
+"""
+
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=3600)
 def update_currency_rates(self):
@@ -37,6 +49,78 @@ def update_currency_rates(self):
                         currency_code=currency_code,
                         defaults={'rate': float(rate['sale']), 'updated_at': datetime.now()}
                     )
+            # После фиксации транзакции сбрасываем снимки курсов во всех процессах и пересчитываем цены объявлений.
+            transaction.on_commit(CurrencyRateService.invalidate)
+            transaction.on_commit(reprice_listings.delay)
     except Exception as e:
         # В случае ошибки задача будет повторена через час, максимум 3 раза
-        self.retry(exc=e)
\ No newline at end of file
+        self.retry(exc=e)
+
+
+@shared_task(bind=True)
+def reprice_listings(self, chunk_size=REPRICE_CHUNK_SIZE):
+    """
+    Асинхронная задача для пересчета цен объявлений (`price_usd`, `price_eur`, `price_uah`) после обновления курсов.
+    Цены пересчитываются в БД набором UPDATE по диапазонам ID и по валютам объявлений, без вызова `save()`:
+    для каждой валюты коэффициенты пересчета вычисляются один раз, а строки обновляются выражением `price * коэффициент`.
+    Прогресс публикуется через состояние задачи (PROGRESS), итоговые метрики возвращаются как результат задачи.
+    """
+    ListingModel = apps.get_model('listings', 'ListingModel')
+    started_at = time.monotonic()
+
+    # Берем свежий снимок курсов: версия уже увеличена задачей обновления курсов.
+    CurrencyRateService.refresh()
+    snapshot = CurrencyRateService.get_snapshot()
+
+    # Коэффициенты пересчета для каждой валюты: цена * коэффициент = цена в целевой валюте.
+    factors = {
+        currency_id: CurrencyRateService.get_conversion_factors(currency_code)
+        for currency_id, currency_code in snapshot.currency_codes.items()
+    }
+
+    bounds = ListingModel.objects.aggregate(min_id=Min('id'), max_id=Max('id'))
+    if bounds['min_id'] is None:
+        return {'updated_rows': 0, 'chunks': 0, 'duration_seconds': 0}
+
+    total_chunks = (bounds['max_id'] - bounds['min_id']) // chunk_size + 1
+    updated_rows = 0
+
+    for chunk_number in range(total_chunks):
+        start_id = bounds['min_id'] + chunk_number * chunk_size
+        chunk = ListingModel.objects.filter(id__gte=start_id, id__lt=start_id + chunk_size)
+
+        for currency_id, currency_factors in factors.items():
+            updated_rows += chunk.filter(currency_id=currency_id).update(**{
+                f'price_{code.lower()}': _converted_price(factor) for code, factor in currency_factors.items()
+            })
+
+        self.update_state(state='PROGRESS', meta={
+            'chunks_done': chunk_number + 1,
+            'total_chunks': total_chunks,
+            'updated_rows': updated_rows,
+        })
+
+    # Цены изменились в обход сигналов `save()`: перестраиваем статистику сегментов
+    # и сбрасываем закешированные результаты по объявлениям.
+    SegmentStatsService.rebuild()
+    CacheGenerationService.bump(CacheGenerationService.LISTINGS)
+
+    duration = time.monotonic() - started_at
+    metrics = {
+        'updated_rows': updated_rows,
+        'chunks': total_chunks,
+        'duration_seconds': round(duration, 3),
+        'rows_per_second': round(updated_rows / duration) if duration else updated_rows,
+    }
+    print(f"Listings repriced: {metrics}")
+    return metrics
+
+
+def _converted_price(factor):
+    """
+    Выражение для пересчета цены объявления с заданным коэффициентом.
+    """
+    return ExpressionWrapper(
+        F('price') * Value(factor, output_field=DecimalField(max_digits=30, decimal_places=15)),
+        output_field=DecimalField(max_digits=10, decimal_places=2)
+    )
@@ -0,0 +1,291 @@
+import json
+import os
+import re
+
+import redis
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import get_template
+
+
+class EmailDispatcher:
+    """
+    Пакетная отправка писем. Письма не отправляются по одному: они добавляются в список Redis, а задача
+    `flush_email_queue` через `EMAIL_BATCH_DELAY` секунд забирает их пачками по `EMAIL_BATCH_SIZE` и отправляет
+    через одно SMTP-подключение (одно рукопожатие TCP+TLS на все письма вместо одного на каждое).
+    Шаблоны писем компилируются один раз на процесс.
+
+    В режиме `EMAIL_MANAGER_DIGEST` уведомления менеджерам копятся по получателям и раз в `EMAIL_DIGEST_INTERVAL`
+    секунд отправляются одним письмом-сводкой каждому менеджеру (задача `send_manager_digests`).
+
+    Письмо в очереди - словарь {'to', 'template_name', 'context', 'subject'}; контекст должен сериализоваться в JSON.
+    Неотправленное письмо возвращается в очередь со счетчиком попыток 'attempts', а после `EMAIL_MAX_ATTEMPTS`
+    неудач переносится в список `EMAIL_DEAD_KEY` и больше не отправляется.
+    """
+
+    _redis_client = None
+    _templates = {}  # Имя шаблона -> скомпилированный шаблон (кеш процесса).
+    BODY_PATTERN = re.compile(r'<body[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+
+    @classmethod
+    def get_redis_client(cls):
+        """
+        Ленивая инициализация подключения к Redis (одно подключение на процесс).
+        """
+        if cls._redis_client is None:
+            cls._redis_client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.2, socket_connect_timeout=0.2)
+        return cls._redis_client
+
+    @classmethod
+    def get_template(cls, template_name):
+        """
+        Скомпилированный шаблон письма (загружается и компилируется один раз на процесс).
+        """
+        template = cls._templates.get(template_name)
+        if template is None:
+            template = cls._templates[template_name] = get_template(template_name)
+        return template
+
+    @classmethod
+    def build_message(cls, item, connection=None):
+        """
+        Создает письмо из элемента очереди.
+        """
+        html_content = cls.get_template(item['template_name']).render(item['context'])
+        message = EmailMultiAlternatives(
+            item.get('subject', ''), body='', from_email=os.environ.get('EMAIL_HOST_USER'), to=[item['to']],
+            connection=connection
+        )
+        message.attach_alternative(html_content, 'text/html')
+        return message
+
+    @staticmethod
+    def open_connection():
+        """
+        Открывает SMTP-подключение.
+        :return: Подключение или None, если SMTP-сервер недоступен
+        """
+        connection = get_connection()
+        try:
+            connection.open()
+        except Exception as e:
+            print(f"SMTP connection failed: {e}")
+            return None
+        return connection
+
+    @classmethod
+    def send_items(cls, items, connection=None):
+        """
+        Отправляет письма через одно SMTP-подключение: переданное (оно остается открытым) или новое.
+        :return: Список элементов, которые отправить не удалось
+        """
+        if not items:
+            return []
+        own_connection = connection is None
+        if own_connection:
+            connection = cls.open_connection()
+            if connection is None:
+                return list(items)
+        failed = []
+        try:
+            for item in items:
+                try:
+                    connection.send_messages([cls.build_message(item, connection)])
+                except Exception as e:
+                    print(f"Email to {item['to']} was not sent: {e}")
+                    failed.append(item)
+        finally:
+            if own_connection:
+                connection.close()
+        return failed
+
+    @classmethod
+    def queue(cls, to, template_name, context, subject=''):
+        """
+        Добавляет письмо в очередь и планирует отправку пачки, если она еще не запланирована.
+        Если Redis недоступен, письмо отправляется отдельной задачей.
+        """
+        item = {'to': to, 'template_name': template_name, 'context': context, 'subject': subject}
+        try:
+            cls.get_redis_client().rpush(settings.EMAIL_QUEUE_KEY, json.dumps(item, ensure_ascii=False))
+        except redis.RedisError:
+            send_queued_email.delay(item)
+            return
+        cls.schedule_flush()
+
+    @staticmethod
+    def schedule_flush(countdown=None):
+        """
+        Планирует задачу `flush_email_queue`, если она еще не запланирована.
+        """
+        countdown = settings.EMAIL_BATCH_DELAY if countdown is None else countdown
+        if cache.add(f'{settings.EMAIL_QUEUE_KEY}:scheduled', 1, timeout=countdown * 2 + 60):
+            flush_email_queue.apply_async(countdown=countdown)
+
+    @classmethod
+    def drain(cls, limit):
+        """
+        Атомарно забирает из очереди не больше `limit` писем (LRANGE + LTRIM в одной транзакции MULTI/EXEC).
+        """
+        pipe = cls.get_redis_client().pipeline(transaction=True)
+        pipe.lrange(settings.EMAIL_QUEUE_KEY, 0, limit - 1)
+        pipe.ltrim(settings.EMAIL_QUEUE_KEY, limit, -1)
+        items, _ = pipe.execute()
+        return [json.loads(item) for item in items]
+
+    @classmethod
+    def flush(cls):
+        """
+        Отправляет все письма очереди пачками по `EMAIL_BATCH_SIZE` через одно SMTP-подключение.
+        Неотправленные письма возвращаются в очередь (`requeue`) и отправляются следующей задачей.
+        :return: Количество отправленных писем
+        """
+        # Флаг снимается до чтения очереди: письма, пришедшие после, запланируют новую отправку.
+        cache.delete(f'{settings.EMAIL_QUEUE_KEY}:scheduled')
+        sent, failed = 0, []
+        connection = None
+        try:
+            while True:
+                items = cls.drain(settings.EMAIL_BATCH_SIZE)
+                if not items:
+                    break
+                # Подключение открывается при первой непустой пачке и используется для всех пачек.
+                connection = connection or cls.open_connection()
+                batch_failed = cls.send_items(items, connection) if connection else items
+                sent += len(items) - len(batch_failed)
+                failed += batch_failed
+                if len(batch_failed) == len(items):
+                    # SMTP-сервер недоступен: остальные письма остаются в очереди до следующей попытки.
+                    break
+        finally:
+            if connection is not None:
+                connection.close()
+        cls.requeue(failed)
+        return sent
+
+    @classmethod
+    def requeue(cls, items):
+        """
+        Возвращает неотправленные письма в очередь с увеличенным счетчиком попыток и планирует повторную отправку.
+        Письма, которые не удалось отправить `EMAIL_MAX_ATTEMPTS` раз, переносятся в список `EMAIL_DEAD_KEY`.
+        :return: Количество писем, возвращенных в очередь
+        """
+        if not items:
+            return 0
+        retry, dead = [], []
+        for item in items:
+            item['attempts'] = item.get('attempts', 0) + 1
+            (dead if item['attempts'] >= settings.EMAIL_MAX_ATTEMPTS else retry).append(item)
+
+        pipe = cls.get_redis_client().pipeline(transaction=True)
+        if retry:
+            pipe.rpush(settings.EMAIL_QUEUE_KEY, *(json.dumps(item, ensure_ascii=False) for item in retry))
+        if dead:
+            pipe.rpush(settings.EMAIL_DEAD_KEY, *(json.dumps(item, ensure_ascii=False) for item in dead))
+        pipe.execute()
+        for item in dead:
+            print(f"Email to {item['to']} was dropped after {item['attempts']} attempts.")
+        if retry:
+            cls.schedule_flush(countdown=settings.EMAIL_BATCH_DELAY * 30)
+        return len(retry)
+
+    @classmethod
+    def queue_digest(cls, to, template_name, context, subject=''):
+        """
+        Добавляет уведомление в сводку получателя. Если Redis недоступен, уведомление отправляется отдельным письмом.
+        """
+        item = {'to': to, 'template_name': template_name, 'context': context, 'subject': subject}
+        try:
+            pipe = cls.get_redis_client().pipeline(transaction=True)
+            pipe.rpush(f'{settings.EMAIL_DIGEST_KEY}:{to}', json.dumps(item, ensure_ascii=False))
+            pipe.sadd(f'{settings.EMAIL_DIGEST_KEY}:recipients', to)
+            pipe.execute()
+        except redis.RedisError:
+            send_queued_email.delay(item)
+
+    @classmethod
+    def drain_digest(cls, to):
+        """
+        Атомарно забирает уведомления сводки получателя.
+        """
+        pipe = cls.get_redis_client().pipeline(transaction=True)
+        pipe.lrange(f'{settings.EMAIL_DIGEST_KEY}:{to}', 0, -1)
+        pipe.delete(f'{settings.EMAIL_DIGEST_KEY}:{to}')
+        pipe.srem(f'{settings.EMAIL_DIGEST_KEY}:recipients', to)
+        items, _, _ = pipe.execute()
+        return [json.loads(item) for item in items]
+
+    @classmethod
+    def build_digest(cls, to, items):
+        """
+        Объединяет уведомления в одно письмо: каждое уведомление рендерится своим шаблоном, и в сводку
+        попадает содержимое его <body>.
+        """
+        sections = []
+        for item in items:
+            html_content = cls.get_template(item['template_name']).render(item['context'])
+            match = cls.BODY_PATTERN.search(html_content)
+            sections.append({'subject': item.get('subject', ''), 'html': match.group(1) if match else html_content})
+        return {
+            'to': to,
+            'template_name': 'manager_digest_email.html',
+            'context': {'sections': sections},
+            'subject': f'Manager Digest: {len(sections)} notifications',
+        }
+
+    @classmethod
+    def send_digests(cls):
+        """
+        Отправляет накопленные сводки всем получателям через одно SMTP-подключение.
+        :return: Количество отправленных сводок
+        """
+        recipients = cls.get_redis_client().smembers(f'{settings.EMAIL_DIGEST_KEY}:recipients')
+        digests = []
+        for to in recipients:
+            to = to.decode()
+            items = cls.drain_digest(to)
+            if items:
+                digests.append(cls.build_digest(to, items))
+        failed = cls.send_items(digests)
+        # Сводка с уже отрендеренными разделами отправится обычной очередью (с учетом попыток).
+        cls.requeue(failed)
+        return len(digests) - len(failed)
+
+
+@shared_task
+def enqueue_email(to, template_name, context, subject='', digest=False):
+    """
+    Задача Celery: постановка письма в очередь пакетной отправки (или в сводку получателя).
+    Публикуется из outbox после фиксации транзакции (см. `EmailService.queue_email`).
+    """
+    if digest:
+        EmailDispatcher.queue_digest(to, template_name, context, subject)
+    else:
+        EmailDispatcher.queue(to, template_name, context, subject)
+
+
+@shared_task
+def flush_email_queue():
+    """
+    Задача Celery: отправка писем из очереди пачками.
+    """
+    return EmailDispatcher.flush()
+
+
+@shared_task
+def send_queued_email(item):
+    """
+    Задача Celery: отправка одного письма (если очередь в Redis недоступна).
+    """
+    if EmailDispatcher.send_items([item]):
+        raise RuntimeError(f"Email to {item['to']} was not sent.")
+
+
+@shared_task
+def send_manager_digests():
+    """
+    Задача Celery: отправка сводок уведомлений менеджерам.
+    """
+    return EmailDispatcher.send_digests()
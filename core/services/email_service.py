@@ -1,8 +1,6 @@
-from django.template.loader import get_template
-from django.core.mail import EmailMultiAlternatives
-import os
-
 from configs.celery import app
+from core.services.email_dispatcher import EmailDispatcher, enqueue_email
+from core.services.outbox_service import OutboxService
 from core.services.jwt_service import JWTService, ActivateToken, RecoveryToken
 from core.dataclases.user_dataclass import UserDataClass
 
@@ -15,14 +13,21 @@ class EmailService:
     @app.task
     def send_email(to: str, template_name: str, context: dict, subject=''):
         """
-        Статический метод для отправки email с использованием Celery задачи.
+        Статический метод для отправки одного email с использованием Celery задачи.
+        Для обычной отправки используется очередь `queue_email`.
+        """
+        EmailDispatcher.send_items([
+            {'to': to, 'template_name': template_name, 'context': context, 'subject': subject}
+        ])
+
+    @staticmethod
+    def queue_email(to: str, template_name: str, context: dict, subject='', digest=False):
+        """
+        Ставит email в очередь пакетной отправки (`EmailDispatcher`) через outbox: письмо уходит только после
+        фиксации текущей транзакции.
+        :param digest: Добавить письмо в сводку получателя вместо отдельной отправки
         """
-        # Загружаем HTML-шаблон письма
-        template = get_template(template_name)
-        html_content = template.render(context)  # Рендерим шаблон с переданными данными
-        msg = EmailMultiAlternatives(subject, body="", from_email=os.environ.get('EMAIL_HOST_USER'), to=[to])
-        msg.attach_alternative(html_content, 'text/html')  # Добавляем HTML-контент в письмо
-        msg.send()  # Отправляем письмо
+        OutboxService.enqueue(enqueue_email, (to, template_name, context, subject, digest))
 
     @classmethod
     def register(cls, user: UserDataClass):
@@ -32,8 +37,8 @@ class EmailService:
         """
         token = JWTService.create_token(user, ActivateToken)
         url = f"http://localhost/activate/{token}"  # Генерируем URL для активации аккаунта
-        # Отправляем письмо с подтверждением регистрации через задачу Celery
-        cls.send_email.delay(
+        # Отправляем письмо с подтверждением регистрации через очередь писем
+        cls.queue_email(
             user.email,
             'register.html',
             {'name': user.profile.name, 'url': url},
@@ -48,8 +53,8 @@ class EmailService:
         """
         token = JWTService.create_token(user, RecoveryToken)
         url = f"http://localhost/recovery/{token}"  # Генерируем URL для восстановления пароля
-        # Отправляем письмо для восстановления пароля через задачу Celery
-        cls.send_email.delay(
+        # Отправляем письмо для восстановления пароля через очередь писем
+        cls.queue_email(
             user.email,
             'recovery.html',
             {'url': url},
@@ -62,8 +67,8 @@ class EmailService:
         Метод для отправки email при удалении аккаунта пользователя.
         Отправляет письмо с уведомлением о том, что аккаунт был удален.
         """
-        # Отправляем письмо об удалении аккаунта через задачу Celery
-        cls.send_email.delay(
+        # Отправляем письмо об удалении аккаунта через очередь писем
+        cls.queue_email(
             user.email,
             'delete_account.html',
             {'name': user.username},
@@ -0,0 +1,97 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F
+from django.db.models.functions import Mod
+from django_filters import utils
+
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.query_key import make_query_key
+from listings.filters import ListingFilter
+from listings.models import ListingModel
+
+
+class ListingFacetService:
+    """
+    Сервис фасетных счетчиков для панели фильтров объявлений: количество объявлений по бренду, модели,
+    типу кузова, региону и диапазону годов для текущего набора фильтров `ListingFilter`.
+    Каждый фасет считается одним сгруппированным запросом. Результат кешируется по нормализованному набору
+    фильтров и поколению данных объявлений, которое увеличивается при их изменении.
+    """
+
+    CACHE_PREFIX = 'facets'
+    IGNORED_PARAMS = ('page', 'size', 'cursor', 'ordering')  # Параметры, которые не влияют на счетчики.
+    YEAR_BUCKET_SIZE = 5  # Ширина диапазона годов выпуска.
+
+    # Фасет -> (фильтры, которые не применяются при его подсчете, поля группировки).
+    # Собственный фильтр фасета не применяется, чтобы в панели оставались видны другие значения того же фасета.
+    FACETS = {
+        'brand': (('brand', 'model_name'), ('car__brand', 'car__brand__name')),
+        'model_name': (('model_name',), ('car__model_name', 'car__model_name__name')),
+        'body_type': (('body_type',), ('car__body_type',)),
+        'region': (('region',), ('region',)),
+        'year': (('min_year', 'max_year'), ('year_from',)),
+    }
+
+    @classmethod
+    def get_facets(cls, query_params):
+        """
+        Возвращает фасетные счетчики для набора фильтров, из кеша или с подсчетом в БД.
+        :param query_params: Параметры запроса с фильтрами `ListingFilter`
+        :return: Словарь со списками значений и количеств по каждому фасету и общим количеством
+        """
+        params = {key: value for key, value in query_params.items() if key not in cls.IGNORED_PARAMS}
+        cls.get_queryset(params)  # Проверяем фильтры до обращения к кешу.
+
+        generation = CacheGenerationService.get(CacheGenerationService.LISTINGS)
+        if generation is None:
+            return cls.count_facets(params)
+
+        cache_key = f'{cls.CACHE_PREFIX}:{generation}:{make_query_key(params)}'
+        try:
+            facets = cache.get(cache_key)
+        except Exception:
+            return cls.count_facets(params)
+        if facets is None:
+            facets = cls.count_facets(params)
+            try:
+                cache.set(cache_key, facets, timeout=settings.FACETS_CACHE_TIMEOUT)
+            except Exception:
+                pass
+        return facets
+
+    @classmethod
+    def count_facets(cls, params):
+        """
+        Считает все фасеты: один запрос на общее количество и по одному сгруппированному запросу на фасет.
+        """
+        facets = {'total': cls.get_queryset(params).count()}
+        for name, (excluded, group_by) in cls.FACETS.items():
+            queryset = cls.get_queryset({key: value for key, value in params.items() if key not in excluded})
+            if name == 'year':
+                queryset = queryset.annotate(year_from=F('year') - Mod('year', cls.YEAR_BUCKET_SIZE))
+            rows = queryset.values(*group_by).annotate(count=Count('id')).order_by(*group_by)
+            facets[name] = [cls.format_row(name, group_by, row) for row in rows]
+        return facets
+
+    @classmethod
+    def format_row(cls, name, group_by, row):
+        """
+        Приводит строку сгруппированного запроса к виду ответа.
+        """
+        if name == 'year':
+            year_from = int(row['year_from'])  # MOD на части СУБД возвращает дробное число.
+            return {'from': year_from, 'to': year_from + cls.YEAR_BUCKET_SIZE - 1, 'count': row['count']}
+        if len(group_by) == 2:
+            return {'id': row[group_by[0]], 'name': row[group_by[1]], 'count': row['count']}
+        return {'value': row[group_by[0]], 'count': row['count']}
+
+    @staticmethod
+    def get_queryset(params):
+        """
+        Применяет фильтры `ListingFilter` к объявлениям. Некорректные фильтры возвращают ошибку 400, как в списке.
+        """
+        filterset = ListingFilter(params, queryset=ListingModel.objects.all())
+        if not filterset.is_valid():
+            raise utils.translate_validation(filterset.errors)
+        # Сортировка не нужна для подсчета и мешала бы группировке.
+        return filterset.qs.order_by()
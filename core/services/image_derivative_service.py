@@ -0,0 +1,230 @@
+import base64
+import io
+import os.path
+
+from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.outbox_service import OutboxService
+
+
+class ImageDerivativeService:
+    """
+    Уменьшенные копии загруженных изображений (фотографии объявлений, аватары). Оригинал хранится как загружен,
+    а задача `generate_image_derivatives` (очередь 'images', отдельный воркер с пулом процессов) создает копии
+    шириной `IMAGE_DERIVATIVE_WIDTHS` в форматах `IMAGE_DERIVATIVE_FORMATS` (без увеличения) и крошечную заглушку
+    в виде data URI. Результат сохраняется в JSON-поле `<поле>_variants` модели:
+        {'source': имя оригинала, 'placeholder': 'data:image/jpeg;base64,...',
+         'webp': {'320': путь, ...}, 'jpeg': {'320': путь, ...}}
+    Копии лежат в `IMAGE_DERIVATIVES_DIR/<путь оригинала без расширения>/<ширина>.<формат>`.
+    """
+
+    EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}  # Формат -> расширение файла копии.
+    PIL_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}  # Формат -> формат Pillow.
+
+    @staticmethod
+    def get_variants_field(field_name):
+        return f'{field_name}_variants'
+
+    @staticmethod
+    def get_directory(name):
+        """
+        Каталог копий изображения в хранилище.
+        """
+        return os.path.join(settings.IMAGE_DERIVATIVES_DIR, os.path.splitext(name)[0])
+
+    @classmethod
+    def get_path(cls, name, width, image_format):
+        return os.path.join(cls.get_directory(name), f'{width}.{cls.EXTENSIONS[image_format]}')
+
+    @staticmethod
+    def get_stored_name(instance, field_name):
+        """
+        Имя файла в поле модели без обращения к дескриптору (для отложенного поля - None).
+        """
+        value = instance.__dict__.get(field_name)
+        return getattr(value, 'name', value) or None
+
+    @classmethod
+    def track(cls, instance, field_name):
+        """
+        Запоминает имя сохраненного файла (вызывается при загрузке модели, `post_init`).
+        У новой модели (без первичного ключа) сохраненного файла еще нет.
+        """
+        name = cls.get_stored_name(instance, field_name) if instance.pk is not None else None
+        instance.__dict__.setdefault('_image_names', {})[field_name] = name
+
+    @classmethod
+    def has_changed(cls, instance, field_name):
+        previous = instance.__dict__.get('_image_names', {}).get(field_name)
+        return cls.get_stored_name(instance, field_name) != previous
+
+    @classmethod
+    def reset_variants(cls, instance, field_name):
+        """
+        Сбрасывает копии измененного изображения до сохранения модели (`pre_save`).
+        """
+        if cls.has_changed(instance, field_name):
+            setattr(instance, cls.get_variants_field(field_name), None)
+
+    @classmethod
+    def schedule(cls, instance, field_name):
+        """
+        После сохранения модели (`post_save`) ставит через outbox создание копий нового изображения
+        и удаление копий прежнего.
+        """
+        if not cls.has_changed(instance, field_name):
+            return
+        previous = instance.__dict__.get('_image_names', {}).get(field_name)
+        name = cls.get_stored_name(instance, field_name)
+        if name:
+            OutboxService.enqueue(generate_image_derivatives, (instance._meta.label, instance.pk, field_name, name))
+        if previous:
+            OutboxService.enqueue(delete_image_derivatives, (previous,))
+        instance.__dict__['_image_names'][field_name] = name
+
+    @staticmethod
+    def schedule_delete(instance, field_name):
+        """
+        После удаления модели (`post_delete`) ставит через outbox удаление копий ее изображения.
+        """
+        name = instance.__dict__.get('_image_names', {}).get(field_name)
+        if name:
+            OutboxService.enqueue(delete_image_derivatives, (name,))
+
+    @staticmethod
+    def open_image(storage, name, max_width):
+        """
+        Открывает изображение с учетом ориентации EXIF и приводит его к RGB (прозрачность - на белом фоне).
+        JPEG декодируется сразу в уменьшенном масштабе (`draft`), если он намного больше нужной ширины.
+        """
+        with storage.open(name, 'rb') as file:
+            image = Image.open(file)
+            image.draft('RGB', (max_width, max_width))
+            image = ImageOps.exif_transpose(image)
+            image.load()
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+
+    @staticmethod
+    def resize(image, width):
+        height = max(1, round(image.height * width / image.width))
+        return image.resize((width, height), Image.LANCZOS)
+
+    @classmethod
+    def encode(cls, image, image_format, quality=None):
+        buffer = io.BytesIO()
+        image.save(
+            buffer, cls.PIL_FORMATS[image_format],
+            quality=quality or settings.IMAGE_QUALITY[image_format], optimize=image_format == 'jpeg'
+        )
+        return buffer.getvalue()
+
+    @classmethod
+    def build_placeholder(cls, image):
+        """
+        Заглушка шириной `IMAGE_PLACEHOLDER_WIDTH` в виде data URI (встраивается прямо в ответ списка).
+        """
+        placeholder = cls.resize(image, min(settings.IMAGE_PLACEHOLDER_WIDTH, image.width))
+        data = base64.b64encode(cls.encode(placeholder, 'jpeg', quality=40)).decode()
+        return f'data:image/jpeg;base64,{data}'
+
+    @classmethod
+    def generate(cls, model_label, pk, field_name, name):
+        """
+        Создает копии изображения и сохраняет их пути в модели, если изображение за это время не заменили.
+        :return: Данные копий или None, если изображение уже заменено или удалено
+        """
+        Model = apps.get_model(model_label)
+        storage = Model._meta.get_field(field_name).storage
+        if not Model.objects.filter(pk=pk, **{field_name: name}).exists():
+            return None
+
+        widths = sorted(settings.IMAGE_DERIVATIVE_WIDTHS)
+        image = cls.open_image(storage, name, widths[-1])
+        # Копии не увеличиваются: ширины больше оригинала пропускаются (остается хотя бы ширина оригинала).
+        widths = [width for width in widths if width < image.width] or [image.width]
+
+        variants = {'source': name}
+        for width in reversed(widths):
+            # Каждая следующая копия уменьшается из предыдущей, а не из оригинала.
+            image = cls.resize(image, width)
+            for image_format in settings.IMAGE_DERIVATIVE_FORMATS:
+                path = cls.get_path(name, width, image_format)
+                if storage.exists(path):
+                    storage.delete(path)
+                variants.setdefault(image_format, {})[str(width)] = storage.save(
+                    path, ContentFile(cls.encode(image, image_format))
+                )
+        # Заглушка уменьшается из самой маленькой копии.
+        variants['placeholder'] = cls.build_placeholder(image)
+
+        updated = Model.objects.filter(pk=pk, **{field_name: name}).update(
+            **{cls.get_variants_field(field_name): variants}
+        )
+        if not updated:
+            # Изображение заменили во время обработки: копии больше не нужны.
+            cls.delete(name, storage)
+            return None
+        if model_label == 'listings.ListingModel':
+            # UPDATE не отправляет сигналы: закешированные списки объявлений сбрасываются явно.
+            CacheGenerationService.bump(CacheGenerationService.LISTINGS)
+        return variants
+
+    @classmethod
+    def delete(cls, name, storage=None):
+        """
+        Удаляет копии изображения.
+        """
+        storage = storage or default_storage
+        directory = cls.get_directory(name)
+        try:
+            _, files = storage.listdir(directory)
+        except FileNotFoundError:
+            return 0
+        for file_name in files:
+            storage.delete(os.path.join(directory, file_name))
+        return len(files)
+
+    @staticmethod
+    def get_urls(variants, storage, request=None):
+        """
+        URL копий для ответа API.
+        :return: {'placeholder': data URI, 'webp': {'320': URL, ...}, 'jpeg': {...}} или None, если копий еще нет
+        """
+        if not variants:
+            return None
+        urls = {'placeholder': variants.get('placeholder')}
+        for image_format in settings.IMAGE_DERIVATIVE_FORMATS:
+            paths = variants.get(image_format) or {}
+            urls[image_format] = {
+                width: request.build_absolute_uri(storage.url(path)) if request is not None else storage.url(path)
+                for width, path in paths.items()
+            }
+        return urls
+
+
+@shared_task
+def generate_image_derivatives(model_label, pk, field_name, name):
+    """
+    Задача Celery: создание уменьшенных копий изображения.
+    """
+    variants = ImageDerivativeService.generate(model_label, pk, field_name, name)
+    return None if variants is None else {key: value for key, value in variants.items() if key != 'placeholder'}
+
+
+@shared_task
+def delete_image_derivatives(name):
+    """
+    Задача Celery: удаление уменьшенных копий замененного изображения.
+    """
+    return ImageDerivativeService.delete(name)
@@ -0,0 +1,230 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.db import transaction
+from rest_framework import serializers
+
+from cars.models import CarModel
+from core.enums.moderation_status_enum import ModerationStatus
+from core.enums.profanity_enum import ProfanityFilter
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.car_catalog_service import CarCatalogService
+from core.services.currency_rate_service import CurrencyRateService
+from core.services.outbox_service import OutboxService
+from core.services.segment_stats_service import rebuild_segment_stats
+from listings.models import ListingModel
+from listings.serializers import ListingImportRowSerializer
+
+
+class ListingImportService:
+    """
+    Массовый импорт объявлений продавца из CSV или JSONL. Файл читается построчно, без загрузки целиком в память.
+    Бренды, модели, автомобили и валюты сопоставляются по словарям в памяти, цены пересчитываются
+    по коэффициентам из снимка курсов (один расчет на валюту), а объявления сохраняются через `bulk_create`
+    пачками, каждая в своей транзакции. Ошибки собираются в отчет по номерам строк.
+
+    Колонки: brand, model_name, body_type, year, engine, title, description, price, currency, region.
+    Бренд и модель задаются ID или названием, валюта - кодом (USD) или ID.
+    """
+
+    FORMATS = ('csv', 'jsonl')  # Поддерживаемые форматы файлов.
+    BATCH_SIZE = 500  # Количество объявлений в одной пачке `bulk_create` (и в одной транзакции).
+
+    def __init__(self, seller):
+        self.seller = seller
+        self.brands = {}  # Название или ID бренда (строкой) -> бренд.
+        self.models = {}  # (ID бренда, название или ID модели) -> модель.
+        self.cars = {}  # (ID бренда, ID модели, тип кузова) -> ID автомобиля.
+        self.currencies = {}  # Код или ID валюты (строкой) -> (ID валюты, код валюты).
+        self.factors = {}  # Код валюты -> коэффициенты пересчета цены.
+        # Один сериализатор на весь импорт: поля сериализатора создаются один раз, а не для каждой строки.
+        self.row_serializer = ListingImportRowSerializer()
+        self.load_maps()
+
+    @classmethod
+    def get_format(cls, filename, file_format=None):
+        """
+        Формат файла: явно указанный или по расширению имени файла.
+        :return: 'csv', 'jsonl' или None, если формат не определен
+        """
+        file_format = (file_format or filename.rsplit('.', 1)[-1]).lower()
+        if file_format in ('json', 'ndjson'):
+            file_format = 'jsonl'
+        return file_format if file_format in cls.FORMATS else None
+
+    @staticmethod
+    def iter_rows(stream, file_format):
+        """
+        Построчно разбирает текстовый поток.
+        :return: Генератор пар (номер строки, словарь значений или None, если строку не удалось разобрать)
+        """
+        if file_format == 'csv':
+            reader = csv.DictReader(stream)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield line_number, row if isinstance(row, dict) else None
+
+    @staticmethod
+    def open_upload(uploaded_file):
+        """
+        Текстовый поток поверх загруженного файла (без чтения файла целиком).
+        """
+        return io.TextIOWrapper(uploaded_file.file, encoding='utf-8-sig', newline='')
+
+    def load_maps(self):
+        """
+        Загружает словари брендов, моделей (из справочника в памяти), автомобилей (одним запросом) и валют.
+        """
+        for brand in CarCatalogService.get_brands():
+            self.brands[str(brand.id)] = brand
+            self.brands.setdefault(brand.name.lower(), brand)
+            for model in CarCatalogService.get_brand_models(brand.id):
+                self.models[(brand.id, str(model.id))] = model
+                self.models.setdefault((brand.id, model.name.lower()), model)
+
+        cars = CarModel.objects.values_list('brand_id', 'model_name_id', 'body_type', 'id').order_by('-id')
+        for brand_id, model_name_id, body_type, car_id in cars.iterator():
+            # При дубликатах остается автомобиль с наименьшим ID.
+            self.cars[(brand_id, model_name_id, body_type)] = car_id
+
+        for currency_id, currency_code in CurrencyRateService.get_snapshot().currency_codes.items():
+            self.currencies[str(currency_id)] = (currency_id, currency_code)
+            self.currencies[currency_code.upper()] = (currency_id, currency_code)
+
+    def import_stream(self, stream, file_format):
+        """
+        Импортирует объявления из текстового потока.
+        :return: Отчет {'created': количество, 'failed': количество, 'errors': [{'row': номер, 'errors': {...}}]}
+        """
+        report = {'created': 0, 'failed': 0, 'errors': []}
+        batch = []
+        for line_number, row in self.iter_rows(stream, file_format):
+            listing, errors = self.build_listing(row)
+            if errors:
+                report['failed'] += 1
+                report['errors'].append({'row': line_number, 'errors': errors})
+                continue
+            batch.append(listing)
+            if len(batch) >= self.BATCH_SIZE:
+                report['created'] += self.save_batch(batch)
+                batch = []
+        report['created'] += self.save_batch(batch)
+
+        if report['created']:
+            # `bulk_create` не отправляет сигналы: поколение объявлений и статистика сегментов обновляются один раз.
+            CacheGenerationService.bump(CacheGenerationService.LISTINGS)
+            OutboxService.enqueue(rebuild_segment_stats)
+        return report
+
+    def build_listing(self, row):
+        """
+        Проверяет строку и создает несохраненное объявление.
+        :return: Кортеж (объявление или None, словарь ошибок по полям или None)
+        """
+        if row is None:
+            return None, {'row': ['Invalid JSON object.']}
+
+        try:
+            data = self.row_serializer.run_validation(row)
+        except serializers.ValidationError as e:
+            return None, {field: [str(error) for error in errors] for field, errors in e.detail.items()}
+
+        errors = {}
+        brand = self.brands.get(data['brand'].lower())
+        if brand is None:
+            errors['brand'] = ['Selected brand does not exist.']
+        model_name = None
+        if brand is not None and data.get('model_name'):
+            model_name = self.models.get((brand.id, data['model_name'].lower()))
+            if model_name is None:
+                errors['model_name'] = ['Model does not exist under this brand.']
+        currency = self.currencies.get(data['currency'].upper())
+        if currency is None:
+            errors['currency'] = ['Unknown currency.']
+        if ProfanityFilter.is_profane(data['description']):
+            errors['description'] = ['The description contains prohibited words.']
+        if errors:
+            return None, errors
+
+        currency_id, currency_code = currency
+        price = data['price']
+        converted, errors = self.convert_price(price, currency_code)
+        if errors:
+            return None, errors
+        return ListingModel(
+            car_id=self.get_car_id(brand, model_name, data['body_type']),
+            seller=self.seller,
+            title=data['title'],
+            description=data['description'],
+            year=data['year'],
+            engine=data['engine'],
+            price=price,
+            currency_id=currency_id,
+            price_usd=converted['USD'],
+            price_eur=converted['EUR'],
+            price_uah=converted['UAH'],
+            initial_currency_rate=CurrencyRateService.get_rate(currency_code),
+            region=data['region'],
+            active=True,
+            # Описание уже проверено при импорте, отдельная модерация не нужна.
+            moderation_status=ModerationStatus.APPROVED.value,
+        ), None
+
+    def get_factors(self, currency_code):
+        """
+        Коэффициенты пересчета цены из валюты (вычисляются один раз на валюту за импорт).
+        """
+        factors = self.factors.get(currency_code)
+        if factors is None:
+            factors = self.factors[currency_code] = CurrencyRateService.get_conversion_factors(currency_code)
+        return factors
+
+    def convert_price(self, price, currency_code):
+        """
+        Пересчитывает цену в валюты `CONVERTED_CURRENCIES` с округлением до точности полей `price_<валюта>`.
+        Цена, которая после пересчета не помещается в поле, - ошибка строки (а не ошибка всей пачки `bulk_create`).
+        :return: Кортеж (словарь цен по кодам валют или None, словарь ошибок или None)
+        """
+        factors = self.get_factors(currency_code)
+        converted = {}
+        for code, factor in factors.items():
+            field = ListingModel._meta.get_field(f'price_{code.lower()}')
+            value = (price * factor).quantize(Decimal(1).scaleb(-field.decimal_places))
+            if abs(value) >= Decimal(10) ** (field.max_digits - field.decimal_places):
+                return None, {'price': [f'Price converted to {code} is too large.']}
+            converted[code] = value
+        return converted, None
+
+    def get_car_id(self, brand, model_name, body_type):
+        """
+        ID автомобиля для бренда, модели и типа кузова. Отсутствующий автомобиль создается один раз за импорт.
+        """
+        key = (brand.id, model_name.id if model_name else None, body_type)
+        car_id = self.cars.get(key)
+        if car_id is None:
+            car_id = self.cars[key] = CarModel.objects.create(
+                brand=brand, model_name=model_name, body_type=body_type
+            ).id
+        return car_id
+
+    def save_batch(self, batch):
+        """
+        Сохраняет пачку объявлений одним `bulk_create` в отдельной транзакции.
+        :return: Количество сохраненных объявлений
+        """
+        if not batch:
+            return 0
+        with transaction.atomic():
+            ListingModel.objects.bulk_create(batch, batch_size=self.BATCH_SIZE)
+        return len(batch)
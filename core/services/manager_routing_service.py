@@ -0,0 +1,223 @@
+from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from django.utils import timezone
+
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.email_service import EmailService
+from core.services.outbox_service import OutboxService
+
+
+class ManagerRoutingService:
+    """
+    Распределение событий между менеджерами. Каждое событие (`ManagerAssignmentModel`) назначается ровно одному
+    менеджеру и отправляется ему одним письмом. Список менеджеров кешируется по поколению MANAGERS
+    (без запроса к таблице пользователей на каждое событие), а менеджер выбирается по стратегии
+    `MANAGER_ROUTING_STRATEGY`:
+    - 'round_robin' - по кругу, по общему счетчику в кеше;
+    - 'least_open' - менеджер с наименьшим числом открытых событий (счетчики в кеше, при промахе - из БД).
+    Если событие не закрыто за `MANAGER_ESCALATION_TIMEOUT` секунд, оно переназначается другому менеджеру
+    (не более `MANAGER_MAX_ESCALATIONS` раз).
+    """
+
+    ROUND_ROBIN = 'round_robin'
+    LEAST_OPEN = 'least_open'
+    ROUND_ROBIN_KEY = 'managers:round_robin'  # Общий счетчик для выбора по кругу.
+
+    # Тип события -> (шаблон письма, тема письма).
+    KINDS = {
+        'brand_request': ('manager_notification_email.html', 'Review Listing Edit Attempts'),
+        'profanity': ('profanity_digest_email.html', 'Profanity Alerts: Review Listings'),
+    }
+
+    @staticmethod
+    def get_open_key(manager_id):
+        return f'managers:open:{manager_id}'
+
+    @staticmethod
+    def load_roster():
+        """
+        Активные менеджеры (role_id=3) в порядке ID.
+        :return: Список пар (ID менеджера, email)
+        """
+        return list(
+            get_user_model().objects.filter(role_id=3, is_active=True).order_by('id').values_list('id', 'email')
+        )
+
+    @classmethod
+    def get_roster(cls):
+        """
+        Закешированный список менеджеров. Ключ содержит поколение MANAGERS, поэтому после изменения менеджеров
+        список перечитывается. Если кеш недоступен, список читается из БД.
+        """
+        generation = CacheGenerationService.get(CacheGenerationService.MANAGERS)
+        if generation is None:
+            return cls.load_roster()
+        try:
+            return cache.get_or_set(f'managers:roster:{generation}', cls.load_roster, settings.MANAGER_ROSTER_TIMEOUT)
+        except Exception:
+            return cls.load_roster()
+
+    @classmethod
+    def choose(cls, exclude=()):
+        """
+        Выбирает менеджера для события.
+        :param exclude: ID менеджеров, которым событие назначать не нужно (при эскалации)
+        :return: Пара (ID менеджера, email) или None, если подходящих менеджеров нет
+        """
+        roster = [manager for manager in cls.get_roster() if manager[0] not in exclude]
+        if not roster:
+            return None
+        if settings.MANAGER_ROUTING_STRATEGY == cls.ROUND_ROBIN:
+            try:
+                cache.add(cls.ROUND_ROBIN_KEY, 0, timeout=None)
+                position = cache.incr(cls.ROUND_ROBIN_KEY)
+            except Exception:
+                position = 0
+            return roster[position % len(roster)]
+
+        open_counts = cls.get_open_counts([manager_id for manager_id, _ in roster])
+        # При равенстве выбирается менеджер с меньшим ID (список упорядочен по ID).
+        return min(roster, key=lambda manager: open_counts[manager[0]])
+
+    @classmethod
+    def get_open_counts(cls, manager_ids):
+        """
+        Количество открытых событий менеджеров: из счетчиков в кеше, а отсутствующие счетчики - одним
+        запросом к БД (и записываются в кеш).
+        """
+        keys = {cls.get_open_key(manager_id): manager_id for manager_id in manager_ids}
+        try:
+            cached = cache.get_many(keys)
+        except Exception:
+            cached = None
+        counts = {keys[key]: value for key, value in (cached or {}).items()}
+        missing = [manager_id for manager_id in manager_ids if manager_id not in counts]
+        if not missing:
+            return counts
+
+        ManagerAssignmentModel = apps.get_model('users', 'ManagerAssignmentModel')
+        loaded = dict(
+            ManagerAssignmentModel.objects.filter(manager_id__in=missing, status='open')
+            .values('manager_id').annotate(total=Count('id')).values_list('manager_id', 'total')
+        )
+        loaded = {manager_id: loaded.get(manager_id, 0) for manager_id in missing}
+        if cached is not None:
+            for manager_id, total in loaded.items():
+                cache.add(cls.get_open_key(manager_id), total, timeout=None)
+        counts.update(loaded)
+        return counts
+
+    @classmethod
+    def change_open_count(cls, manager_id, delta):
+        """
+        Изменяет счетчик открытых событий менеджера. Отсутствующий счетчик не создается: при следующем выборе
+        он будет прочитан из БД.
+        """
+        try:
+            cache.incr(cls.get_open_key(manager_id), delta)
+        except Exception:
+            pass
+
+    @classmethod
+    def assign(cls, kind, payload):
+        """
+        Создает событие, назначает его одному менеджеру, отправляет ему письмо и планирует эскалацию.
+        :param kind: Тип события (ключ `KINDS`)
+        :param payload: Контекст письма (сохраняется в событии)
+        :return: Созданное событие или None, если менеджеров нет
+        """
+        manager = cls.choose()
+        if manager is None:
+            return None
+        manager_id, email = manager
+
+        ManagerAssignmentModel = apps.get_model('users', 'ManagerAssignmentModel')
+        # Событие, письмо и эскалация записываются одной транзакцией (письмо и эскалация - через outbox).
+        with transaction.atomic():
+            assignment = ManagerAssignmentModel.objects.create(kind=kind, payload=payload, manager_id=manager_id)
+            cls.notify(assignment, email)
+            cls.schedule_escalation(assignment.id, assignment.escalation_level)
+            transaction.on_commit(lambda: cls.change_open_count(manager_id, 1))
+        return assignment
+
+    @classmethod
+    def notify(cls, assignment, email):
+        """
+        Отправляет назначенному менеджеру письмо о событии (или добавляет событие в его сводку
+        в режиме `EMAIL_MANAGER_DIGEST`).
+        """
+        template_name, subject = cls.KINDS[assignment.kind]
+        EmailService.queue_email(email, template_name, assignment.payload, subject, digest=settings.EMAIL_MANAGER_DIGEST)
+
+    @staticmethod
+    def schedule_escalation(assignment_id, escalation_level):
+        """
+        Планирует проверку события через `MANAGER_ESCALATION_TIMEOUT` секунд (через outbox, в текущей транзакции).
+        """
+        if escalation_level >= settings.MANAGER_MAX_ESCALATIONS:
+            return
+        OutboxService.enqueue(
+            escalate_assignment, (assignment_id, escalation_level), countdown=settings.MANAGER_ESCALATION_TIMEOUT
+        )
+
+    @classmethod
+    def resolve(cls, assignment_id, manager):
+        """
+        Закрывает открытое событие, назначенное менеджеру.
+        :return: True, если событие закрыто
+        """
+        ManagerAssignmentModel = apps.get_model('users', 'ManagerAssignmentModel')
+        updated = ManagerAssignmentModel.objects.filter(
+            id=assignment_id, manager=manager, status='open'
+        ).update(status='resolved', resolved_at=timezone.now(), updated_at=timezone.now())
+        if updated:
+            cls.change_open_count(manager.id, -1)
+        return bool(updated)
+
+    @classmethod
+    def escalate(cls, assignment_id, escalation_level):
+        """
+        Переназначает событие другому менеджеру, если оно все еще открыто и не переназначалось
+        после постановки задачи (уровень эскалации не изменился).
+        :return: ID нового менеджера или None, если событие не переназначено
+        """
+        ManagerAssignmentModel = apps.get_model('users', 'ManagerAssignmentModel')
+        assignment = ManagerAssignmentModel.objects.filter(
+            id=assignment_id, status='open', escalation_level=escalation_level
+        ).first()
+        if assignment is None:
+            return None
+
+        manager = cls.choose(exclude={assignment.manager_id})
+        if manager is None:
+            return None
+        manager_id, email = manager
+
+        with transaction.atomic():
+            updated = ManagerAssignmentModel.objects.filter(
+                id=assignment_id, status='open', escalation_level=escalation_level
+            ).update(
+                manager_id=manager_id, escalation_level=F('escalation_level') + 1, updated_at=timezone.now()
+            )
+            if not updated:
+                return None
+            cls.notify(assignment, email)
+            cls.schedule_escalation(assignment_id, escalation_level + 1)
+
+        if assignment.manager_id is not None:
+            cls.change_open_count(assignment.manager_id, -1)
+        cls.change_open_count(manager_id, 1)
+        return manager_id
+
+
+@shared_task
+def escalate_assignment(assignment_id, escalation_level):
+    """
+    Задача Celery: эскалация незакрытого события менеджера.
+    """
+    return ManagerRoutingService.escalate(assignment_id, escalation_level)
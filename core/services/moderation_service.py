@@ -0,0 +1,158 @@
+import json
+
+import redis
+from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+from core.enums.moderation_status_enum import ModerationStatus
+from core.enums.profanity_enum import ProfanityFilter
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.managers_notification import ManagerNotificationService
+from core.services.outbox_service import OutboxService
+
+
+class ModerationService:
+    """
+    Сервис асинхронной модерации описаний объявлений. Запрос только сохраняет объявление со статусом PENDING
+    (неактивным) и через outbox ставит задачу `moderate_listing`, которая проверяет описание
+    и одобряет или отклоняет объявление одним UPDATE (счетчик `edit_attempts` увеличивается через `F()`).
+    Уведомления о превышении попыток копятся в списке Redis и отправляются одной сводкой одному менеджеру
+    через `MODERATION_ALERTS_DELAY` секунд после первого уведомления.
+    """
+
+    _redis_client = None
+
+    @classmethod
+    def get_redis_client(cls):
+        """
+        Ленивая инициализация подключения к Redis (одно подключение на процесс).
+        """
+        if cls._redis_client is None:
+            cls._redis_client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=0.2, socket_connect_timeout=0.2)
+        return cls._redis_client
+
+    @staticmethod
+    def submit(listing_id):
+        """
+        Ставит объявление в очередь модерации через outbox (задача публикуется после фиксации текущей транзакции).
+        """
+        OutboxService.enqueue(moderate_listing, (listing_id,))
+
+    @classmethod
+    def moderate(cls, listing_id):
+        """
+        Проверяет описание ожидающего модерации объявления и сохраняет результат.
+        Если описание успели изменить после чтения (изменился `updated_at`), результат не сохраняется:
+        новое описание проверит своя задача.
+        :return: Новый статус модерации или None, если объявление не ожидает модерации
+        """
+        ListingModel = apps.get_model('listings', 'ListingModel')
+        listing = ListingModel.objects.filter(
+            id=listing_id, moderation_status=ModerationStatus.PENDING.value
+        ).values('description', 'updated_at', 'seller__username').first()
+        if listing is None:
+            return None
+
+        pending = ListingModel.objects.filter(
+            id=listing_id, moderation_status=ModerationStatus.PENDING.value, updated_at=listing['updated_at']
+        )
+        if not ProfanityFilter.is_profane(listing['description']):
+            updated = pending.update(moderation_status=ModerationStatus.APPROVED.value, active=True)
+            status = ModerationStatus.APPROVED
+        else:
+            updated = pending.update(
+                moderation_status=ModerationStatus.REJECTED.value,
+                active=False,
+                edit_attempts=F('edit_attempts') + 1,
+            )
+            status = ModerationStatus.REJECTED
+        if not updated:
+            return None
+
+        # UPDATE не отправляет сигналы: закешированные списки и фасеты сбрасываются явно.
+        CacheGenerationService.bump(CacheGenerationService.LISTINGS)
+
+        if status is ModerationStatus.REJECTED:
+            edit_attempts = ListingModel.objects.filter(id=listing_id).values_list('edit_attempts', flat=True).first()
+            if edit_attempts is not None and edit_attempts >= settings.MODERATION_MAX_EDIT_ATTEMPTS:
+                cls.queue_alert({
+                    'listing_id': listing_id,
+                    'username': listing['seller__username'],
+                    'description': listing['description'],
+                    'edit_attempts': edit_attempts,
+                })
+        return status.value
+
+    @classmethod
+    def queue_alert(cls, alert):
+        """
+        Добавляет уведомление в список Redis и планирует отправку сводки, если она еще не запланирована.
+        Если Redis недоступен, уведомление отправляется сразу. Если недоступен кеш (сводку нельзя запланировать),
+        сразу отправляются все накопленные уведомления вместе с этим.
+        """
+        try:
+            cls.get_redis_client().rpush(settings.MODERATION_ALERTS_KEY, json.dumps(alert, ensure_ascii=False))
+        except redis.RedisError:
+            cls.notify_managers([alert])
+            return
+        try:
+            scheduled = cache.add(
+                f'{settings.MODERATION_ALERTS_KEY}:scheduled', 1, timeout=settings.MODERATION_ALERTS_DELAY * 2
+            )
+        except Exception:
+            alerts = cls.drain_alerts()
+            if alerts:
+                cls.notify_managers(alerts)
+            return
+        if scheduled:
+            send_moderation_alerts.apply_async(countdown=settings.MODERATION_ALERTS_DELAY)
+
+    @classmethod
+    def drain_alerts(cls):
+        """
+        Атомарно забирает все накопленные уведомления (LRANGE + DEL в одной транзакции MULTI/EXEC).
+        """
+        pipe = cls.get_redis_client().pipeline(transaction=True)
+        pipe.lrange(settings.MODERATION_ALERTS_KEY, 0, -1)
+        pipe.delete(settings.MODERATION_ALERTS_KEY)
+        items, _ = pipe.execute()
+        return [json.loads(item) for item in items]
+
+    @classmethod
+    def send_alerts(cls):
+        """
+        Отправляет менеджерам сводку накопленных уведомлений.
+        :return: Количество уведомлений в сводке
+        """
+        # Флаг снимается до чтения списка: уведомления, пришедшие после, запланируют новую сводку.
+        cache.delete(f'{settings.MODERATION_ALERTS_KEY}:scheduled')
+        alerts = cls.drain_alerts()
+        if alerts:
+            cls.notify_managers(alerts)
+        return len(alerts)
+
+    @staticmethod
+    def notify_managers(alerts):
+        """
+        Отправляет сводку уведомлений одному менеджеру (см. `ManagerNotificationService`).
+        """
+        ManagerNotificationService.send_profanity_notification(alerts)
+
+
+@shared_task
+def moderate_listing(listing_id):
+    """
+    Задача Celery: модерация описания объявления.
+    """
+    return ModerationService.moderate(listing_id)
+
+
+@shared_task
+def send_moderation_alerts():
+    """
+    Задача Celery: отправка менеджерам сводки уведомлений модерации.
+    """
+    return ModerationService.send_alerts()
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from configs.celery import app
+from core.models import OutboxModel
+
+
+class OutboxService:
+    """
+    Transactional outbox для задач Celery. Вместо `.delay()` в потоке запроса задача записывается в таблицу
+    `outbox` в той же транзакции, что и данные: если транзакция откатится, задачи не будет, а задача
+    не может начаться раньше фиксации транзакции. Запрос не обращается к брокеру.
+
+    Ретранслятор (`relay_outbox` по расписанию или команда `run_outbox_relay`) забирает записи пачками
+    с `SELECT ... FOR UPDATE SKIP LOCKED` (параллельные ретрансляторы не публикуют одну запись дважды),
+    публикует их через одно подключение к брокеру и удаляет в той же транзакции. ID задачи Celery
+    детерминирован (`outbox-<ID записи>`), поэтому повторная публикация после сбоя между отправкой
+    и фиксацией видна по ID задачи.
+    """
+
+    @staticmethod
+    def enqueue(task, args=(), kwargs=None, countdown=None):
+        """
+        Записывает задачу в outbox в текущей транзакции.
+        :param task: Задача Celery
+        :param args: Позиционные аргументы задачи (должны сериализоваться в JSON)
+        :param kwargs: Именованные аргументы задачи
+        :param countdown: Через сколько секунд после записи выполнить задачу
+        """
+        return OutboxModel.objects.create(
+            task=task.name,
+            args=list(args),
+            kwargs=kwargs or {},
+            eta=timezone.now() + timedelta(seconds=countdown) if countdown else None,
+        )
+
+    @staticmethod
+    def get_task_id(outbox_id):
+        return f'outbox-{outbox_id}'
+
+    @classmethod
+    def relay(cls, batch_size=None):
+        """
+        Публикует в брокер одну пачку записей outbox в порядке записи.
+        :return: Количество опубликованных записей
+        """
+        batch_size = batch_size or settings.OUTBOX_BATCH_SIZE
+        with transaction.atomic():
+            rows = list(
+                OutboxModel.objects.select_for_update(skip_locked=True)
+                .filter(attempts__lt=settings.OUTBOX_MAX_ATTEMPTS).order_by('id')[:batch_size]
+            )
+            if not rows:
+                return 0
+
+            published, failed = [], {}
+            # Одно подключение к брокеру на всю пачку.
+            with app.producer_or_acquire() as producer:
+                for row in rows:
+                    try:
+                        app.tasks[row.task].apply_async(
+                            row.args, row.kwargs, task_id=cls.get_task_id(row.id), eta=row.eta, producer=producer
+                        )
+                    except Exception as e:
+                        print(f"Outbox task {row.id} ({row.task}) was not published: {e}")
+                        failed[row.id] = str(e)
+                    else:
+                        published.append(row.id)
+
+            OutboxModel.objects.filter(id__in=published).delete()
+            for outbox_id, error in failed.items():
+                OutboxModel.objects.filter(id=outbox_id).update(
+                    attempts=F('attempts') + 1, last_error=error, updated_at=timezone.now()
+                )
+        return len(published)
+
+    @classmethod
+    def relay_all(cls):
+        """
+        Публикует пачки записей, пока очередные пачки заполнены целиком.
+        :return: Количество опубликованных записей
+        """
+        total = 0
+        while True:
+            relayed = cls.relay()
+            total += relayed
+            if relayed < settings.OUTBOX_BATCH_SIZE:
+                return total
+
+
+@shared_task
+def relay_outbox():
+    """
+    Задача Celery: публикация записей outbox в брокер.
+    """
+    return OutboxService.relay_all()
@@ -0,0 +1,44 @@
+import re
+
+from core.dataclases.profanity_dataclass import ProfanityMatch
+
+
+class ProfanityMatcher:
+    """
+    Поиск запрещенных слов за один проход по тексту. Все шаблоны компилируются один раз в одно регулярное
+    выражение-альтернацию с именованными группами, ограниченное границами слова: ветки проверяются только
+    в начале слов, и каждая отбрасывается по первому символу, поэтому время проверки растет с длиной текста,
+    а не с количеством шаблонов. Регистр не учитывается, позиции совпадений относятся к исходному тексту.
+    """
+
+    def __init__(self, patterns):
+        """
+        :param patterns: Пары (имя шаблона, регулярное выражение слова без границ `\\b`)
+        """
+        alternatives = '|'.join(f'(?P<{name}>{pattern})' for name, pattern in patterns)
+        self.regex = re.compile(rf'\b(?:{alternatives})\b', re.IGNORECASE)
+
+    def is_profane(self, text):
+        """
+        Проверяет, содержит ли текст хотя бы одно запрещенное слово (поиск останавливается на первом).
+        """
+        return bool(text) and self.regex.search(text) is not None
+
+    def scan(self, text):
+        """
+        Находит все запрещенные слова в тексте.
+        :return: Список `ProfanityMatch` в порядке появления в тексте
+        """
+        if not text:
+            return []
+        return [
+            ProfanityMatch(start=match.start(), end=match.end(), word=match.group(), pattern=match.lastgroup)
+            for match in self.regex.finditer(text)
+        ]
+
+    def scan_many(self, texts):
+        """
+        Пакетная проверка: находит запрещенные слова в каждом тексте.
+        :return: Список списков `ProfanityMatch` в порядке текстов
+        """
+        return [self.scan(text) for text in texts]
@@ -0,0 +1,109 @@
+import math
+import struct
+from collections import Counter
+
+
+class QuantileSketch:
+    """
+    Компактный объединяемый скетч квантилей с логарифмическими корзинами (по схеме DDSketch).
+    Значение попадает в корзину `ceil(log(value) / log(gamma))`, поэтому оценка любого квантиля отличается
+    от точного значения не более чем на `RELATIVE_ACCURACY` (1%). Скетчи сегментов объединяются сложением
+    корзин, а в отличие от t-digest и KLL значение можно и удалить (при изменении или удалении объявления).
+    Размер скетча зависит от разброса цен, а не от количества объявлений (сотни корзин на весь диапазон цен).
+    """
+
+    RELATIVE_ACCURACY = 0.01  # Относительная погрешность квантилей.
+    FORMAT_VERSION = 1
+    HEADER = struct.Struct('<BI')  # Версия формата, количество нулевых значений.
+    BUCKET = struct.Struct('<iI')  # Номер корзины, количество значений.
+
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    log_gamma = math.log(gamma)
+
+    def __init__(self, buckets=None, zero_count=0):
+        self.buckets = Counter(buckets or {})
+        self.zero_count = zero_count
+
+    @property
+    def count(self):
+        """
+        Количество значений в скетче.
+        """
+        return self.zero_count + sum(self.buckets.values())
+
+    def get_key(self, value):
+        return math.ceil(math.log(value) / self.log_gamma)
+
+    def add(self, value, count=1):
+        """
+        Добавляет значение (цены неотрицательны, нулевые учитываются отдельно).
+        """
+        value = float(value)
+        if value <= 0:
+            self.zero_count += count
+        else:
+            self.buckets[self.get_key(value)] += count
+
+    def remove(self, value, count=1):
+        """
+        Удаляет ранее добавленное значение.
+        """
+        value = float(value)
+        if value <= 0:
+            self.zero_count = max(self.zero_count - count, 0)
+            return
+        key = self.get_key(value)
+        self.buckets[key] -= count
+        if self.buckets[key] <= 0:
+            del self.buckets[key]
+
+    def merge(self, other):
+        """
+        Объединяет другой скетч с текущим (результат - скетч объединенного набора значений).
+        """
+        self.buckets.update(other.buckets)
+        self.zero_count += other.zero_count
+        return self
+
+    def quantile(self, q):
+        """
+        Оценка квантиля `q` (от 0 до 1).
+        :return: Значение квантиля или None для пустого скетча
+        """
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                # Середина корзины (gamma^(k-1), gamma^k] с относительной погрешностью не больше RELATIVE_ACCURACY.
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_bytes(self):
+        """
+        Сериализует скетч в компактный бинарный вид для хранения в БД.
+        """
+        return self.HEADER.pack(self.FORMAT_VERSION, self.zero_count) + b''.join(
+            self.BUCKET.pack(key, count) for key, count in sorted(self.buckets.items())
+        )
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Восстанавливает скетч из бинарного вида. Пустые данные дают пустой скетч.
+        """
+        data = bytes(data or b'')
+        if not data:
+            return cls()
+        version, zero_count = cls.HEADER.unpack_from(data)
+        if version != cls.FORMAT_VERSION:
+            raise ValueError(f'Unsupported quantile sketch version: {version}')
+        return cls(
+            buckets=dict(cls.BUCKET.iter_unpack(data[cls.HEADER.size:])),
+            zero_count=zero_count,
+        )
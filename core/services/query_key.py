@@ -0,0 +1,33 @@
+import hashlib
+import json
+
+
+def normalize_query_params(query_params, exclude=()):
+    """
+    Приводит параметры запроса к каноническому виду: пустые значения отбрасываются, ключи и значения сортируются.
+    Два запроса с одинаковым набором фильтров в разном порядке дают одинаковый результат.
+    :param query_params: QueryDict (request.query_params) или обычный словарь
+    :param exclude: Параметры, которые не участвуют в ключе (например, курсор или номер страницы)
+    :return: Отсортированный список пар (параметр, [значения])
+    """
+    if hasattr(query_params, 'lists'):
+        items = query_params.lists()
+    else:
+        items = ((key, value if isinstance(value, (list, tuple)) else [value]) for key, value in query_params.items())
+
+    normalized = []
+    for key, values in items:
+        if key in exclude:
+            continue
+        values = sorted(str(value) for value in values if value not in ('', None))
+        if values:
+            normalized.append((key, values))
+    return sorted(normalized)
+
+
+def make_query_key(query_params, exclude=()):
+    """
+    Короткий стабильный хеш нормализованных параметров запроса для ключей кеша и курсоров.
+    """
+    payload = json.dumps(normalize_query_params(query_params, exclude), separators=(',', ':'), ensure_ascii=False)
+    return hashlib.md5(payload.encode()).hexdigest()
@@ -0,0 +1,64 @@
+from functools import reduce
+from operator import add
+
+from django.db import connection
+from django.db.models import Case, FloatField, Func, Value, When
+
+
+class MatchAgainst(Func):
+    """
+    Полнотекстовое выражение MySQL `MATCH (поля) AGAINST (запрос IN NATURAL LANGUAGE MODE)`.
+    Возвращает релевантность записи (0 - нет совпадения) и использует индекс FULLTEXT по тем же полям.
+    """
+    template = 'MATCH (%(expressions)s) AGAINST (%%s IN NATURAL LANGUAGE MODE)'
+    output_field = FloatField()
+
+    def __init__(self, *fields, query):
+        super().__init__(*fields)
+        self.query = query
+
+    def as_sql(self, compiler, connection, **extra_context):
+        sql, params = super().as_sql(compiler, connection, **extra_context)
+        return sql, (*params, self.query)
+
+
+class SearchService:
+    """
+    Сервис полнотекстового поиска. На MySQL ранжирует записи через `MATCH ... AGAINST` по индексу FULLTEXT,
+    на остальных СУБД (локальная разработка) - упрощенной оценкой по вхождению слов запроса.
+    """
+
+    MAX_FALLBACK_TERMS = 5  # Сколько слов запроса учитывается в упрощенной оценке.
+
+    @classmethod
+    def search(cls, queryset, query, fields, weights=None):
+        """
+        Отбирает записи, совпадающие с запросом, и добавляет им аннотацию `relevance`.
+        :param queryset: Исходная выборка
+        :param query: Текст запроса
+        :param fields: Поля, по которым построен индекс FULLTEXT (в том же порядке)
+        :param weights: Веса полей для упрощенной оценки (по умолчанию 1 для каждого поля)
+        :return: Выборка с аннотацией `relevance` и условием `relevance > 0`
+        """
+        if connection.vendor == 'mysql':
+            relevance = MatchAgainst(*fields, query=query)
+        else:
+            relevance = cls.fallback_relevance(query, fields, weights)
+        return queryset.annotate(relevance=relevance).filter(relevance__gt=0)
+
+    @classmethod
+    def fallback_relevance(cls, query, fields, weights=None):
+        """
+        Оценка релевантности без полнотекстового индекса: сумма весов полей, в которых встречается каждое слово.
+        """
+        weights = weights or {}
+        terms = query.split()[:cls.MAX_FALLBACK_TERMS] or [query]
+        return reduce(add, [
+            Case(
+                When(**{f'{field}__icontains': term}, then=Value(float(weights.get(field, 1)))),
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+            for term in terms
+            for field in fields
+        ])
@@ -0,0 +1,252 @@
+from celery import shared_task
+from django.apps import apps
+from django.db import transaction
+from django.db.models import F, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from core.services.quantile_sketch import QuantileSketch
+
+
+class SegmentStatsService:
+    """
+    Сервис материализованной статистики цен по сегментам регион × бренд × модель × тип кузова.
+    Количество и сумма цен обновляются инкрементально через `F()`; минимум и максимум при добавлении цены
+    сдвигаются через LEAST/GREATEST, а при удалении граничной цены сегмент пересчитывается одним запросом.
+    Для оценки квантилей каждый сегмент хранит скетч `QuantileSketch`.
+    После пересчета цен по новым курсам вся таблица перестраивается за один проход по объявлениям.
+    Состояние объявления для статистики - кортеж (car_id, region, price_usd).
+    """
+
+    REBUILD_BATCH_SIZE = 1000  # Размер пачки при перестроении таблицы.
+
+    @staticmethod
+    def get_state(listing):
+        """
+        Состояние объявления, от которого зависит статистика. Не обращается к отложенным (deferred) полям.
+        :return: Кортеж (car_id, region, price_usd) или None, если поля не загружены
+        """
+        values = listing.__dict__
+        if not all(name in values for name in ('car_id', 'region', 'price_usd')):
+            return None
+        return values['car_id'], values['region'], values['price_usd']
+
+    @staticmethod
+    def get_segment(car_id, region, car=None):
+        """
+        Ключ сегмента для автомобиля и региона.
+        :param car: Уже загруженный автомобиль (если его ID совпадает с `car_id`, запрос к таблице машин не нужен)
+        """
+        if car is not None and car.pk == car_id:
+            car = {'brand_id': car.brand_id, 'model_name_id': car.model_name_id, 'body_type': car.body_type}
+        else:
+            CarModel = apps.get_model('cars', 'CarModel')
+            car = CarModel.objects.filter(id=car_id).values('brand_id', 'model_name_id', 'body_type').first()
+        if car is None:
+            return None
+        return {
+            'region': region,
+            'brand_id': car['brand_id'],
+            'model_name_id': car['model_name_id'] or 0,
+            'body_type': car['body_type'],
+        }
+
+    @classmethod
+    def apply_change(cls, previous, current, car=None):
+        """
+        Переносит цену объявления между сегментами при изменении его состояния.
+        :param previous: Состояние до изменения (None для нового объявления)
+        :param current: Состояние после изменения (None для удаленного объявления)
+        :param car: Загруженный автомобиль объявления, если есть
+        """
+        if previous == current:
+            return
+        with transaction.atomic():
+            if previous is not None:
+                cls.remove(*previous, car=car)
+            if current is not None:
+                cls.add(*current, car=car)
+
+    @classmethod
+    def add(cls, car_id, region, price_usd, car=None):
+        """
+        Добавляет цену объявления в статистику и скетч квантилей сегмента.
+        Вызывается внутри транзакции (`apply_change`): строка сегмента блокируется до ее завершения.
+        """
+        segment = cls.get_segment(car_id, region, car)
+        if segment is None or price_usd is None:
+            return
+        ListingSegmentStatsModel = apps.get_model('listings', 'ListingSegmentStatsModel')
+        ListingSegmentStatsModel.objects.bulk_create([ListingSegmentStatsModel(**segment)], ignore_conflicts=True)
+        stats = ListingSegmentStatsModel.objects.filter(**segment)
+        sketch = cls.lock_sketch(stats)
+        sketch.add(price_usd)
+        stats.update(
+            listings_count=F('listings_count') + 1,
+            price_usd_sum=F('price_usd_sum') + price_usd,
+            price_usd_min=Least(Coalesce('price_usd_min', Value(price_usd)), Value(price_usd)),
+            price_usd_max=Greatest(Coalesce('price_usd_max', Value(price_usd)), Value(price_usd)),
+            price_usd_sketch=sketch.to_bytes(),
+        )
+
+    @classmethod
+    def remove(cls, car_id, region, price_usd, car=None):
+        """
+        Убирает цену объявления из статистики и скетча квантилей сегмента. Если цена была минимальной
+        или максимальной, границы сегмента пересчитываются по объявлениям.
+        Вызывается внутри транзакции (`apply_change`).
+        """
+        segment = cls.get_segment(car_id, region, car)
+        if segment is None or price_usd is None:
+            return
+        ListingSegmentStatsModel = apps.get_model('listings', 'ListingSegmentStatsModel')
+        stats = ListingSegmentStatsModel.objects.filter(**segment)
+        sketch = cls.lock_sketch(stats)
+        sketch.remove(price_usd)
+        stats.update(
+            listings_count=F('listings_count') - 1,
+            price_usd_sum=F('price_usd_sum') - price_usd,
+            price_usd_sketch=sketch.to_bytes(),
+        )
+        if stats.filter(Q(price_usd_min__gte=price_usd) | Q(price_usd_max__lte=price_usd)).exists():
+            cls.recompute_bounds(segment)
+
+    @staticmethod
+    def lock_sketch(stats):
+        """
+        Блокирует строку сегмента до конца транзакции и возвращает ее скетч квантилей:
+        скетч обновляется в Python, поэтому параллельные изменения одного сегмента выполняются по очереди.
+        """
+        blob = stats.select_for_update().values_list('price_usd_sketch', flat=True).first()
+        return QuantileSketch.from_bytes(blob)
+
+    @staticmethod
+    def recompute_bounds(segment):
+        """
+        Пересчитывает минимум и максимум цены сегмента по объявлениям.
+        """
+        ListingModel = apps.get_model('listings', 'ListingModel')
+        ListingSegmentStatsModel = apps.get_model('listings', 'ListingSegmentStatsModel')
+        bounds = ListingModel.objects.filter(
+            region=segment['region'],
+            car__brand_id=segment['brand_id'],
+            car__model_name_id=segment['model_name_id'] or None,
+            car__body_type=segment['body_type'],
+            price_usd__isnull=False,
+        ).aggregate(price_usd_min=Min('price_usd'), price_usd_max=Max('price_usd'))
+        ListingSegmentStatsModel.objects.filter(**segment).update(**bounds)
+
+    @classmethod
+    def rebuild(cls):
+        """
+        Перестраивает всю таблицу статистики за один проход по ценам объявлений.
+        Чтение объявлений и замена строк выполняются в одной транзакции, а строки сегментов блокируются до ее
+        завершения: параллельные `add`/`remove` ждут блокировки (`lock_sketch`) и применяют свое изменение
+        уже к перестроенной строке, поэтому изменения между чтением и заменой не теряются.
+        :return: Количество сегментов
+        """
+        ListingModel = apps.get_model('listings', 'ListingModel')
+        ListingSegmentStatsModel = apps.get_model('listings', 'ListingSegmentStatsModel')
+
+        with transaction.atomic():
+            locked_ids = list(
+                ListingSegmentStatsModel.objects.select_for_update().order_by('id').values_list('id', flat=True)
+            )
+            rows = ListingModel.objects.filter(price_usd__isnull=False).values_list(
+                'region', 'car__brand_id', 'car__model_name_id', 'car__body_type', 'price_usd'
+            ).order_by()
+
+            segments = {}
+            sketches = {}
+            for region, brand_id, model_name_id, body_type, price_usd in rows.iterator(
+                chunk_size=cls.REBUILD_BATCH_SIZE
+            ):
+                key = (region, brand_id, model_name_id or 0, body_type)
+                stats = segments.get(key)
+                if stats is None:
+                    stats = segments[key] = ListingSegmentStatsModel(
+                        region=region, brand_id=brand_id, model_name_id=model_name_id or 0, body_type=body_type,
+                        price_usd_min=price_usd, price_usd_max=price_usd,
+                    )
+                    sketches[key] = QuantileSketch()
+                stats.listings_count += 1
+                stats.price_usd_sum += price_usd
+                stats.price_usd_min = min(stats.price_usd_min, price_usd)
+                stats.price_usd_max = max(stats.price_usd_max, price_usd)
+                sketches[key].add(price_usd)
+
+            for key, stats in segments.items():
+                stats.price_usd_sketch = sketches[key].to_bytes()
+
+            # Удаляются только заблокированные строки. Сегмент, созданный параллельным объявлением после
+            # блокировки, остается как есть (его строка уже содержит изменение этого объявления).
+            for start in range(0, len(locked_ids), cls.REBUILD_BATCH_SIZE):
+                ListingSegmentStatsModel.objects.filter(
+                    id__in=locked_ids[start:start + cls.REBUILD_BATCH_SIZE]
+                ).delete()
+            ListingSegmentStatsModel.objects.bulk_create(
+                segments.values(), batch_size=cls.REBUILD_BATCH_SIZE, ignore_conflicts=True
+            )
+        return len(segments)
+
+    @staticmethod
+    def filter_segments(region=None, brand_id=None, model_name_id=None, body_type=None):
+        """
+        Сегменты для выбранных региона, бренда, модели и типа кузова (не заданные параметры не ограничивают выборку).
+        """
+        ListingSegmentStatsModel = apps.get_model('listings', 'ListingSegmentStatsModel')
+        segments = ListingSegmentStatsModel.objects.all()
+        if region:
+            segments = segments.filter(region=region)
+        if brand_id is not None:
+            segments = segments.filter(brand_id=brand_id)
+        if model_name_id is not None:
+            segments = segments.filter(model_name_id=model_name_id)
+        if body_type:
+            segments = segments.filter(body_type=body_type)
+        return segments
+
+    @classmethod
+    def get_quantiles(cls, quantiles, **segment_filters):
+        """
+        Оценки квантилей цены в USD для любой комбинации региона, бренда, модели и типа кузова:
+        скетчи подходящих сегментов объединяются без обращения к объявлениям.
+        :param quantiles: Квантили от 0 до 1 (например, 0.5 для медианы)
+        :return: Количество объявлений и словарь `квантиль -> цена` (None, если объявлений нет)
+        """
+        sketch = QuantileSketch()
+        blobs = cls.filter_segments(**segment_filters).filter(listings_count__gt=0)
+        for blob in blobs.values_list('price_usd_sketch', flat=True).iterator(chunk_size=cls.REBUILD_BATCH_SIZE):
+            sketch.merge(QuantileSketch.from_bytes(blob))
+        return sketch.count, {q: sketch.quantile(q) for q in quantiles}
+
+    @staticmethod
+    def get_average_prices(region, brand_id=None, model_name_id=None, body_type=None):
+        """
+        Средние цены в USD по региону и по стране для выбранных бренда, модели и типа кузова одним запросом.
+        :return: Кортеж (средняя по региону, средняя по стране); None, если объявлений нет
+        """
+        segments = SegmentStatsService.filter_segments(
+            brand_id=brand_id, model_name_id=model_name_id, body_type=body_type
+        )
+        totals = segments.aggregate(
+            region_count=Sum('listings_count', filter=Q(region=region)),
+            region_sum=Sum('price_usd_sum', filter=Q(region=region)),
+            country_count=Sum('listings_count'),
+            country_sum=Sum('price_usd_sum'),
+        )
+
+        def average(total, count):
+            return total / count if count else None
+
+        return (
+            average(totals['region_sum'], totals['region_count']),
+            average(totals['country_sum'], totals['country_count']),
+        )
+
+
+@shared_task
+def rebuild_segment_stats():
+    """
+    Задача Celery: перестраивает статистику сегментов (после изменения автомобилей или для сверки).
+    """
+    return SegmentStatsService.rebuild()
@@ -0,0 +1,270 @@
+import atexit
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+import redis
+from celery import shared_task
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+class RedisViewCounterStore:
+    """
+    Буфер просмотров в Redis. Просмотры копятся в хеше `listing_id -> количество` и забираются пачкой при сбросе.
+    """
+
+    def __init__(self, url, key):
+        # Короткие таймауты: если Redis недоступен, просмотр уходит в локальный буфер, а не тормозит запрос.
+        self.client = redis.Redis.from_url(url, socket_timeout=0.2, socket_connect_timeout=0.2)
+        self.key = key
+
+    def incr(self, listing_id, amount=1):
+        """
+        Увеличивает счетчик просмотров объявления в буфере.
+        """
+        self.client.hincrby(self.key, listing_id, amount)
+
+    def drain(self):
+        """
+        Атомарно забирает все накопленные просмотры и очищает буфер (HGETALL + DEL в одной транзакции MULTI/EXEC).
+        :return: Словарь `listing_id -> количество просмотров`
+        """
+        pipe = self.client.pipeline(transaction=True)
+        pipe.hgetall(self.key)
+        pipe.delete(self.key)
+        data, _ = pipe.execute()
+        return {int(listing_id): int(amount) for listing_id, amount in data.items()}
+
+    def restore(self, counts):
+        """
+        Возвращает просмотры обратно в буфер, если их не удалось записать в БД.
+        """
+        pipe = self.client.pipeline(transaction=False)
+        for listing_id, amount in counts.items():
+            pipe.hincrby(self.key, listing_id, amount)
+        pipe.execute()
+
+
+class LocalViewCounterStore:
+    """
+    Резервный буфер просмотров в памяти процесса. Используется, когда Redis недоступен.
+    Сбрасывается в БД самим процессом по размеру буфера или по истечении интервала (при очередном просмотре),
+    задачей `flush_listing_views` (буфер процесса воркера) и при завершении процесса.
+    """
+
+    def __init__(self, flush_size, flush_interval):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def incr(self, listing_id, amount=1):
+        """
+        Увеличивает счетчик просмотров объявления в буфере.
+        """
+        with self._lock:
+            self._counts[listing_id] += amount
+
+    def should_flush(self):
+        """
+        Проверяет, пора ли сбрасывать буфер в БД.
+        """
+        with self._lock:
+            return bool(self._counts) and (
+                len(self._counts) >= self.flush_size or
+                time.monotonic() - self._last_flush >= self.flush_interval
+            )
+
+    def drain(self):
+        """
+        Забирает все накопленные просмотры и очищает буфер.
+        :return: Словарь `listing_id -> количество просмотров`
+        """
+        with self._lock:
+            counts, self._counts = dict(self._counts), Counter()
+            self._last_flush = time.monotonic()
+        return counts
+
+    def restore(self, counts):
+        """
+        Возвращает просмотры обратно в буфер, если их не удалось записать в БД.
+        """
+        with self._lock:
+            self._counts.update(counts)
+
+
+class ViewCounterService:
+    """
+    Сервис отложенной записи просмотров объявлений (write-behind).
+    Просмотр не пишет в таблицу объявлений, а только увеличивает счетчик в буфере (Redis или память процесса).
+    Накопленные просмотры периодически сбрасываются в БД пачкой через `flush_listing_views`.
+    """
+
+    _redis_store = None
+    _redis_retry_at = 0  # Момент (time.monotonic), после которого можно снова обращаться к Redis.
+    _local_store = LocalViewCounterStore(settings.VIEW_COUNTER_LOCAL_FLUSH_SIZE, settings.VIEW_COUNTER_FLUSH_INTERVAL)
+
+    @classmethod
+    def get_redis_store(cls):
+        """
+        Ленивая инициализация буфера в Redis (одно подключение на процесс).
+        """
+        if cls._redis_store is None:
+            cls._redis_store = RedisViewCounterStore(settings.REDIS_URL, settings.VIEW_COUNTER_KEY)
+        return cls._redis_store
+
+    @classmethod
+    def record_view(cls, listing_id):
+        """
+        Регистрирует один просмотр объявления. Если Redis недоступен, просмотр копится в памяти процесса.
+        """
+        stored = False
+        if time.monotonic() >= cls._redis_retry_at:
+            try:
+                cls.get_redis_store().incr(listing_id)
+                stored = True
+            except redis.RedisError:
+                # Не пытаемся подключаться к Redis на каждом просмотре, пока не пройдет интервал сброса.
+                cls._redis_retry_at = time.monotonic() + settings.VIEW_COUNTER_FLUSH_INTERVAL
+        if not stored:
+            cls._local_store.incr(listing_id)
+
+        # Проверяется и после восстановления Redis, иначе остаток локального буфера ждал бы следующего сбоя.
+        if cls._local_store.should_flush():
+            cls.flush(cls._local_store)
+
+    @classmethod
+    def flush(cls, store):
+        """
+        Забирает просмотры из буфера и записывает их в БД.
+        Если запись не удалась, просмотры возвращаются в буфер, чтобы не потерять их.
+        :return: Количество обновленных объявлений
+        """
+        counts = store.drain()
+        if not counts:
+            return 0
+        try:
+            cls.apply_views(counts)
+        except Exception:
+            store.restore(counts)
+            raise
+        return len(counts)
+
+    @classmethod
+    def flush_local(cls):
+        """
+        Сбрасывает локальный буфер процесса в БД (из периодической задачи и при завершении процесса).
+        Ошибка записи не пробрасывается: просмотры остаются в буфере до следующего сброса.
+        :return: Количество обновленных объявлений
+        """
+        try:
+            return cls.flush(cls._local_store)
+        except Exception as e:
+            print(f"Local listing views were not flushed: {e}")
+            return 0
+
+    @staticmethod
+    def apply_views(counts, day=None):
+        """
+        Записывает просмотры в БД набором UPDATE через `F()`: объявления группируются по количеству новых просмотров,
+        поэтому на каждую группу выполняется один запрос без чтения строк и без вызова `save()`.
+        Параллельно просмотры добавляются в дневную корзину объявления, по которой потом ротируются окна.
+        :param counts: Словарь `listing_id -> количество просмотров`
+        :param day: День корзины (по умолчанию текущий)
+        """
+        ListingModel = apps.get_model('listings', 'ListingModel')
+        ListingViewBucketModel = apps.get_model('listings', 'ListingViewBucketModel')
+        day = day or timezone.localdate()
+
+        # Объявления могли быть удалены, пока просмотры лежали в буфере.
+        existing_ids = set(ListingModel.objects.filter(id__in=counts.keys()).values_list('id', flat=True))
+
+        listings_by_amount = defaultdict(list)
+        for listing_id, amount in counts.items():
+            if listing_id in existing_ids:
+                listings_by_amount[amount].append(listing_id)
+
+        # Одна транзакция на всю пачку: при ошибке буфер восстанавливается целиком без двойного учета.
+        with transaction.atomic():
+            # Создаем недостающие корзины за день одним INSERT, существующие пропускаются.
+            ListingViewBucketModel.objects.bulk_create(
+                [ListingViewBucketModel(listing_id=listing_id, day=day) for listing_id in existing_ids],
+                ignore_conflicts=True
+            )
+            for amount, listing_ids in listings_by_amount.items():
+                ListingModel.objects.filter(id__in=listing_ids).update(
+                    views_day=F('views_day') + amount,
+                    views_week=F('views_week') + amount,
+                    views_month=F('views_month') + amount,
+                    views_total=F('views_total') + amount,
+                )
+                ListingViewBucketModel.objects.filter(listing_id__in=listing_ids, day=day).update(
+                    views=F('views') + amount
+                )
+
+    @staticmethod
+    def rollover(today=None):
+        """
+        Ежедневная ротация окон просмотров для всех объявлений набором UPDATE без вызова `save()`:
+        - `views_day` приравнивается к корзине текущего дня;
+        - из `views_week` вычитаются корзины, вышедшие за 7 дней (корзина помечается как учтенная);
+        - из `views_month` вычитаются корзины, вышедшие за 30 дней (такие корзины удаляются).
+        Повторный запуск за тот же день ничего не меняет, пропущенные дни догоняются при следующем запуске.
+        :param today: Текущий день (по умолчанию сегодня)
+        """
+        ListingModel = apps.get_model('listings', 'ListingModel')
+        ListingViewBucketModel = apps.get_model('listings', 'ListingViewBucketModel')
+        today = today or timezone.localdate()
+
+        def expired_views(buckets):
+            # Сумма просмотров устаревших корзин для каждого объявления (коррелированный подзапрос).
+            return Subquery(
+                buckets.filter(listing=OuterRef('pk')).values('listing').annotate(total=Sum('views')).values('total')
+            )
+
+        with transaction.atomic():
+            today_views = ListingViewBucketModel.objects.filter(listing=OuterRef('pk'), day=today).values('views')[:1]
+            ListingModel.objects.exclude(views_day=0).update(views_day=Coalesce(Subquery(today_views), 0))
+
+            expired_week = ListingViewBucketModel.objects.filter(
+                day__lte=today - timedelta(days=7), counted_in_week=True
+            )
+            ListingModel.objects.filter(id__in=expired_week.values('listing_id')).update(
+                views_week=F('views_week') - expired_views(expired_week)
+            )
+            expired_week.update(counted_in_week=False)
+
+            expired_month = ListingViewBucketModel.objects.filter(day__lte=today - timedelta(days=30))
+            ListingModel.objects.filter(id__in=expired_month.values('listing_id')).update(
+                views_month=F('views_month') - expired_views(expired_month)
+            )
+            expired_month.delete()
+
+
+# Просмотры, оставшиеся в памяти процесса, записываются в БД при его штатном завершении.
+atexit.register(ViewCounterService.flush_local)
+
+
+@shared_task
+def flush_listing_views():
+    """
+    Периодическая задача Celery: сбрасывает в БД накопленные в Redis просмотры объявлений
+    и локальный буфер процесса воркера.
+    """
+    flushed = ViewCounterService.flush_local()
+    return flushed + ViewCounterService.flush(ViewCounterService.get_redis_store())
+
+
+@shared_task
+def rollover_listing_views():
+    """
+    Ежедневная задача Celery: ротация окон просмотров объявлений (день, неделя, месяц).
+    """
+    ViewCounterService.rollover()
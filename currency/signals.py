@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.services.currency_rate_service import CurrencyRateService
+from .models import CurrencyModel
+
+
+@receiver(post_save, sender=CurrencyModel)
+@receiver(post_delete, sender=CurrencyModel)
+def bump_currencies_generation(sender, **kwargs):
+    """
+    Изменение курса валюты (в том числе вручную) увеличивает поколение курсов валют и сбрасывает снимок курсов
+    текущего процесса. Поколение увеличивается после фиксации транзакции, чтобы параллельный запрос
+    не закешировал прежние курсы под новым поколением.
+    """
+    transaction.on_commit(CurrencyRateService.invalidate)
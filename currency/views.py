@@ -3,8 +3,10 @@ from rest_framework.response import Response
 from .models import CurrencyModel
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from .serializers import CurrencySerializer
+from core.conditional import ConditionalGetMixin, make_etag
+from core.services.cache_generation_service import CacheGenerationService
 
-class CurrencyAPIView(APIView):
+class CurrencyAPIView(ConditionalGetMixin, APIView):
     """
     APIView для работы с валютами. Позволяет получать список всех валют и их курсов.
     """
@@ -12,6 +14,16 @@ class CurrencyAPIView(APIView):
     # Устанавливаем, что доступ к API разрешен для всех.
     permission_classes = [AllowAny]
 
+    # Курсы обновляются раз в день: ответ можно кешировать в nginx дольше.
+    cache_control = {'public': True, 'max_age': 60}
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        ETag списка валют по поколению курсов валют, без запроса к БД.
+        """
+        generation = CacheGenerationService.get(CacheGenerationService.CURRENCIES)
+        return (make_etag('currencies', generation) if generation is not None else None), None
+
     def get(self, request):
         """
         Обрабатывает GET-запрос для получения списка валют и их курсов.
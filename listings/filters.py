@@ -1,7 +1,22 @@
 import django_filters
 from .models import ListingModel
-from cars.models import CarModel, Brand, ModelName
+from cars.fields import CatalogChoiceFilter
+from cars.models import CarModel
 from core.enums.country_region_enum import Region
+from core.services.car_catalog_service import CarCatalogService
+from core.services.currency_rate_service import CurrencyRateService
+from core.services.search_service import SearchService
+
+PRICE_CURRENCIES = [(code, code) for code in CurrencyRateService.CONVERTED_CURRENCIES]
+DEFAULT_PRICE_CURRENCY = 'USD'  # Валюта сравнения цен, если `price_currency` не передана.
+ORDERING_CHOICES = [
+    ('created_at', 'Сначала старые'),
+    ('-created_at', 'Сначала новые'),
+    ('price', 'Сначала дешевые'),
+    ('-price', 'Сначала дорогие'),
+]
+SEARCH_FIELDS = ('title', 'description')  # Поля полнотекстового индекса объявлений (миграция 0012).
+SEARCH_WEIGHTS = {'title': 2, 'description': 1}  # Веса полей для поиска без индекса FULLTEXT.
 
 
 class ListingFilter(django_filters.FilterSet):
@@ -9,18 +24,16 @@ class ListingFilter(django_filters.FilterSet):
     Фильтр для поиска и фильтрации объявлений. Использует cars фильтры для бренда, модели, типа кузова, года, региона и цены.
     """
 
-    brand = django_filters.ModelChoiceFilter(
+    brand = CatalogChoiceFilter(
         field_name="car__brand",  # Связь с брендом автомобиля через модель машины.
-        queryset=Brand.objects.all(),  # Список всех доступных брендов для фильтрации.
-        label='Бренд',
-        to_field_name='id'  # Фильтрация по ID бренда.
+        lookup=CarCatalogService.get_brand,  # ID бренда проверяется по справочнику в памяти.
+        label='Бренд'
     )
 
-    model_name = django_filters.ModelChoiceFilter(
+    model_name = CatalogChoiceFilter(
         field_name="car__model_name",  # Связь с моделью автомобиля через модель машины.
-        queryset=ModelName.objects.all(),  # Список всех доступных моделей для фильтрации.
-        label='Модель',
-        to_field_name='id'  # Фильтрация по ID модели.
+        lookup=CarCatalogService.get_model,  # ID модели проверяется по справочнику в памяти.
+        label='Модель'
     )
 
     body_type = django_filters.ChoiceFilter(
@@ -36,20 +49,79 @@ class ListingFilter(django_filters.FilterSet):
 
     region = django_filters.ChoiceFilter(
         field_name="region",  # Поле для фильтрации по региону.
-        choices=Region.choices(),  # Список всех возможных регионов.
+        # Значения выбора - сами регионы (как хранятся в поле и принимаются при создании объявления).
+        choices=[(region.value, region.value) for region in Region],
         label='Регион'
     )
 
-    price_min = django_filters.NumberFilter(field_name="price", lookup_expr='gte',
+    price_currency = django_filters.ChoiceFilter(
+        choices=PRICE_CURRENCIES,  # Валюты, в которых хранится пересчитанная цена объявления.
+        method='filter_price_currency',
+        label='Валюта цены'
+    )  # Валюта, в которой заданы `price_min`/`price_max` и выполняется сортировка по цене (по умолчанию USD).
+
+    price_min = django_filters.NumberFilter(method='filter_price', lookup_expr='gte',
                                             label='Минимальная цена')  # Фильтрация по минимальной цене.
-    price_max = django_filters.NumberFilter(field_name="price", lookup_expr='lte',
+    price_max = django_filters.NumberFilter(method='filter_price', lookup_expr='lte',
                                             label='Максимальная цена')  # Фильтрация по максимальной цене.
 
     active = django_filters.BooleanFilter(field_name="active",
                                           label='Активные объявления')  # Фильтр по статусу объявления (активно/неактивно).
 
+    q = django_filters.CharFilter(method='filter_search', max_length=200,
+                                  label='Поиск')  # Полнотекстовый поиск по заголовку и описанию.
+
+    ordering = django_filters.ChoiceFilter(
+        choices=ORDERING_CHOICES,
+        method='filter_ordering',
+        label='Сортировка'
+    )  # Сортировка по дате создания или по цене в валюте `price_currency`.
+
+    def get_price_field(self):
+        """
+        Возвращает поле пересчитанной цены в выбранной валюте (`price_usd`, `price_eur` или `price_uah`).
+        Сравнение по нему выполняется в БД по индексу, а не по исходной цене в разных валютах.
+        """
+        currency = self.form.cleaned_data.get('price_currency') or DEFAULT_PRICE_CURRENCY
+        return f'price_{currency.lower()}'
+
+    def filter_price_currency(self, queryset, name, value):
+        """
+        Валюта сама по себе не фильтрует выборку, она используется фильтрами цены и сортировкой.
+        """
+        return queryset
+
+    def filter_price(self, queryset, name, value):
+        """
+        Фильтрация по диапазону цены, приведенной к выбранной валюте.
+        """
+        return queryset.filter(**{f'{self.get_price_field()}__{self.filters[name].lookup_expr}': value})
+
+    def filter_search(self, queryset, name, value):
+        """
+        Полнотекстовый поиск по заголовку и описанию. Если сортировка не задана явно,
+        результаты упорядочиваются по релевантности (`relevance`).
+        """
+        queryset = SearchService.search(queryset, value, SEARCH_FIELDS, SEARCH_WEIGHTS)
+        if not self.form.cleaned_data.get('ordering'):
+            queryset = queryset.order_by('-relevance', '-id')
+        return queryset
+
+    def filter_ordering(self, queryset, name, value):
+        """
+        Сортировка по дате создания или по цене в выбранной валюте. `id` добавляется для однозначного порядка.
+        Объявления без пересчитанной цены (без валюты) при сортировке по цене не выводятся.
+        """
+        descending = value.startswith('-')
+        field = value.lstrip('-')
+        if field == 'price':
+            field = self.get_price_field()
+            queryset = queryset.filter(**{f'{field}__isnull': False})
+        prefix = '-' if descending else ''
+        return queryset.order_by(f'{prefix}{field}', f'{prefix}id')
+
     class Meta:
         model = ListingModel  # Модель, к которой применяется фильтрация.
-        fields = ['brand', 'model_name', 'body_type', 'min_year', 'max_year', 'region', 'price_min', 'price_max',
-                  'active']  # Поля для фильтрации.
+        fields = ['brand', 'model_name', 'body_type', 'min_year', 'max_year', 'region', 'price_currency',
+                  'price_min', 'price_max', 'active', 'q', 'ordering']  # Поля для фильтрации.
 
@@ -1,47 +1,59 @@
 from django.db import models
 from django.db.transaction import atomic
-from django.contrib.auth import get_user_model
 
-from cars.models import CarModel, Brand, ModelName
-from core.services.managers_notification import ManagerNotificationService
-from currency.models import CurrencyModel
-from core.enums.profanity_enum import ProfanityFilter
+from cars.models import CarModel
+from core.services.car_catalog_service import CarCatalogService
+from core.services.currency_rate_service import CurrencyRateService
+from core.enums.moderation_status_enum import ModerationStatus
+from core.services.moderation_service import ModerationService
 from core.services.errors import ValidationErrors, CustomValidationError
 
 
 class ListingManager(models.Manager):
 
-    @atomic()
     def create_listing(self, validated_data, seller):
+        """
+        Создание объявления: после проверки бренда и модели и выбора автомобиля объявление сохраняется одним
+        INSERT с пересчитанными ценами, неактивным и со статусом модерации PENDING. Описание проверяет
+        задача модерации после фиксации транзакции (`ModerationService`), она же активирует объявление.
+        """
         errors = ValidationErrors()
 
-        # Проверка бренда и модели
+        # Проверка бренда и модели по справочнику в памяти (без запросов к БД)
         brand = validated_data.pop('brand', None)
         model_name = validated_data.pop('model_name', None)
         body_type = validated_data.pop('body_type', None)
 
-        if not Brand.objects.filter(id=brand.id).exists():
+        if brand is None or CarCatalogService.get_brand(brand.id) is None:
             errors.add_error("brand", "Selected brand does not exist.")
-
-        if not ModelName.objects.filter(id=model_name.id, brand=brand).exists():
+        elif model_name is None or not CarCatalogService.model_belongs_to_brand(model_name.id, brand.id):
             errors.add_error("model_name", "Model does not exist under this brand.")
 
         if errors.has_errors():
             raise CustomValidationError("Validation errors: " + str(errors.get_errors()))
 
-        car_model, created = CarModel.objects.get_or_create(
-            brand=brand,
-            model_name=model_name,
-            body_type=body_type
-        )
+        with atomic(using=self.db):
+            car_model, created = CarModel.objects.get_or_create(
+                brand=brand,
+                model_name=model_name,
+                body_type=body_type
+            )
+            listing = self.build_listing(validated_data, seller, car_model)
+            listing.save(force_insert=True, using=self.db)
+            ModerationService.submit(listing.id)
+
+        return listing
 
+    def build_listing(self, validated_data, seller, car_model):
+        """
+        Создает несохраненный объект объявления из проверенных данных.
+        """
+        # Начальный курс берется из снимка курсов, без запроса к таблице валют.
+        # Цены в других валютах пересчитываются по тому же снимку в `ListingModel.save` перед INSERT.
         currency = validated_data.get('currency')
-        current_rate = CurrencyModel.objects.filter(currency_code=currency.currency_code).order_by(
-            '-updated_at').first()
-        initial_currency_rate = current_rate.rate if current_rate else None
+        currency_code = CurrencyRateService.get_currency_code(currency.id) or currency.currency_code
 
-        # Создаем объявление с полем `active=False`
-        listing = self.create(
+        return self.model(
             car=car_model,
             seller=seller,
             year=validated_data.get('year'),
@@ -51,35 +63,8 @@ class ListingManager(models.Manager):
             listing_photo=validated_data.get('listing_photo'),
             price=validated_data.get('price'),
             currency=currency,
-            initial_currency_rate=initial_currency_rate,
+            initial_currency_rate=CurrencyRateService.get_rate(currency_code),
             region=validated_data.get('region'),
-            active=False  # По умолчанию объявление неактивно
+            active=False,  # Объявление активируется после модерации
+            moderation_status=ModerationStatus.PENDING.value
         )
-
-        # Проверяем на наличие ненормативной лексики
-        if ProfanityFilter.is_profane(listing.description):
-            listing.edit_attempts += 1
-            listing.save()
-
-            if listing.edit_attempts >= 3:
-                # Если 3 попытки, то деактивируем объявление и уведомляем менеджера
-                managers = get_user_model().objects.filter(role_id=3)
-                for manager in managers:
-                    ManagerNotificationService.send_profanity_notification(
-                        description=listing.description,
-                        username=seller.username,
-                        manager=manager
-                    )
-                listing.active = False
-                listing.save()
-                raise CustomValidationError("Maximum edit attempts exceeded. The listing has been deactivated.")
-
-            # Ошибка для пользователя, если обнаружен мат
-            raise CustomValidationError("The description contains prohibited words. Please edit and resubmit.")
-
-        # Если все проверки пройдены, делаем объявление активным
-        listing.active = True
-        listing.save()
-
-        return listing
-
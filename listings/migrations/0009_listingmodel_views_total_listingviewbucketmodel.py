@@ -0,0 +1,45 @@
+# Generated by Django 5.1 on 2026-10-18 11:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def move_views_to_total(apps, schema_editor):
+    """
+    Старые счетчики только росли и фактически хранили просмотры за все время: переносим их в `views_total`
+    и обнуляем окна, которые дальше ведутся по дневным корзинам.
+    """
+    ListingModel = apps.get_model('listings', 'ListingModel')
+    ListingModel.objects.update(views_total=F('views_month'), views_day=0, views_week=0, views_month=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0008_alter_listingmodel_region'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listingmodel',
+            name='views_total',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(move_views_to_total, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ListingViewBucketModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('views', models.IntegerField(default=0)),
+                ('counted_in_week', models.BooleanField(default=True)),
+                ('listing', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='view_buckets', to='listings.listingmodel')),
+            ],
+            options={
+                'db_table': 'listing_view_buckets',
+                'indexes': [models.Index(fields=['day', 'counted_in_week'], name='listing_vie_day_5de482_idx')],
+                'unique_together': {('listing', 'day')},
+            },
+        ),
+    ]
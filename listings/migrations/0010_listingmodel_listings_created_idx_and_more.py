@@ -0,0 +1,41 @@
+# Generated by Django 5.1 on 2026-10-18 11:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0002_carmodel_cars_brand_model_body_idx_and_more'),
+        ('currency', '0001_initial'),
+        ('listings', '0009_listingmodel_views_total_listingviewbucketmodel'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['-created_at'], name='listings_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['active', '-created_at'], name='listings_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['region', 'active', '-created_at'], name='listings_region_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['car', 'active', '-created_at'], name='listings_car_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['active', 'year'], name='listings_active_year_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['active', 'price'], name='listings_active_price_idx'),
+        ),
+    ]
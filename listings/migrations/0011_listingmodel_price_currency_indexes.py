@@ -0,0 +1,33 @@
+# Generated by Django 5.1 on 2026-10-18 11:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0002_carmodel_cars_brand_model_body_idx_and_more'),
+        ('currency', '0001_initial'),
+        ('listings', '0010_listingmodel_listings_created_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_active_price_idx',
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['active', 'price_usd'], name='listings_active_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['active', 'price_eur'], name='listings_active_eur_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['active', 'price_uah'], name='listings_active_uah_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1 on 2026-10-18 12:02
+
+from django.db import migrations
+
+FULLTEXT_INDEX_NAME = 'listings_title_description_ft'
+
+
+def create_fulltext_index(apps, schema_editor):
+    """
+    Индекс FULLTEXT по заголовку и описанию для поиска `?q=`. Поддерживается только MySQL,
+    на остальных СУБД поиск работает без индекса (см. `SearchService`).
+    """
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(
+        f'CREATE FULLTEXT INDEX {FULLTEXT_INDEX_NAME} ON listings (title, description)'
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute(f'DROP INDEX {FULLTEXT_INDEX_NAME} ON listings')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0011_listingmodel_price_currency_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1 on 2026-10-18 11:22
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Sum
+
+
+def fill_segment_stats(apps, schema_editor):
+    """
+    Первичное заполнение статистики сегментов по существующим объявлениям.
+    """
+    ListingModel = apps.get_model('listings', 'ListingModel')
+    ListingSegmentStatsModel = apps.get_model('listings', 'ListingSegmentStatsModel')
+    rows = ListingModel.objects.filter(price_usd__isnull=False).values(
+        'region', 'car__brand_id', 'car__model_name_id', 'car__body_type'
+    ).annotate(
+        listings_count=Count('id'),
+        price_usd_sum=Sum('price_usd'),
+        price_usd_min=Min('price_usd'),
+        price_usd_max=Max('price_usd'),
+    ).order_by()
+    ListingSegmentStatsModel.objects.bulk_create([
+        ListingSegmentStatsModel(
+            region=row['region'],
+            brand_id=row['car__brand_id'],
+            model_name_id=row['car__model_name_id'] or 0,
+            body_type=row['car__body_type'],
+            listings_count=row['listings_count'],
+            price_usd_sum=row['price_usd_sum'],
+            price_usd_min=row['price_usd_min'],
+            price_usd_max=row['price_usd_max'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0012_listingmodel_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingSegmentStatsModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('region', models.CharField(choices=[(1, 'CRIMEA'), (2, 'VINNYTSIA'), (3, 'VOLYN'), (4, 'DNIPRO'), (5, 'DONETSK'), (6, 'IVANO-FRANKIVSK'), (7, 'KHERSON'), (8, 'KHMELNYTSKYI'), (9, 'KYIV'), (10, 'KIROVOHRAD'), (11, 'LUHANSK'), (12, 'LVIV'), (13, 'MYKOLAIV'), (14, 'ODESA'), (15, 'POLTAVA'), (16, 'RIVNE'), (17, 'SUMY'), (18, 'TERNOPIL'), (19, 'KHARKIV'), (20, 'ZAPORIZHZHIA'), (21, 'ZHYTOMYR'), (22, 'CHERKASY'), (23, 'CHERNIVTSI'), (24, 'CHERNIHIV')], max_length=50)),
+                ('brand_id', models.PositiveIntegerField()),
+                ('model_name_id', models.PositiveIntegerField(default=0)),
+                ('body_type', models.CharField(choices=[('sedan', 'Sedan'), ('hatchback', 'Hatchback'), ('suv', 'SUV'), ('wagon', 'Wagon'), ('coupe', 'Coupe'), ('convertible', 'Convertible'), ('minivan', 'Minivan'), ('pickup', 'Pickup')], max_length=50)),
+                ('listings_count', models.IntegerField(default=0)),
+                ('price_usd_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('price_usd_min', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('price_usd_max', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+            ],
+            options={
+                'db_table': 'listing_segment_stats',
+                'indexes': [models.Index(fields=['brand_id', 'model_name_id', 'body_type'], name='segment_stats_car_idx')],
+                'unique_together': {('region', 'brand_id', 'model_name_id', 'body_type')},
+            },
+        ),
+        migrations.RunPython(fill_segment_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.1 on 2026-10-18 11:23
+
+from django.db import migrations, models
+
+from core.services.quantile_sketch import QuantileSketch
+
+
+def fill_price_sketches(apps, schema_editor):
+    """
+    Заполняет скетчи квантилей существующих сегментов по ценам объявлений.
+    """
+    ListingModel = apps.get_model('listings', 'ListingModel')
+    ListingSegmentStatsModel = apps.get_model('listings', 'ListingSegmentStatsModel')
+    sketches = {}
+    rows = ListingModel.objects.filter(price_usd__isnull=False).values_list(
+        'region', 'car__brand_id', 'car__model_name_id', 'car__body_type', 'price_usd'
+    ).order_by()
+    for region, brand_id, model_name_id, body_type, price_usd in rows.iterator(chunk_size=1000):
+        sketches.setdefault((region, brand_id, model_name_id or 0, body_type), QuantileSketch()).add(price_usd)
+
+    for (region, brand_id, model_name_id, body_type), sketch in sketches.items():
+        ListingSegmentStatsModel.objects.filter(
+            region=region, brand_id=brand_id, model_name_id=model_name_id, body_type=body_type
+        ).update(price_usd_sketch=sketch.to_bytes())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0013_listingsegmentstatsmodel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listingsegmentstatsmodel',
+            name='price_usd_sketch',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(fill_price_sketches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0014_listingsegmentstatsmodel_price_usd_sketch'),
+    ]
+
+    operations = [
+        # Существующие объявления уже прошли проверку при создании, поэтому получают статус approved;
+        # новые объявления по умолчанию ожидают модерации.
+        migrations.AddField(
+            model_name='listingmodel',
+            name='moderation_status',
+            field=models.CharField(
+                choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')],
+                default='approved', max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name='listingmodel',
+            name='moderation_status',
+            field=models.CharField(
+                choices=[('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')],
+                default='pending', max_length=20,
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('listings', '0015_listingmodel_moderation_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='listingmodel',
+            name='listing_photo_variants',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
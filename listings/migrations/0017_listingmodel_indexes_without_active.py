@@ -0,0 +1,45 @@
+# Generated by Django 5.1 on 2026-10-18 12:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0002_carmodel_cars_brand_model_body_idx_and_more'),
+        ('currency', '0001_initial'),
+        ('listings', '0016_listingmodel_listing_photo_variants'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_active_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_region_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_car_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_active_year_idx',
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['region', '-created_at'], name='listings_region_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['car', '-created_at'], name='listings_car_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['year'], name='listings_year_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1 on 2026-10-18 12:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cars', '0002_carmodel_cars_brand_model_body_idx_and_more'),
+        ('currency', '0001_initial'),
+        ('listings', '0017_listingmodel_indexes_without_active'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_active_usd_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_active_eur_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='listingmodel',
+            name='listings_active_uah_idx',
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['price_usd', 'id'], name='listings_price_usd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['price_eur', 'id'], name='listings_price_eur_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='listingmodel',
+            index=models.Index(fields=['price_uah', 'id'], name='listings_price_uah_idx'),
+        ),
+    ]
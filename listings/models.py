@@ -1,13 +1,15 @@
-from django.db import models
+from django.db import models, transaction
 from core.models import BaseModel
 from cars.models import CarModel
 from django.core import validators
-from decimal import Decimal
 
 from .manager import ListingManager
 from currency.models import CurrencyModel
 from core.enums.country_region_enum import Region
+from core.enums.moderation_status_enum import ModerationStatus
 from core.services.upload_photos import upload_photo_listing
+from core.services.view_counter_service import ViewCounterService
+from core.services.currency_rate_service import CurrencyRateService
 
 
 class ListingModel(BaseModel):
@@ -25,11 +27,17 @@ class ListingModel(BaseModel):
         null=True,
         validators=[validators.FileExtensionValidator(['jpeg', 'jpg', 'png'])]  # Валидация расширений файлов.
     )
+    # Уменьшенные копии фотографии и заглушка (заполняются задачей `generate_image_derivatives`).
+    listing_photo_variants = models.JSONField(null=True, blank=True, editable=False)
     active = models.BooleanField(default=False)  # Статус объявления (активно/неактивно).
     views_day = models.IntegerField(default=0)  # Количество просмотров за день.
     views_week = models.IntegerField(default=0)  # Количество просмотров за неделю.
     views_month = models.IntegerField(default=0)  # Количество просмотров за месяц.
+    views_total = models.IntegerField(default=0)  # Общее количество просмотров за все время.
     edit_attempts = models.IntegerField(default=0)  # Количество попыток редактирования объявления.
+    moderation_status = models.CharField(
+        max_length=20, choices=ModerationStatus.choices(), default=ModerationStatus.PENDING.value
+    )  # Статус модерации описания (см. `ModerationService`).
     price = models.DecimalField(max_digits=10, decimal_places=2)  # Цена товара.
     currency = models.ForeignKey(CurrencyModel, on_delete=models.SET_NULL, null=True, related_name='listings')  # Валюта, в которой указана цена.
     price_usd = models.DecimalField(max_digits=10, decimal_places=2, null=True, editable=False)  # Цена в USD.
@@ -45,39 +53,88 @@ class ListingModel(BaseModel):
     def save(self, *args, **kwargs):
         """
         Переопределение метода `save` для пересчета цены в других валютах на основе текущих курсов валют.
+        Курсы берутся из общего снимка `CurrencyRateService`, без запроса к таблице валют.
         """
-        # Получаем актуальные курсы валют.
-        rates = CurrencyModel.objects.all().values('currency_code', 'rate')
-        rates_dict = {rate['currency_code']: Decimal(rate['rate']) for rate in rates}
-
-        # Базовый курс валюты для расчета.
-        base_rate = rates_dict.get(self.currency.currency_code, Decimal('1'))
+        # Код валюты берем из снимка по ID, чтобы не загружать связанную запись валюты.
+        currency_code = CurrencyRateService.get_currency_code(self.currency_id) or self.currency.currency_code
 
         # Пересчет цены в доллары, евро и гривны.
-        if base_rate != Decimal('0'):
-            self.price_usd = (self.price / base_rate) * rates_dict.get('USD', Decimal('1'))
-            self.price_eur = (self.price / base_rate) * rates_dict.get('EUR', Decimal('1'))
-            self.price_uah = (self.price / base_rate) * rates_dict.get('UAH', Decimal('1'))
-        else:
-            # Если курс валюты нулевой, устанавливаем нулевые значения для цены в других валютах.
-            self.price_usd = Decimal('0')
-            self.price_eur = Decimal('0')
-            self.price_uah = Decimal('0')
-
-        # Сохраняем объект.
-        super().save(*args, **kwargs)
+        converted = CurrencyRateService.convert_price(self.price, currency_code)
+        self.price_usd = converted['USD']
+        self.price_eur = converted['EUR']
+        self.price_uah = converted['UAH']
+
+        # Сохраняем объект. Объявление и статистика сегментов (сигнал `post_save`) фиксируются одной транзакцией,
+        # чтобы перестроение статистики не учло объявление дважды.
+        with transaction.atomic(savepoint=False):
+            super().save(*args, **kwargs)
 
     class Meta:
         db_table = 'listings'  # Имя таблицы в базе данных.
+        # Индексы под частые комбинации фильтров `ListingFilter` с сортировкой по дате создания.
+        # Публичный список фильтрует по `active` только по запросу клиента, поэтому `active` не ведет ни один индекс:
+        # условие `active = true` проверяется по строкам, найденным индексом.
+        indexes = [
+            models.Index(fields=['-created_at'], name='listings_created_idx'),
+            models.Index(fields=['region', '-created_at'], name='listings_region_created_idx'),
+            models.Index(fields=['car', '-created_at'], name='listings_car_created_idx'),
+            models.Index(fields=['year'], name='listings_year_idx'),
+            # Сортировка по цене (`ordering=price`) идет по `price_<валюта>, id`, диапазон цены - по `price_<валюта>`.
+            models.Index(fields=['price_usd', 'id'], name='listings_price_usd_idx'),
+            models.Index(fields=['price_eur', 'id'], name='listings_price_eur_idx'),
+            models.Index(fields=['price_uah', 'id'], name='listings_price_uah_idx'),
+        ]
 
     def increment_views(self):
         """
-        Увеличивает количество просмотров для объявления на день, неделю и месяц.
+        Регистрирует просмотр объявления. Счетчики на день, неделю и месяц обновляются не сразу:
+        просмотр копится в буфере и записывается в БД пачкой задачей `flush_listing_views`.
         """
-        self.views_day += 1
-        self.views_week += 1
-        self.views_month += 1
-        # Обновляем только поля количества просмотров.
-        self.save(update_fields=['views_day', 'views_week', 'views_month'])
+        ViewCounterService.record_view(self.pk)
+
+
+class ListingViewBucketModel(models.Model):
+    """
+    Дневная корзина просмотров объявления. Хранит просмотры за один день и используется для инкрементального
+    пересчета окон `views_day`, `views_week` и `views_month` при ежедневной ротации (корзины старше месяца удаляются).
+    Не наследуется от BaseModel, чтобы таблица оставалась компактной.
+    """
+
+    listing = models.ForeignKey(ListingModel, on_delete=models.CASCADE, related_name='view_buckets')  # Объявление.
+    day = models.DateField()  # День, за который накоплены просмотры.
+    views = models.IntegerField(default=0)  # Количество просмотров за день.
+    counted_in_week = models.BooleanField(default=True)  # Учитываются ли просмотры корзины в `views_week`.
+
+    class Meta:
+        db_table = 'listing_view_buckets'  # Имя таблицы в базе данных.
+        unique_together = ('listing', 'day')  # Одна корзина на объявление за день.
+        indexes = [models.Index(fields=['day', 'counted_in_week'])]  # Поиск устаревших корзин при ротации.
+
+
+
 
+class ListingSegmentStatsModel(models.Model):
+    """
+    Материализованная статистика цен объявлений по сегменту регион × бренд × модель × тип кузова.
+    Хранит количество, сумму, минимум и максимум цен в USD и поддерживается инкрементально
+    при создании, изменении и удалении объявлений (см. `SegmentStatsService`).
+    Ключи сегмента хранятся числами, а не внешними ключами: модель автомобиля может быть не указана (0),
+    и уникальность сегмента должна соблюдаться и в этом случае.
+    """
 
+    region = models.CharField(max_length=50, choices=Region.choices())  # Регион объявлений.
+    brand_id = models.PositiveIntegerField()  # ID бренда автомобиля.
+    model_name_id = models.PositiveIntegerField(default=0)  # ID модели автомобиля (0 - модель не указана).
+    body_type = models.CharField(max_length=50, choices=CarModel.BODY_TYPES)  # Тип кузова.
+    listings_count = models.IntegerField(default=0)  # Количество объявлений с ценой в сегменте.
+    price_usd_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)  # Сумма цен в USD.
+    price_usd_min = models.DecimalField(max_digits=10, decimal_places=2, null=True)  # Минимальная цена в USD.
+    price_usd_max = models.DecimalField(max_digits=10, decimal_places=2, null=True)  # Максимальная цена в USD.
+    price_usd_sketch = models.BinaryField(default=b'')  # Скетч квантилей цен в USD (`QuantileSketch`).
+
+    class Meta:
+        db_table = 'listing_segment_stats'  # Имя таблицы в базе данных.
+        unique_together = ('region', 'brand_id', 'model_name_id', 'body_type')  # Одна строка на сегмент.
+        indexes = [
+            models.Index(fields=['brand_id', 'model_name_id', 'body_type'], name='segment_stats_car_idx'),
+        ]  # Статистика по стране для выбранных бренда, модели и кузова.
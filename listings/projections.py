@@ -0,0 +1,50 @@
+from core.projection import Projection, file_url, image_variants
+from .models import ListingModel
+
+LISTING_LIST_PROJECTION = Projection({
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'listing_photo': ('listing_photo', file_url(ListingModel._meta.get_field('listing_photo'))),
+    'listing_photo_variants': (
+        'listing_photo_variants', image_variants(ListingModel._meta.get_field('listing_photo'))
+    ),
+    'active': 'active',
+    'car': {
+        'id': 'car_id',
+        'brand': 'car__brand_id',
+        'model_name': 'car__model_name_id',
+        'body_type': 'car__body_type',
+    },
+})
+"""
+Проекция краткого списка объявлений: тот же ответ, что у `ListingListSerializer` с вложенным `CarSerializer`,
+но из одного запроса `values()`.
+"""
+
+LISTING_EXPORT_PROJECTION = Projection({
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'brand_id': 'car__brand_id',
+    'brand': 'car__brand__name',
+    'model_name_id': 'car__model_name_id',
+    'model_name': 'car__model_name__name',
+    'body_type': 'car__body_type',
+    'year': 'year',
+    'engine': 'engine',
+    'price': 'price',
+    'currency': 'currency__currency_code',
+    'price_usd': 'price_usd',
+    'price_eur': 'price_eur',
+    'price_uah': 'price_uah',
+    'region': 'region',
+    'active': 'active',
+    'seller_id': 'seller_id',
+    'listing_photo': ('listing_photo', file_url(ListingModel._meta.get_field('listing_photo'))),
+    'created_at': 'created_at',
+})
+"""
+Плоская проекция выгрузки объявлений (колонки CSV): данные автомобиля, бренда, модели и валюты
+выбираются тем же запросом через соединения таблиц.
+"""
@@ -1,19 +1,25 @@
+from decimal import Decimal
+
+from django.conf import settings
 from rest_framework import serializers
 from django.core.exceptions import ValidationError
 from rest_framework.response import Response
 from .models import ListingModel
 from cars.models import CarModel
 from users.models import UserModel
-from core.enums.profanity_enum import ProfanityFilter
+from core.enums.moderation_status_enum import ModerationStatus
+from core.services.moderation_service import ModerationService
 from core.services.email_service import EmailService
-from core.services.managers_notification import ManagerNotificationService
+from core.services.image_derivative_service import ImageDerivativeService
 from currency.models import CurrencyModel
+from core.services.currency_rate_service import CurrencyRateService
 from cars.serializers import CarSerializer
 from cars.models import Brand, ModelName
+from cars.fields import CatalogPrimaryKeyRelatedField
+from core.services.car_catalog_service import CarCatalogService
 from core.enums.country_region_enum import Region
 from core.services.errors import CustomValidationError, ValidationErrors
 from rest_framework import status
-from django.contrib.auth import get_user_model
 
 
 class ListingPhotoSerializer(serializers.ModelSerializer):
@@ -34,8 +40,12 @@ class ListingPhotoSerializer(serializers.ModelSerializer):
         return photo
 
 class ListingCreateSerializer(serializers.ModelSerializer):
-    brand = serializers.PrimaryKeyRelatedField(queryset=Brand.objects.all(), write_only=True)
-    model_name = serializers.PrimaryKeyRelatedField(queryset=ModelName.objects.all(), write_only=True)
+    brand = CatalogPrimaryKeyRelatedField(
+        lookup=CarCatalogService.get_brand, queryset=Brand.objects.all(), write_only=True
+    )
+    model_name = CatalogPrimaryKeyRelatedField(
+        lookup=CarCatalogService.get_model, queryset=ModelName.objects.all(), write_only=True
+    )
     body_type = serializers.ChoiceField(choices=CarModel.BODY_TYPES, write_only=True)
     currency = serializers.PrimaryKeyRelatedField(queryset=CurrencyModel.objects.all())
     region = serializers.ChoiceField(choices=[(region.value, region.value) for region in Region])
@@ -45,23 +55,18 @@ class ListingCreateSerializer(serializers.ModelSerializer):
         model = ListingModel
         fields = (
             'brand', 'model_name', 'body_type', 'year', 'engine', 'title', 'description', 'listing_photo', 'price',
-            'currency', 'region', 'initial_currency_rate', 'active'
+            'currency', 'region', 'initial_currency_rate', 'active', 'moderation_status'
         )
+        read_only_fields = ('moderation_status',)
 
     def create(self, validated_data):
         request = self.context.get('request')
         seller = request.user
 
         try:
-            # Создаем объявление через менеджер
+            # Создаем объявление через менеджер (фотография сохраняется тем же INSERT)
             listing = ListingModel.objects.create_listing(validated_data, seller)
 
-            # Обновляем фотографию, если она есть
-            listing_photo = validated_data.get('listing_photo', None)
-            if listing_photo:
-                listing.listing_photo = listing_photo
-                listing.save()
-
         except CustomValidationError as e:
             # Возвращаем ошибки, но не выбрасываем стандартную DRF ValidationError
             raise serializers.ValidationError({"errors": e.message})
@@ -70,6 +75,32 @@ class ListingCreateSerializer(serializers.ModelSerializer):
 
 
 
+class ListingImportRowSerializer(serializers.Serializer):
+    """
+    Проверка одной строки массового импорта объявлений. Бренд, модель и валюта задаются ID или названием (кодом)
+    и сопоставляются со справочниками в `ListingImportService`.
+    """
+    brand = serializers.CharField(max_length=50)
+    model_name = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    body_type = serializers.ChoiceField(choices=CarModel.BODY_TYPES)
+    year = serializers.IntegerField(min_value=1885, max_value=2100)
+    engine = serializers.CharField(max_length=255)
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'))
+    currency = serializers.CharField(max_length=10)
+    region = serializers.ChoiceField(choices=[(region.value, region.value) for region in Region])
+
+
+class ListingImportSerializer(serializers.Serializer):
+    """
+    Загрузка файла для массового импорта объявлений (CSV или JSONL).
+    Формат определяется по расширению файла, если не указан явно.
+    """
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=[('csv', 'CSV'), ('jsonl', 'JSONL')], required=False)
+
+
 class ListingDetailSerializer(serializers.ModelSerializer):
     """
     Сериализатор для детального просмотра объявления. Включает дополнительные поля для бренда, модели и курса валют.
@@ -88,15 +119,15 @@ class ListingDetailSerializer(serializers.ModelSerializer):
 
     def get_brand(self, obj):
         """
-        Получение ID бренда автомобиля.
+        Получение ID бренда автомобиля (без загрузки записи бренда).
         """
-        return obj.car.brand.id
+        return obj.car.brand_id
 
     def get_model_name(self, obj):
         """
-        Получение ID модели автомобиля.
+        Получение ID модели автомобиля (без загрузки записи модели).
         """
-        return obj.car.model_name.id
+        return obj.car.model_name_id
 
     def get_body_type(self, obj):
         """
@@ -108,44 +139,29 @@ class ListingDetailSerializer(serializers.ModelSerializer):
         """
         Получение текущего курса валюты для объявления.
         """
-        current_rate = CurrencyModel.objects.filter(currency_code=obj.currency.currency_code).order_by('-updated_at').first()
-        if current_rate:
-            return current_rate.rate
-        return None
+        currency_code = CurrencyRateService.get_currency_code(obj.currency_id)
+        if currency_code is None and obj.currency:
+            currency_code = obj.currency.currency_code
+        return CurrencyRateService.get_rate(currency_code)
 
 
 class ListingUpdateSerializer(serializers.ModelSerializer):
     """
-    Сериализатор для обновления объявления. Включает валидацию описания и обновление активного статуса.
+    Сериализатор для обновления объявления. Измененное описание отправляется на асинхронную модерацию:
+    до ее завершения объявление неактивно и имеет статус PENDING.
     """
     class Meta:
         model = ListingModel
-        fields = ['title', 'description', 'price', 'currency', 'listing_photo']
+        fields = ['title', 'description', 'price', 'currency', 'listing_photo', 'moderation_status']
+        read_only_fields = ['moderation_status']
 
     def validate_description(self, value):
         """
-        Валидация описания на наличие ненормативной лексики.
+        Объявление, описание которого отклонено модерацией максимальное число раз, ждет проверки менеджером.
         """
         instance = self.instance
-        if ProfanityFilter.is_profane(value):
-            instance.edit_attempts += 1
-            instance.save()
-            if instance.edit_attempts >= 3:
-                # Деактивируем объявление после 3 неудачных попыток редактирования.
-                instance.active = False
-                instance.save()
-
-                # Отправляем уведомления менеджерам о нарушении.
-                seller = instance.seller
-                managers = get_user_model().objects.filter(role_id=3)
-                for manager in managers:
-                    ManagerNotificationService.send_profanity_notification(
-                        description=value,
-                        username=seller.username,
-                        manager=manager
-                    )
-                raise serializers.ValidationError("Maximum edit attempts exceeded. The listing has been deactivated.")
-            raise serializers.ValidationError("The description contains prohibited words.")
+        if instance is not None and instance.edit_attempts >= settings.MODERATION_MAX_EDIT_ATTEMPTS:
+            raise serializers.ValidationError("Maximum edit attempts exceeded. The listing has been deactivated.")
         return value
 
     def update(self, instance, validated_data):
@@ -154,12 +170,22 @@ class ListingUpdateSerializer(serializers.ModelSerializer):
             if 'listing_photo' in validated_data:
                 instance.listing_photo = validated_data.get('listing_photo', instance.listing_photo)
 
+            # Новое описание проверяется задачей модерации, объявление неактивно до ее завершения
+            description = validated_data.get('description', instance.description)
+            moderate = description != instance.description
+            if moderate:
+                instance.moderation_status = ModerationStatus.PENDING.value
+                instance.active = False
+
             # Обновляем остальные поля
             instance.title = validated_data.get('title', instance.title)
-            instance.description = validated_data.get('description', instance.description)
+            instance.description = description
             instance.price = validated_data.get('price', instance.price)
             instance.currency = validated_data.get('currency', instance.currency)
             instance.save()
+
+            if moderate:
+                ModerationService.submit(instance.id)
             return instance
 
 
@@ -175,12 +201,39 @@ class PremiumStatsSerializer(serializers.Serializer):
     average_price_by_country = serializers.FloatField(allow_null=True)
 
 
+class PriceQuantilesQuerySerializer(serializers.Serializer):
+    """
+    Параметры запроса квантилей цены: любая комбинация региона, бренда, модели и типа кузова.
+    """
+    region = serializers.ChoiceField(choices=[(region.value, region.value) for region in Region], required=False)
+    brand = serializers.IntegerField(min_value=1, required=False)
+    model_name = serializers.IntegerField(min_value=1, required=False)
+    body_type = serializers.ChoiceField(choices=CarModel.BODY_TYPES, required=False)
+
+
+class PriceQuantilesSerializer(serializers.Serializer):
+    """
+    Сериализатор для отображения ценового диапазона (квантилей цены в USD) по сегменту.
+    """
+    listings_count = serializers.IntegerField()
+    p25 = serializers.FloatField(allow_null=True)
+    p50 = serializers.FloatField(allow_null=True)
+    p75 = serializers.FloatField(allow_null=True)
+    p90 = serializers.FloatField(allow_null=True)
+
+
 class ListingListSerializer(serializers.ModelSerializer):
     """
     Сериализатор для краткого списка объявлений. Включает информацию о машине и статусе объявления.
     """
     car = CarSerializer(read_only=True)
+    listing_photo_variants = serializers.SerializerMethodField()  # URL уменьшенных копий фотографии и заглушка.
 
     class Meta:
         model = ListingModel
-        fields = ['id', 'title', 'description', 'listing_photo', 'active', 'car']
+        fields = ['id', 'title', 'description', 'listing_photo', 'listing_photo_variants', 'active', 'car']
+
+    def get_listing_photo_variants(self, obj):
+        return ImageDerivativeService.get_urls(
+            obj.listing_photo_variants, obj.listing_photo.storage, self.context.get('request')
+        )
@@ -0,0 +1,98 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from cars.models import CarModel
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.image_derivative_service import ImageDerivativeService
+from core.services.outbox_service import OutboxService
+from core.services.segment_stats_service import SegmentStatsService, rebuild_segment_stats
+from .models import ListingModel
+
+
+@receiver(post_save, sender=ListingModel)
+@receiver(post_delete, sender=ListingModel)
+@receiver(post_save, sender=CarModel)
+@receiver(post_delete, sender=CarModel)
+def bump_listings_generation(sender, **kwargs):
+    """
+    Изменение объявления или автомобиля делает недействительными закешированные фасеты и ответы по объявлениям.
+    Поколение увеличивается после фиксации транзакции, чтобы параллельный запрос не закешировал прежний список
+    под новым поколением.
+    """
+    transaction.on_commit(lambda: CacheGenerationService.bump(CacheGenerationService.LISTINGS))
+
+
+@receiver(post_init, sender=ListingModel)
+def remember_segment_state(sender, instance, **kwargs):
+    """
+    Запоминает состояние загруженного объявления, чтобы при сохранении перенести его цену между сегментами.
+    """
+    if instance.pk is not None:
+        instance._segment_state = SegmentStatsService.get_state(instance)
+
+
+@receiver(post_save, sender=ListingModel)
+def update_segment_stats(sender, instance, created, **kwargs):
+    """
+    Инкрементально обновляет статистику сегментов после создания или изменения объявления.
+    """
+    current = SegmentStatsService.get_state(instance)
+    previous = None if created else getattr(instance, '_segment_state', None)
+    if not created and previous is None:
+        # Прежнее состояние неизвестно (объявление не загружалось из БД): статистика сверяется перестроением.
+        OutboxService.enqueue(rebuild_segment_stats)
+    else:
+        # Загруженный автомобиль объявления избавляет от запроса ключа сегмента.
+        car = ListingModel.car.field.get_cached_value(instance, default=None)
+        SegmentStatsService.apply_change(previous, current, car)
+    instance._segment_state = current
+
+
+@receiver(post_delete, sender=ListingModel)
+def remove_segment_stats(sender, instance, **kwargs):
+    """
+    Убирает цену удаленного объявления из статистики сегмента.
+    """
+    SegmentStatsService.apply_change(getattr(instance, '_segment_state', None), None)
+
+
+@receiver(post_save, sender=CarModel)
+def rebuild_segment_stats_on_car_change(sender, instance, created, **kwargs):
+    """
+    Изменение бренда, модели или кузова автомобиля переносит все его объявления в другой сегмент.
+    """
+    if not created:
+        OutboxService.enqueue(rebuild_segment_stats)
+
+
+@receiver(post_init, sender=ListingModel)
+def remember_listing_photo(sender, instance, **kwargs):
+    """
+    Запоминает файл фотографии объявления, чтобы при сохранении понять, заменен ли он.
+    """
+    ImageDerivativeService.track(instance, 'listing_photo')
+
+
+@receiver(pre_save, sender=ListingModel)
+def reset_listing_photo_variants(sender, instance, **kwargs):
+    """
+    Сбрасывает уменьшенные копии замененного файла фотографии объявления.
+    """
+    ImageDerivativeService.reset_variants(instance, 'listing_photo')
+
+
+@receiver(post_save, sender=ListingModel)
+def schedule_listing_photo_derivatives(sender, instance, **kwargs):
+    """
+    Ставит создание уменьшенных копий нового файла фотографии объявления (и удаление копий прежнего).
+    """
+    ImageDerivativeService.schedule(instance, 'listing_photo')
+
+
+@receiver(post_delete, sender=ListingModel)
+def delete_listing_photo_derivatives(sender, instance, **kwargs):
+    """
+    Ставит удаление уменьшенных копий фотографии объявления удаленной записи.
+    """
+    ImageDerivativeService.schedule_delete(instance, 'listing_photo')
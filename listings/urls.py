@@ -5,21 +5,26 @@ from django.conf import settings
 from .views import ListingCreateView, PremiumStatsView, ListingUpdateView, \
     ListingDeleteView, ListingListView, ListingAddPhotoAPIView,\
     RegionsAPIView, UserListingsView, ListingRetrieveView, ListingRetrieveDetailView, \
-    BrandRequestView
+    BrandRequestView, ListingFacetsView, ListingPriceQuantilesView, ListingImportView, \
+    ListingExportView
 
 
 
 urlpatterns = [
     path('create/', ListingCreateView.as_view(), name='listing-create'),  # Создание нового объявления
+    path('import/', ListingImportView.as_view(), name='listing-import'),  # Массовый импорт объявлений из CSV/JSONL
+    path('export/', ListingExportView.as_view(), name='listing-export'),  # Потоковая выгрузка объявлений в CSV/JSONL
     path('regions/', RegionsAPIView.as_view(), name='regions_enum'),  # Получение списка регионов
     path('user/', UserListingsView.as_view(), name='user-listings'),  # Список объявлений текущего пользователя
     path('update/<int:pk>/', ListingUpdateView.as_view(), name='listing_update'),  # Обновление объявления
     path('photo/<int:listing_id>/', ListingAddPhotoAPIView.as_view(), name='add__listing_photo'),  # Добавление фото к объявлению
     path('list/', ListingListView.as_view(), name='listing_list'),  # Список всех объявлений
+    path('facets/', ListingFacetsView.as_view(), name='listing_facets'),  # Фасетные счетчики для панели фильтров
     path('details/<int:pk>/', ListingRetrieveView.as_view(), name='listing-detail'),  # Детали объявления
     path('cardetails/<int:pk>/', ListingRetrieveDetailView.as_view(), name='listing-detail'),  # Детализированные данные объявления
     path('delete/<int:pk>/', ListingDeleteView.as_view(), name='listing-delete'),  # Удаление объявления
     path('premium/<int:listing_id>/stats/', PremiumStatsView.as_view(), name='premium_stats'),  # Статистика по премиум объявлениям
+    path('price-quantiles/', ListingPriceQuantilesView.as_view(), name='listing_price_quantiles'),  # Ценовой диапазон по сегменту
     path('brands/request/', BrandRequestView.as_view(), name='brand-request'),  # Запрос на добавление нового бренда
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
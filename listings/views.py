@@ -3,22 +3,34 @@ from rest_framework.generics import UpdateAPIView, CreateAPIView,\
     ListAPIView, DestroyAPIView, RetrieveAPIView, RetrieveUpdateAPIView, get_object_or_404
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 import django_filters
 from django.db.models import Avg
-from django.db.models import F, ExpressionWrapper, DecimalField
+from django.http import StreamingHttpResponse
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 
 from core.services.managers_notification import ManagerNotificationService
+from core.services.facet_service import ListingFacetService
+from core.services.segment_stats_service import SegmentStatsService
+from core.services.listing_import_service import ListingImportService
+from core.services.listing_export_service import ListingExportService
 from cars.filters import CarFilter
 from cars.models import CarModel
-from core.pagination import PagePagination
+from core.pagination import KeysetPagination, CachedCount
+from core.projection import ProjectionListMixin
+from core.response_cache import ResponseCacheMixin
+from core.conditional import ConditionalGetMixin, make_etag
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.currency_rate_service import CurrencyRateService
 from core.enums.country_region_enum import Region
 from core.permissions import IsSeller,  IsPremiumSeller, IsManager, IsSellerOrManagerAndOwner
 from .serializers import ListingPhotoSerializer, ListingCreateSerializer,\
-    ListingUpdateSerializer, PremiumStatsSerializer, ListingListSerializer, ListingDetailSerializer
+    ListingUpdateSerializer, PremiumStatsSerializer, ListingListSerializer, ListingDetailSerializer, \
+    PriceQuantilesQuerySerializer, PriceQuantilesSerializer, ListingImportSerializer
 from .models import ListingModel
+from .projections import LISTING_LIST_PROJECTION
 from .filters import ListingFilter
 from core.services.errors import CustomValidationError, ValidationErrors
 
@@ -58,6 +70,29 @@ class ListingCreateView(CreateAPIView):
     parser_classes = (MultiPartParser, FormParser)
 
 
+class ListingImportView(APIView):
+    """
+    Массовый импорт объявлений продавца из файла CSV или JSONL (см. `ListingImportService`).
+    Возвращает количество созданных объявлений и ошибки по номерам строк.
+    """
+    permission_classes = [IsSeller]
+    parser_classes = (MultiPartParser, FormParser)
+
+    def post(self, request, *args, **kwargs):
+        serializer = ListingImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        uploaded_file = serializer.validated_data['file']
+
+        file_format = ListingImportService.get_format(uploaded_file.name, serializer.validated_data.get('format'))
+        if file_format is None:
+            return Response({"format": ["Unsupported file format. Use CSV or JSONL."]}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = ListingImportService(request.user).import_stream(
+            ListingImportService.open_upload(uploaded_file), file_format
+        )
+        return Response(report, status=status.HTTP_200_OK)
+
+
 
 
 class ListingUpdateView(UpdateAPIView):
@@ -97,17 +132,42 @@ class ListingDeleteView(DestroyAPIView):
         return obj
 
 
-class ListingListView(ListAPIView):
+class ListingListView(ConditionalGetMixin, ResponseCacheMixin, ProjectionListMixin, ListAPIView):
     """
     Список всех объявлений с возможностью фильтрации.
+    Ответы кешируются по набору фильтров, курсору и сортировке до следующего изменения объявлений.
     """
     permission_classes = [AllowAny]
-    pagination_class = PagePagination
+    pagination_class = KeysetPagination
+    # Поля сортировки, поддерживаемые в режиме курсора (`?cursor=`).
+    cursor_ordering_fields = ('created_at', 'price_usd', 'price_eur', 'price_uah', 'relevance')
+    count_strategy = CachedCount(timeout=60)  # Общее количество кешируется на минуту для каждого набора фильтров.
     queryset = ListingModel.objects.select_related('car').order_by('-created_at')
     serializer_class = ListingListSerializer
+    projection = LISTING_LIST_PROJECTION  # Ответ списка строится одним запросом `values()` без сериализатора.
     filter_backends = [django_filters.rest_framework.DjangoFilterBackend]
     filterset_class = ListingFilter
 
+    def get_validators(self, request, *args, **kwargs):
+        """
+        ETag списка - версия закешированного ответа: поколение объявлений и нормализованные параметры запроса.
+        """
+        generation = CacheGenerationService.get(CacheGenerationService.LISTINGS)
+        if generation is None:
+            return None, None
+        return make_etag(self.get_response_cache_key(request, generation)), None
+
+
+class ListingFacetsView(APIView):
+    """
+    Фасетные счетчики для панели фильтров: количество объявлений по бренду, модели, типу кузова, региону
+    и диапазону годов для текущего набора фильтров `ListingFilter` (одним запросом вместо запроса на каждое значение).
+    """
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response(ListingFacetService.get_facets(request.query_params))
+
 
 class PremiumStatsView(RetrieveAPIView):
     """
@@ -120,33 +180,35 @@ class PremiumStatsView(RetrieveAPIView):
               Возвращает просмотры объявления и средние цены по региону и стране.
               """
         listing_id = kwargs.get('listing_id')
-        listing = ListingModel.objects.filter(id=listing_id).select_related('car', 'currency').first()
+        listing = ListingModel.objects.filter(id=listing_id).first()
         if not listing:
             return Response({'error': 'Listing not found'}, status=404)
 
         car_filter = CarFilter(request.GET, queryset=CarModel.objects.all())
-        cars = car_filter.qs
-
-        # Рассчитываем среднюю цену по региону
-        listings = ListingModel.objects.filter(car__in=cars, region=listing.region).annotate(
-            price_in_usd=ExpressionWrapper(
-                F('price') / F('currency__rate'),
-                output_field=DecimalField(max_digits=10, decimal_places=2)
-            )
-        )
-        region_avg_price = listings.aggregate(Avg('price_in_usd'))['price_in_usd__avg']
-
-        # Рассчитываем среднюю цену по стране
-        country_avg_price = ListingModel.objects.filter(car__in=cars).annotate(
-            price_in_usd=ExpressionWrapper(
-                F('price') / F('currency__rate'),
-                output_field=DecimalField(max_digits=10, decimal_places=2)
+        car_filter.is_valid()  # Некорректные фильтры игнорируются, как и раньше.
+        filters = car_filter.form.cleaned_data
+
+        if filters.get('engine'):
+            # Двигатель хранится в объявлении и не входит в ключ сегмента: считаем по объявлениям,
+            # но уже по готовой цене в USD.
+            listings = ListingModel.objects.filter(engine__icontains=filters['engine'], price_usd__isnull=False)
+            for name in ('brand', 'model_name', 'body_type'):
+                if filters.get(name):
+                    listings = listings.filter(**{f'car__{name}': filters[name]})
+            region_avg_price = listings.filter(region=listing.region).aggregate(Avg('price_usd'))['price_usd__avg']
+            country_avg_price = listings.aggregate(Avg('price_usd'))['price_usd__avg']
+        else:
+            # Средние цены по региону и по стране из материализованной статистики сегментов (один запрос).
+            region_avg_price, country_avg_price = SegmentStatsService.get_average_prices(
+                region=listing.region,
+                brand_id=filters['brand'].id if filters.get('brand') else None,
+                model_name_id=filters['model_name'].id if filters.get('model_name') else None,
+                body_type=filters.get('body_type'),
             )
-        ).aggregate(Avg('price_in_usd'))['price_in_usd__avg']
 
         # Формируем данные для сериализации
         stats_data = {
-            'total_views': listing.views_day + listing.views_week + listing.views_month,
+            'total_views': listing.views_total,
             'views_day': listing.views_day,
             'views_week': listing.views_week,
             'views_month': listing.views_month,
@@ -159,6 +221,55 @@ class PremiumStatsView(RetrieveAPIView):
         return Response(serializer.data)
 
 
+class ListingPriceQuantilesView(APIView):
+    """
+    Ценовой диапазон для продавцов: квантили p25/p50/p75/p90 цены в USD для любой комбинации региона, бренда,
+    модели и типа кузова. Считается объединением скетчей квантилей сегментов, без обращения к объявлениям.
+    """
+    permission_classes = [IsSeller]
+    quantiles = {'p25': 0.25, 'p50': 0.5, 'p75': 0.75, 'p90': 0.9}
+
+    def get(self, request):
+        query = PriceQuantilesQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+
+        listings_count, values = SegmentStatsService.get_quantiles(
+            self.quantiles.values(),
+            region=params.get('region'),
+            brand_id=params.get('brand'),
+            model_name_id=params.get('model_name'),
+            body_type=params.get('body_type'),
+        )
+        serializer = PriceQuantilesSerializer({
+            'listings_count': listings_count,
+            **{name: values[q] for name, q in self.quantiles.items()},
+        })
+        return Response(serializer.data)
+
+
+class ListingExportView(APIView):
+    """
+    Потоковая выгрузка объявлений в CSV или JSONL (`?export_format=csv|jsonl`) с фильтрами `ListingFilter`.
+    Доступна менеджерам. Ответ передается по частям, без загрузки выгрузки в память.
+    """
+    permission_classes = [IsManager]
+
+    def get(self, request, *args, **kwargs):
+        file_format = request.query_params.get('export_format', 'csv')
+        if file_format not in ListingExportService.FORMATS:
+            return Response({"export_format": ["Unsupported export format. Use csv or jsonl."]},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        queryset = ListingExportService.get_queryset(request.query_params)
+        response = StreamingHttpResponse(
+            ListingExportService.stream(queryset, file_format, request),
+            content_type=ListingExportService.CONTENT_TYPES[file_format],
+        )
+        response['Content-Disposition'] = f'attachment; filename="listings.{file_format}"'
+        return response
+
+
 class RegionsAPIView(ListAPIView):
     """
     API для получения списка регионов.
@@ -171,18 +282,19 @@ class RegionsAPIView(ListAPIView):
         })
 
 
-class UserListingsView(ListAPIView):
+class UserListingsView(ProjectionListMixin, ListAPIView):
     """
     API для получения списка объявлений текущего пользователя.
     """
     serializer_class = ListingListSerializer
+    projection = LISTING_LIST_PROJECTION  # Ответ списка строится одним запросом `values()` без сериализатора.
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         """
         Возвращает объявления, принадлежащие текущему пользователю.
         """
-        return ListingModel.objects.filter(seller=self.request.user)
+        return ListingModel.objects.filter(seller=self.request.user).order_by('-created_at')
 
 
 class ListingRetrieveView(RetrieveAPIView):
@@ -212,13 +324,32 @@ class ListingRetrieveView(RetrieveAPIView):
         return Response(serializer.data)
 
 
-class ListingRetrieveDetailView(RetrieveAPIView):
+class ListingRetrieveDetailView(ConditionalGetMixin, RetrieveAPIView):
     """
     Получение детализированных данных об объявлении, включая автомобиль.
+    Поддерживает условный GET: если объявление не изменилось, возвращается 304 без построения ответа
+    (такой повторный запрос не считается новым просмотром).
     """
     queryset = ListingModel.objects.select_related('car')
     serializer_class = ListingDetailSerializer
     permission_classes = [IsAuthenticated]
+    cache_control = {'private': True, 'no_cache': True}  # Ответ для пользователя, клиент всегда сверяет версию.
+
+    def get_validators(self, request, *args, **kwargs):
+        """
+        Версия объявления по времени изменения объявления и автомобиля (одним легким запросом)
+        и версии снимка курсов `CurrencyRateService`, из которого берется текущий курс в ответе
+        (снимок процесса может отставать от общего поколения курсов на интервал сверки).
+        """
+        updated = ListingModel.objects.filter(pk=kwargs.get('pk')).values_list('updated_at', 'car__updated_at').first()
+        if updated is None:
+            return None, None
+        last_modified = max(updated)
+        rates_version = CurrencyRateService.get_snapshot().version
+        if not rates_version:
+            # Версия курсов неизвестна (общий кеш недоступен): ETag не выдается.
+            return None, last_modified
+        return make_etag('listing', kwargs.get('pk'), last_modified.isoformat(), rates_version), last_modified
 
     def retrieve(self, request, *args, **kwargs):
         """
@@ -0,0 +1,33 @@
+# Generated by Django 5.1 on 2026-10-18 11:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_alter_usermodel_password_alter_blacklistmodel_table'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ManagerAssignmentModel',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('kind', models.CharField(choices=[('brand_request', 'Brand request'), ('profanity', 'Profanity alert')], max_length=30)),
+                ('payload', models.JSONField(default=dict)),
+                ('status', models.CharField(choices=[('open', 'Open'), ('resolved', 'Resolved')], default='open', max_length=20)),
+                ('escalation_level', models.IntegerField(default=0)),
+                ('resolved_at', models.DateTimeField(blank=True, null=True)),
+                ('manager', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='assignments', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'manager_assignments',
+                'indexes': [models.Index(fields=['manager', 'status'], name='assignments_manager_status_idx')],
+            },
+        ),
+    ]
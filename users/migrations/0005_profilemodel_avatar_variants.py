@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 11:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_manager_assignments'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profilemodel',
+            name='avatar_variants',
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -78,6 +78,8 @@ class ProfileModel(BaseModel):
         null=True,
         validators=(validators.FileExtensionValidator(['jpeg', 'jpg', 'png']),)  # Валидация типа загружаемого файла.
     )
+    # Уменьшенные копии аватара и заглушка (заполняются задачей `generate_image_derivatives`).
+    avatar_variants = models.JSONField(null=True, blank=True, editable=False)
 
     class Meta:
         db_table = 'profile'  # Имя таблицы в базе данных.
@@ -103,3 +105,36 @@ class BlacklistModel(BaseModel):
 
     class Meta:
         db_table = 'blacklist'  # Имя таблицы в базе данных.
+
+
+class ManagerAssignmentModel(BaseModel):
+    """
+    Событие, требующее внимания менеджера (запрос на добавление бренда, уведомление модерации).
+    Каждое событие назначается ровно одному менеджеру (см. `ManagerRoutingService`); если менеджер не закрыл его
+    вовремя, событие эскалируется - переназначается другому менеджеру.
+    """
+
+    KINDS = [
+        ('brand_request', 'Brand request'),
+        ('profanity', 'Profanity alert'),
+    ]
+    STATUSES = [
+        ('open', 'Open'),
+        ('resolved', 'Resolved'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KINDS)  # Тип события.
+    payload = models.JSONField(default=dict)  # Данные события (контекст письма менеджеру).
+    manager = models.ForeignKey(
+        UserModel,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='assignments'  # Менеджер, которому назначено событие.
+    )
+    status = models.CharField(max_length=20, choices=STATUSES, default='open')  # Статус обработки события.
+    escalation_level = models.IntegerField(default=0)  # Сколько раз событие переназначалось.
+    resolved_at = models.DateTimeField(null=True, blank=True)  # Время закрытия события менеджером.
+
+    class Meta:
+        db_table = 'manager_assignments'  # Имя таблицы в базе данных.
+        indexes = [models.Index(fields=['manager', 'status'], name='assignments_manager_status_idx')]
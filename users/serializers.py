@@ -3,7 +3,8 @@ from django.contrib.auth import get_user_model
 from django.db.transaction import atomic
 from users_auth.models import UserRoleModel
 from core.services.email_service import EmailService
-from .models import UserModel, ProfileModel, BlacklistModel
+from core.services.image_derivative_service import ImageDerivativeService
+from .models import UserModel, ProfileModel, BlacklistModel, ManagerAssignmentModel
 from django.apps import apps
 
 class UserRoleSerializer(serializers.ModelSerializer):
@@ -22,10 +23,14 @@ class ProfileSerializer(serializers.ModelSerializer):
     role = serializers.CharField(source='user.role.name', read_only=True)  # Поле для отображения роли пользователя.
     account_type = serializers.CharField(source='user.account_type', read_only=True)  # Тип аккаунта пользователя.
     avatar = serializers.ImageField(read_only=True)  # Поле для отображения аватара пользователя.
+    avatar_variants = serializers.SerializerMethodField()  # URL уменьшенных копий аватара и заглушка.
 
     class Meta:
         model = ProfileModel
-        fields = ('id', 'name', 'surname', 'age', 'city', 'role', 'account_type', 'avatar')  # Поля, которые будут сериализованы.
+        fields = ('id', 'name', 'surname', 'age', 'city', 'role', 'account_type', 'avatar', 'avatar_variants')  # Поля, которые будут сериализованы.
+
+    def get_avatar_variants(self, obj):
+        return ImageDerivativeService.get_urls(obj.avatar_variants, obj.avatar.storage, self.context.get('request'))
 
 
 class UserDetailSerializer(serializers.ModelSerializer):
@@ -166,3 +171,11 @@ class BlacklistSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
+class ManagerAssignmentSerializer(serializers.ModelSerializer):
+    """
+    Сериализатор для отображения событий, назначенных менеджеру.
+    """
+    class Meta:
+        model = ManagerAssignmentModel
+        fields = ('id', 'kind', 'payload', 'status', 'escalation_level', 'resolved_at', 'created_at', 'updated_at')
+        read_only_fields = fields  # События только для чтения, закрываются через отдельный эндпоинт.
@@ -0,0 +1,78 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+
+from core.services.cache_generation_service import CacheGenerationService
+from core.services.image_derivative_service import ImageDerivativeService
+from .models import UserModel, ProfileModel
+
+MANAGER_ROLE_ID = 3
+
+
+@receiver(post_init, sender=UserModel)
+def remember_manager_state(sender, instance, **kwargs):
+    """
+    Запоминает роль, активность и email пользователя при загрузке, чтобы при сохранении понять,
+    изменился ли список менеджеров.
+    """
+    instance._manager_state = (instance.role_id, instance.is_active, instance.email)
+
+
+@receiver(post_save, sender=UserModel)
+def bump_managers_generation_on_save(sender, instance, created, **kwargs):
+    """
+    Создание менеджера, назначение или снятие роли менеджера, изменение его активности или email
+    увеличивает поколение списка менеджеров. Остальные сохранения (например, `last_login`) его не меняют.
+    Поколение увеличивается после фиксации транзакции, чтобы параллельный выбор менеджера не закешировал
+    прежний список под новым поколением.
+    """
+    previous = instance._manager_state
+    current = (instance.role_id, instance.is_active, instance.email)
+    if MANAGER_ROLE_ID in (previous[0], current[0]) and (created or previous != current):
+        transaction.on_commit(bump_managers_generation)
+    instance._manager_state = current
+
+
+@receiver(post_delete, sender=UserModel)
+def bump_managers_generation_on_delete(sender, instance, **kwargs):
+    """
+    Удаление менеджера увеличивает поколение списка менеджеров (после фиксации транзакции).
+    """
+    if instance.role_id == MANAGER_ROLE_ID:
+        transaction.on_commit(bump_managers_generation)
+
+
+def bump_managers_generation():
+    CacheGenerationService.bump(CacheGenerationService.MANAGERS)
+
+
+@receiver(post_init, sender=ProfileModel)
+def remember_avatar(sender, instance, **kwargs):
+    """
+    Запоминает файл аватара, чтобы при сохранении понять, заменен ли он.
+    """
+    ImageDerivativeService.track(instance, 'avatar')
+
+
+@receiver(pre_save, sender=ProfileModel)
+def reset_avatar_variants(sender, instance, **kwargs):
+    """
+    Сбрасывает уменьшенные копии замененного файла аватара.
+    """
+    ImageDerivativeService.reset_variants(instance, 'avatar')
+
+
+@receiver(post_save, sender=ProfileModel)
+def schedule_avatar_derivatives(sender, instance, **kwargs):
+    """
+    Ставит создание уменьшенных копий нового файла аватара (и удаление копий прежнего).
+    """
+    ImageDerivativeService.schedule(instance, 'avatar')
+
+
+@receiver(post_delete, sender=ProfileModel)
+def delete_avatar_derivatives(sender, instance, **kwargs):
+    """
+    Ставит удаление уменьшенных копий аватара удаленной записи.
+    """
+    ImageDerivativeService.schedule_delete(instance, 'avatar')
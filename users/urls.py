@@ -1,7 +1,8 @@
 from django.urls import path
 
 from .views import UserCreateAPIView, UpgradeAccountAPIView, ProfileDetailView,\
-    CreateManagerView, UserAddAvatarAPIView, UserDeleteSelfView, AddToBlacklistView, CurrentUsereDetailsView
+    CreateManagerView, UserAddAvatarAPIView, UserDeleteSelfView, AddToBlacklistView, CurrentUsereDetailsView, \
+    ManagerAssignmentListView, ManagerAssignmentResolveView
 
 
 urlpatterns = [
@@ -13,4 +14,6 @@ urlpatterns = [
     path('delete-account/', UserDeleteSelfView.as_view(), name='delete-account'),  # Удаление учетной записи.
     path('blacklist/manage/', AddToBlacklistView.as_view(), name='manage-blacklist'),  # Управление черным списком.
     path('user/', CurrentUsereDetailsView.as_view(), name='current-user'),  # Получение данных текущего пользователя.
+    path('assignments/', ManagerAssignmentListView.as_view(), name='manager-assignments'),  # События текущего менеджера.
+    path('assignments/<int:pk>/resolve/', ManagerAssignmentResolveView.as_view(), name='resolve-assignment'),  # Закрытие события.
 ]
\ No newline at end of file
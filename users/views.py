@@ -3,16 +3,17 @@ from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.generics import GenericAPIView, CreateAPIView,\
-    UpdateAPIView, RetrieveAPIView,DestroyAPIView
+    UpdateAPIView, RetrieveAPIView,DestroyAPIView, ListAPIView
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.decorators import action
 from django.http import Http404
 
 
 from .serializers import UserSerializer, UpgradeAccountSerializer, ProfileSerializer,  \
-    ProfileAvatarSerializer, BlacklistSerializer, ManagerSerializer, UserDetailSerializer
-from .models import UserModel, ProfileModel, BlacklistModel
+    ProfileAvatarSerializer, BlacklistSerializer, ManagerSerializer, UserDetailSerializer, ManagerAssignmentSerializer
+from .models import UserModel, ProfileModel, BlacklistModel, ManagerAssignmentModel
 from core.permissions import IsManager
+from core.services.manager_routing_service import ManagerRoutingService
 
 from django.contrib.auth import get_user_model
 
@@ -164,3 +165,29 @@ class CurrentUsereDetailsView(RetrieveAPIView):
         """
         serializer = UserDetailSerializer(request.user)
         return Response(serializer.data)  # Возвращаем информацию о пользователе.
+
+
+class ManagerAssignmentListView(ListAPIView):
+    """
+    Представление для получения открытых событий, назначенных текущему менеджеру.
+    """
+    serializer_class = ManagerAssignmentSerializer
+    permission_classes = [IsAuthenticated, IsManager]  # Требуется аутентификация и права менеджера.
+
+    def get_queryset(self):
+        return ManagerAssignmentModel.objects.filter(manager=self.request.user, status='open').order_by('id')
+
+
+class ManagerAssignmentResolveView(GenericAPIView):
+    """
+    Представление для закрытия события, назначенного текущему менеджеру.
+    """
+    permission_classes = [IsAuthenticated, IsManager]  # Требуется аутентификация и права менеджера.
+
+    def post(self, request, pk, *args, **kwargs):
+        """
+        Закрывает открытое событие текущего менеджера.
+        """
+        if not ManagerRoutingService.resolve(pk, request.user):
+            return Response({"detail": "Open assignment not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"detail": "Assignment resolved."}, status=status.HTTP_200_OK)